@@ -0,0 +1,147 @@
+"""
+Микробенчмарк сериализации списка зданий с организациями (ответ геопоиска по радиусу) без БД.
+Сравнивает:
+  response_model — model_validate в сервисе, повторная проверка response_model и stdlib json (как FastAPI);
+  pydantic       — SERIALIZATION_MODE=pydantic: model_validate и TypeAdapter.dump_json;
+  fast           — SERIALIZATION_MODE=fast: словари из строк и orjson.
+Запуск из корня проекта (нужны те же переменные окружения, что и приложению):
+  uv run python benchmarks/serialization.py --buildings 5000 --organizations 3
+"""
+
+import argparse
+import json
+import random
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from schemas import (  # noqa: E402
+    BuildingDetail,
+    BuildingWithDistanceResponse,
+    OrganizationResponse,
+)
+from services.serialization import (  # noqa: E402
+    building_with_organizations_dict,
+    dump_buildings_with_organizations,
+    dumps,
+)
+
+
+class BuildingRow(NamedTuple):
+    id: int
+    country: str
+    region: str | None
+    city: str
+    street: str
+    house_number: str
+    latitude: float | None
+    longitude: float | None
+
+
+class OrganizationRow(NamedTuple):
+    id: int
+    name: str
+    phone: str
+
+
+Rows = list[tuple[BuildingRow, list[OrganizationRow], float]]
+
+_response_model = TypeAdapter(list[BuildingWithDistanceResponse])
+
+
+def make_rows(buildings: int, organizations: int) -> Rows:
+    """Синтетические строки БД: здания с координатами и расстоянием, по organizations организаций в каждом."""
+    rnd = random.Random(0)
+    return [
+        (
+            BuildingRow(
+                i,
+                "Россия",
+                "Московская область" if i % 2 else None,
+                "Москва",
+                f"Улица {i % 500}",
+                str(i % 120 + 1),
+                55.5 + rnd.random(),
+                37.3 + rnd.random(),
+            ),
+            [
+                OrganizationRow(
+                    i * organizations + j,
+                    f"ООО Организация {i}-{j}",
+                    f"8-800-{i % 1000:03d}-{j:02d}-00",
+                )
+                for j in range(organizations)
+            ],
+            rnd.random() * 5,
+        )
+        for i in range(buildings)
+    ]
+
+
+def validated(rows: Rows) -> list[BuildingWithDistanceResponse]:
+    return [
+        BuildingWithDistanceResponse(
+            building=BuildingDetail.model_validate(b),
+            organizations=[OrganizationResponse.model_validate(o) for o in orgs],
+            distance_km=dist,
+        )
+        for b, orgs, dist in rows
+    ]
+
+
+def response_model(rows: Rows) -> bytes:
+    checked = _response_model.validate_python(validated(rows), from_attributes=True)
+    content = _response_model.dump_python(checked, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def pydantic_mode(rows: Rows) -> bytes:
+    return dump_buildings_with_organizations(validated(rows))
+
+
+def fast_mode(rows: Rows) -> bytes:
+    return dumps(
+        [building_with_organizations_dict(b, orgs, dist) for b, orgs, dist in rows]
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--buildings", type=int, default=5000)
+    parser.add_argument("--organizations", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.buildings, args.organizations)
+    variants: dict[str, Callable[[Rows], bytes]] = {
+        "response_model": response_model,
+        "pydantic": pydantic_mode,
+        "fast": fast_mode,
+    }
+    bodies = {name: fn(rows) for name, fn in variants.items()}
+    if len({json.dumps(json.loads(body)) for body in bodies.values()}) != 1:
+        raise SystemExit("variants produce different JSON")
+    if bodies["pydantic"] != bodies["fast"]:
+        raise SystemExit("pydantic and fast bodies differ byte for byte")
+
+    print(
+        f"{args.buildings} buildings x {args.organizations} organizations, "
+        f"{len(bodies['fast']) / 1024:.0f} KiB, best of {args.repeat}"
+    )
+    baseline = None
+    for name, fn in variants.items():
+        seconds = min(
+            timeit.repeat(lambda fn=fn: fn(rows), number=1, repeat=args.repeat)
+        )
+        baseline = baseline or seconds
+        print(f"  {name:<15} {seconds * 1000:8.1f} ms  x{baseline / seconds:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""buildings lat/lon index
+
+Revision ID: 5c2e8f1b9d34
+Revises: 07f8357a1a12
+Create Date: 2026-10-17 10:12:31.418204
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2e8f1b9d34"
+down_revision: str | Sequence[str] | None = "07f8357a1a12"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_buildings_latitude_longitude",
+        "buildings",
+        ["latitude", "longitude"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_buildings_latitude_longitude", table_name="buildings")
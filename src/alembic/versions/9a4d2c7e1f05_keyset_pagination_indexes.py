@@ -0,0 +1,45 @@
+"""keyset pagination indexes
+
+Revision ID: 9a4d2c7e1f05
+Revises: 5c2e8f1b9d34
+Create Date: 2026-10-17 11:40:05.772913
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4d2c7e1f05"
+down_revision: str | Sequence[str] | None = "5c2e8f1b9d34"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_organization_buildings_building_id_organization_id",
+        "organization_buildings",
+        ["building_id", "organization_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_organization_activities_activity_id_organization_id",
+        "organization_activities",
+        ["activity_id", "organization_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_organization_activities_activity_id_organization_id",
+        table_name="organization_activities",
+    )
+    op.drop_index(
+        "ix_organization_buildings_building_id_organization_id",
+        table_name="organization_buildings",
+    )
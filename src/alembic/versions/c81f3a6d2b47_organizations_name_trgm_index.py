@@ -0,0 +1,40 @@
+"""organizations name trigram index
+
+Revision ID: c81f3a6d2b47
+Revises: 9a4d2c7e1f05
+Create Date: 2026-10-17 13:05:48.120377
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c81f3a6d2b47"
+down_revision: str | Sequence[str] | None = "9a4d2c7e1f05"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_organizations_name_trgm",
+        "organizations",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Расширение pg_trgm не удаляем: им могут пользоваться другие объекты БД.
+    op.drop_index(
+        "ix_organizations_name_trgm",
+        table_name="organizations",
+        postgresql_using="gin",
+    )
@@ -0,0 +1,72 @@
+"""data version counter bumped by triggers
+
+Revision ID: e4b7a91c3d58
+Revises: c81f3a6d2b47
+Create Date: 2026-10-17 15:20:11.402917
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b7a91c3d58"
+down_revision: str | Sequence[str] | None = "c81f3a6d2b47"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TRACKED_TABLES = (
+    "activities",
+    "buildings",
+    "organizations",
+    "activity_ownership",
+    "organization_activities",
+    "organization_buildings",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "data_version",
+        sa.Column("id", sa.SmallInteger(), server_default="1", nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default="1", nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.CheckConstraint("id = 1", name="data_version_single_row"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("INSERT INTO data_version (id) VALUES (1)")
+    # Триггеры уровня оператора: одно обновление счётчика на INSERT/UPDATE/DELETE/TRUNCATE,
+    # сколько бы строк он ни затронул.
+    op.execute(
+        """
+        CREATE FUNCTION bump_data_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE data_version SET version = version + 1, updated_at = now() WHERE id = 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TRACKED_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_data_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TRACKED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_data_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_data_version()")
+    op.drop_table("data_version")
@@ -0,0 +1,52 @@
+"""Служебные эндпоинты для администрирования (с токеном): пул соединений, реплики, журнал медленных SQL-запросов и профилировщик."""
+
+from dataclasses import asdict
+from typing import Any
+
+from fastapi import APIRouter, Query, Request, status
+from fastapi.responses import PlainTextResponse
+
+from config import settings
+from db.engine import pool_stats
+from observability import profiler, slow_query_log
+
+router = APIRouter(prefix="/admin", tags=["Администрирование"])
+
+
+@router.get("/pool", include_in_schema=False)
+def connection_pool_stats(request: Request) -> dict[str, int | float]:
+    """Пул соединений с БД: размер, выданные, свободные и сверх pool_size; число и время ожидания соединения, таймауты."""
+    return asdict(pool_stats(request.app.state.engine))
+
+
+@router.get("/replicas", include_in_schema=False)
+def replicas_status(request: Request) -> list[dict[str, str | bool | int]]:
+    """Реплики для чтения: URL без пароля, здорова ли (в ротации) и сколько сессий на неё выдано."""
+    return [asdict(s) for s in request.app.state.read_router.status()]
+
+
+@router.get("/slow-queries", include_in_schema=False)
+def slow_queries() -> list[dict[str, Any]]:
+    """Последние медленные SQL-запросы (от новых к старым): время, длительность, текст, параметры и план."""
+    return [asdict(q) for q in slow_query_log.recent()]
+
+
+@router.delete(
+    "/slow-queries", status_code=status.HTTP_204_NO_CONTENT, include_in_schema=False
+)
+def clear_slow_queries() -> None:
+    """Очистить журнал медленных запросов (например, после исправления запроса)."""
+    slow_query_log.clear()
+
+
+@router.post("/profile", response_class=PlainTextResponse, include_in_schema=False)
+async def profile(
+    seconds: float = Query(10, gt=0, le=settings.PROFILER_MAX_SECONDS),
+    interval_ms: float = Query(10, ge=1, le=1000),
+) -> PlainTextResponse:
+    """
+    Профиль процесса за seconds секунд (выборка стеков всех потоков каждые interval_ms мс) в формате
+    collapsed stacks для flamegraph.pl или speedscope. 409, если профиль уже снимается.
+    """
+    stacks = await profiler.profile(seconds, interval_ms / 1000)
+    return PlainTextResponse(stacks)
@@ -1,9 +1,11 @@
 """Геопоиск: здания и организации по радиусу или прямоугольнику."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 
+from api.v1.responses import cached_json_response
+from config import settings
 from dependencies import get_organization_service
-from schemas import BuildingWithOrganizationsResponse
+from schemas import BuildingWithDistanceResponse, BuildingWithOrganizationsResponse
 from services import OrganizationService
 
 router = APIRouter(prefix="/area", tags=["Геопоиск"])
@@ -11,20 +13,45 @@ router = APIRouter(prefix="/area", tags=["Геопоиск"])
 
 @router.get(
     "/radius",
-    response_model=list[BuildingWithOrganizationsResponse],
+    response_model=list[BuildingWithDistanceResponse],
     summary="Поиск по радиусу от точки",
 )
 async def search_by_radius(
-    lat: float,
-    lon: float,
-    radius_km: float = 1.0,
-    limit: int | None = None,
-    offset: int = 0,
+    response: Response,
+    lat: float = Query(ge=-90, le=90),
+    lon: float = Query(ge=-180, le=180),
+    radius_km: float = Query(1.0, gt=0),
+    limit: int | None = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    service: OrganizationService = Depends(get_organization_service),
+) -> Response:
+    """Здания и организации в заданном радиусе (км) от точки, по возрастанию расстояния (distance_km). lat, lon обязательны, radius_km по умолчанию 1 км.
+    Следующая страница — cursor из заголовка X-Next-Cursor.
+    """
+    return cached_json_response(
+        response,
+        await service.list_buildings_and_organizations_in_radius_json(
+            lat, lon, radius_km, limit=limit, cursor=cursor
+        ),
+    )
+
+
+@router.get(
+    "/nearest",
+    response_model=list[BuildingWithDistanceResponse],
+    summary="Ближайшие к точке здания",
+)
+async def search_nearest(
+    response: Response,
+    lat: float = Query(ge=-90, le=90),
+    lon: float = Query(ge=-180, le=180),
+    k: int = Query(10, ge=1, le=100),
     service: OrganizationService = Depends(get_organization_service),
-) -> list[BuildingWithOrganizationsResponse]:
-    """Здания и организации в заданном радиусе (км) от точки. lat, lon обязательны, radius_km по умолчанию 1 км."""
-    return await service.list_buildings_and_organizations_in_radius(
-        lat, lon, radius_km, limit=limit, offset=offset
+) -> Response:
+    """k ближайших к точке зданий с организациями, по возрастанию расстояния; distance_km — расстояние в км."""
+    return cached_json_response(
+        response,
+        await service.list_nearest_buildings_with_organizations_json(lat, lon, k),
     )
 
 
@@ -34,15 +61,21 @@ async def search_by_radius(
     summary="Поиск по прямоугольной области",
 )
 async def search_by_bbox(
-    min_lat: float,
-    max_lat: float,
-    min_lon: float,
-    max_lon: float,
-    limit: int | None = None,
-    offset: int = 0,
+    response: Response,
+    min_lat: float = Query(ge=-90, le=90),
+    max_lat: float = Query(ge=-90, le=90),
+    min_lon: float = Query(ge=-180, le=180),
+    max_lon: float = Query(ge=-180, le=180),
+    limit: int | None = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: str | None = None,
     service: OrganizationService = Depends(get_organization_service),
-) -> list[BuildingWithOrganizationsResponse]:
-    """Здания и организации внутри прямоугольной области (min_lat, max_lat, min_lon, max_lon)."""
-    return await service.list_buildings_and_organizations_in_bbox(
-        min_lat, max_lat, min_lon, max_lon, limit=limit, offset=offset
+) -> Response:
+    """Здания и организации внутри прямоугольной области (min_lat, max_lat, min_lon, max_lon), по возрастанию id здания.
+    Следующая страница — cursor из заголовка X-Next-Cursor.
+    """
+    return cached_json_response(
+        response,
+        await service.list_buildings_and_organizations_in_bbox_json(
+            min_lat, max_lat, min_lon, max_lon, limit=limit, cursor=cursor
+        ),
     )
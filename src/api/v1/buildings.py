@@ -1,7 +1,9 @@
 """Эндпоинты по зданиям."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 
+from api.v1.responses import cached_json_response
+from config import settings
 from dependencies import get_organization_service
 from schemas import BuildingWithOrganizationsResponse
 from services import OrganizationService
@@ -16,11 +18,17 @@ router = APIRouter(prefix="/buildings", tags=["Здания"])
 )
 async def get_building_with_organizations(
     building_id: int,
-    limit: int | None = None,
-    offset: int = 0,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: str | None = None,
     service: OrganizationService = Depends(get_organization_service),
-) -> BuildingWithOrganizationsResponse:
-    """Полная информация по зданию и список организаций, которые в нём находятся."""
-    return await service.get_building_with_organizations(
-        building_id, limit=limit, offset=offset
+) -> Response:
+    """Полная информация по зданию и список организаций, которые в нём находятся (по возрастанию id).
+    Следующая страница организаций — cursor из заголовка X-Next-Cursor.
+    """
+    return cached_json_response(
+        response,
+        await service.get_building_with_organizations_json(
+            building_id, limit=limit, cursor=cursor
+        ),
     )
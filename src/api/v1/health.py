@@ -1,7 +1,12 @@
-"""Служебные эндпоинты: health check."""
+"""Служебные эндпоинты: health check, счётчики кеша ответов и объединения запросов."""
+
+from dataclasses import asdict
 
 from fastapi import APIRouter
 
+from cache import response_cache
+from services.single_flight import single_flight
+
 router = APIRouter(tags=["Служебные"])
 
 
@@ -9,3 +14,15 @@ router = APIRouter(tags=["Служебные"])
 def health() -> dict[str, str]:
     """Проверка доступности сервиса для балансировщиков и мониторинга."""
     return {"status": "ok"}
+
+
+@router.get("/health/cache", include_in_schema=False)
+def cache_stats() -> dict[str, int]:
+    """Кеш ответов: попадания, промахи, вытеснения (LRU), истечения TTL, инвалидации, записи и байты."""
+    return asdict(response_cache.stats())
+
+
+@router.get("/health/single-flight", include_in_schema=False)
+def single_flight_stats() -> dict[str, dict[str, int]]:
+    """Объединение одновременных чтений по методам сервиса: вызовы, выполнения и объединённые вызовы."""
+    return asdict(single_flight.stats())
@@ -0,0 +1,18 @@
+"""Метрики для Prometheus (без авторизации, как health): запросы, время ответов и методов сервиса, пулы соединений."""
+
+from fastapi import APIRouter, Request, Response
+
+from db.engine import pool_stats
+from observability import CONTENT_TYPE, pool_metrics, registry
+
+router = APIRouter(tags=["Служебные"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics(request: Request) -> Response:
+    """Текстовый формат exposition; пулы соединений (основная БД и реплики) — на момент запроса."""
+    pools = {
+        "primary": pool_stats(request.app.state.engine),
+        **request.app.state.read_router.pool_stats(),
+    }
+    return Response(registry.render(pool_metrics(pools)), media_type=CONTENT_TYPE)
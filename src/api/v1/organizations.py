@@ -1,11 +1,17 @@
 """Эндпоинты по организациям."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 
+from api.v1.responses import cached_json_response
+from config import settings
 from dependencies import get_organization_service
 from schemas import (
+    OrganizationBatchItem,
     OrganizationDetailResponse,
     OrganizationResponse,
+    OrganizationSearchResult,
+    Suggestion,
 )
 from services import OrganizationService
 
@@ -18,36 +24,91 @@ router = APIRouter(prefix="/organizations", tags=["Организации"])
     summary="Список организаций с фильтром по виду деятельности",
 )
 async def list_organizations(
+    response: Response,
     activity_id: int | None = None,
     activity_name: str | None = None,
+    limit: int | None = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    stream: bool = False,
     service: OrganizationService = Depends(get_organization_service),
-) -> list[OrganizationResponse]:
+) -> Response:
     """Список организаций по виду деятельности (передать ровно один: activity_id или activity_name).
     По имени возвращаются организации по данной активности и всем вложенным (например, «Еда» — Еда, Мясная продукция и т.д.).
+    Порядок — по возрастанию id; страница не больше MAX_PAGE_SIZE, следующая — cursor из заголовка X-Next-Cursor.
+    stream=true — все организации без пагинации потоком NDJSON (application/x-ndjson), по строке на организацию.
     """
     if (activity_id is None) == (activity_name is None):
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Укажи ровно один параметр: activity_id или activity_name",
         )
-    return await service.list_organizations_by_activity(
-        activity_id=activity_id,
-        activity_name=activity_name,
+    if stream:
+        return StreamingResponse(
+            await service.stream_organizations_by_activity(
+                activity_id=activity_id,
+                activity_name=activity_name,
+            ),
+            media_type="application/x-ndjson",
+        )
+    return cached_json_response(
+        response,
+        await service.list_organizations_by_activity_json(
+            activity_id=activity_id,
+            activity_name=activity_name,
+            limit=limit,
+            cursor=cursor,
+        ),
     )
 
 
+@router.get(
+    "/batch",
+    response_model=list[OrganizationBatchItem],
+    summary="Детальная информация по нескольким организациям",
+)
+async def get_organizations_batch(
+    ids: list[int] = Query(..., min_length=1, max_length=settings.MAX_PAGE_SIZE),
+    service: OrganizationService = Depends(get_organization_service),
+) -> list[OrganizationBatchItem]:
+    """Несколько организаций одним запросом: ids=1&ids=2&... (не больше MAX_PAGE_SIZE).
+    Ответ в порядке ids: {id, found, organization}; organization — как GET /organizations/{id}, null для ненайденных.
+    """
+    return await service.get_organizations_batch(ids)
+
+
 @router.get(
     "/search",
-    response_model=list[OrganizationDetailResponse],
+    response_model=list[OrganizationSearchResult],
     summary="Поиск организаций по названию",
 )
 async def search_organizations(
     name: str,
     limit: int | None = None,
+    min_similarity: float | None = Query(None, ge=0, le=1),
+    service: OrganizationService = Depends(get_organization_service),
+) -> list[OrganizationSearchResult]:
+    """Поиск по названию: подстрока без учёта регистра или похожее слово (похожесть не ниже min_similarity).
+    Результаты по убыванию релевантности score; полный объект как GET /organizations/{id}.
+    """
+    return await service.search_organizations_by_name(
+        name, limit=limit, min_similarity=min_similarity
+    )
+
+
+@router.get(
+    "/suggest",
+    response_model=list[Suggestion],
+    summary="Автодополнение названий организаций и видов деятельности",
+)
+async def suggest_names(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=settings.SUGGEST_MAX_LIMIT),
     service: OrganizationService = Depends(get_organization_service),
-) -> list[OrganizationDetailResponse]:
-    """Поиск по названию (подстрока, без учёта регистра). Возвращает полный объект как GET /organizations/{id}."""
-    return await service.search_organizations_by_name(name, limit=limit)
+) -> list[Suggestion]:
+    """Подсказки по началу слова: организации и виды деятельности (kind), у которых одно из слов названия начинается с q.
+    Регистр и знаки препинания не учитываются.
+    """
+    return await service.suggest_names(q, limit)
 
 
 @router.get(
@@ -57,7 +118,10 @@ async def search_organizations(
 )
 async def get_organization(
     organization_id: int,
+    response: Response,
     service: OrganizationService = Depends(get_organization_service),
-) -> OrganizationDetailResponse:
+) -> Response:
     """Полная информация: id, название, телефон, адреса (здания), виды деятельности деревом (корень → лист)."""
-    return await service.get_organization_detail(organization_id)
+    return cached_json_response(
+        response, await service.get_organization_detail_json(organization_id)
+    )
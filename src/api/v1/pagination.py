@@ -0,0 +1,11 @@
+"""Курсорная пагинация на уровне HTTP: курсор следующей страницы передаётся в заголовке."""
+
+from fastapi import Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def set_next_cursor(response: Response, next_cursor: str | None) -> None:
+    """Проставляет X-Next-Cursor, если есть следующая страница."""
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,17 @@
+"""Отдача готовых JSON-тел (из кеша ответов или быстрой сериализации) в обход response_model."""
+
+from fastapi import Response
+
+from api.v1.pagination import set_next_cursor
+from cache import CachedResponse
+
+
+def cached_json_response(response: Response, cached: CachedResponse) -> Response:
+    """
+    Ответ с уже сериализованным телом. Заголовки, проставленные зависимостями в response
+    (ETag и т.п.), переносятся: FastAPI сам их не добавляет, если эндпоинт вернул Response.
+    """
+    result = Response(content=cached.body, media_type="application/json")
+    result.headers.raw.extend(response.headers.raw)
+    set_next_cursor(result, cached.next_cursor)
+    return result
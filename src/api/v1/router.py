@@ -2,21 +2,29 @@
 
 from fastapi import APIRouter, Depends
 
+from dependencies import conditional_get
 from secure import require_token
 
+from .admin import router as admin_router
 from .area import router as area_router
 from .auth import router as auth_router
 from .buildings import router as buildings_router
 from .health import router as health_router
+from .metrics import router as metrics_router
 from .organizations import router as organizations_router
 
 router = APIRouter(prefix="/api/v1")
 
-# Без токена: health и выдача токена
+# Без токена: health, метрики и выдача токена
 router.include_router(health_router)
+router.include_router(metrics_router)
 router.include_router(auth_router)
 
-# С проверкой Bearer-токена
-router.include_router(organizations_router, dependencies=[Depends(require_token)])
-router.include_router(buildings_router, dependencies=[Depends(require_token)])
-router.include_router(area_router, dependencies=[Depends(require_token)])
+# С проверкой Bearer-токена: служебные эндпоинты для администрирования
+router.include_router(admin_router, dependencies=[Depends(require_token)])
+
+# С проверкой Bearer-токена; GET справочника — с ETag/Last-Modified и ответом 304
+for data_router in (organizations_router, buildings_router, area_router):
+    router.include_router(
+        data_router, dependencies=[Depends(require_token), Depends(conditional_get)]
+    )
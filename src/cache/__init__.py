@@ -0,0 +1,43 @@
+"""Кеши и индексы в памяти процесса поверх данных БД."""
+
+from .activity_tree import ActivityTreeCache, activity_tree_cache
+from .base import ReloadableCache
+from .response import (
+    CachedResponse,
+    CacheStats,
+    MemoryResponseBackend,
+    ResponseCache,
+    ResponseCacheBackend,
+    current_data_version,
+    response_cache,
+    set_data_version,
+)
+from .spatial_index import BuildingSpatialIndex, spatial_index
+from .suggest_index import (
+    SuggestionKind,
+    NameSuggestIndex,
+    match_key,
+    normalize,
+    suggest_index,
+)
+
+__all__ = [
+    "ActivityTreeCache",
+    "BuildingSpatialIndex",
+    "CacheStats",
+    "CachedResponse",
+    "MemoryResponseBackend",
+    "NameSuggestIndex",
+    "ReloadableCache",
+    "ResponseCache",
+    "ResponseCacheBackend",
+    "SuggestionKind",
+    "activity_tree_cache",
+    "current_data_version",
+    "match_key",
+    "normalize",
+    "response_cache",
+    "set_data_version",
+    "spatial_index",
+    "suggest_index",
+]
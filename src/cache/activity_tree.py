@@ -0,0 +1,111 @@
+"""Дерево активностей в памяти: имена, владение (closure из activity_ownership) и пути корень → лист."""
+
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from cache.base import ReloadableCache
+from db.models import Activity, ActivityOwnership
+
+logger = logging.getLogger(__name__)
+
+Path = list[tuple[int, str]]
+
+
+class ActivityTreeCache(ReloadableCache):
+    """
+    Снимок activities и activity_ownership: id → name, owner → owned, owned → путь.
+    Дерево маленькое и почти не меняется, поэтому все поиски — O(1) без запросов к БД.
+    Пока снимок не загружен или инвалидирован, ready = False и вызывающий код идёт в БД.
+    Переименование или удаление активности через ORM инвалидирует снимок после commit (см. listen).
+    """
+
+    tracked_models = (Activity,)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._names: dict[int, str] = {}
+        self._ids_by_name: dict[str, int] = {}
+        self._owned: dict[int, list[int]] = {}
+        self._paths: dict[int, Path] = {}
+        self._loaded = False
+        self._stale = False
+
+    @property
+    def ready(self) -> bool:
+        """True, если снимок загружен и не инвалидирован."""
+        return self._loaded and not self._stale
+
+    async def _load(self, session: AsyncSession) -> None:
+        """Полная загрузка дерева двумя запросами (активности и таблица владения)."""
+        self._stale = False
+        activities = (
+            (await session.execute(select(Activity.id, Activity.name))).tuples().all()
+        )
+        ownership = (
+            await session.execute(
+                select(
+                    ActivityOwnership.owner_id,
+                    ActivityOwnership.owned_id,
+                    ActivityOwnership.depth,
+                ).order_by(ActivityOwnership.owned_id, ActivityOwnership.depth.desc())
+            )
+        ).all()
+        names = dict(activities)
+        ids_by_name: dict[str, int] = {}
+        for activity_id, name in sorted(activities):
+            ids_by_name.setdefault(name.casefold(), activity_id)
+        owned: dict[int, list[int]] = {}
+        paths: dict[int, Path] = {}
+        for owner_id, owned_id, _depth in ownership:
+            owned.setdefault(owner_id, []).append(owned_id)
+            paths.setdefault(owned_id, []).append((owner_id, names[owner_id]))
+        self._names, self._ids_by_name = names, ids_by_name
+        self._owned, self._paths = owned, paths
+        self._loaded = True
+        logger.info("Activity tree loaded: %d activities", len(names))
+
+    def invalidate(self) -> None:
+        """Помечает снимок устаревшим и запускает фоновую перезагрузку."""
+        self._stale = True
+        self.reload_soon()
+
+    def invalidate_on_commit(self, session: AsyncSession | Session) -> None:
+        """Инвалидирует снимок после commit сессии, в которой менялось дерево."""
+        sync_session = (
+            session.sync_session if isinstance(session, AsyncSession) else session
+        )
+
+        def after_commit(_session: Session) -> None:
+            self.invalidate()
+
+        event.listen(sync_session, "after_commit", after_commit, once=True)
+
+    def _snapshot(self, obj: Activity) -> str:
+        return obj.name
+
+    def _apply_change(self, model: type, obj_id: int, snapshot: str | None) -> None:
+        self.invalidate()
+
+    def exists(self, activity_id: int) -> bool:
+        """Есть ли активность с таким id."""
+        return activity_id in self._names
+
+    def find_id_by_name(self, name: str) -> int | None:
+        """Id активности по имени без учёта регистра (при совпадениях — наименьший) или None."""
+        return self._ids_by_name.get(name.casefold())
+
+    def owned_ids(self, owner_id: int) -> list[int]:
+        """Сама активность и все её потомки; пустой список, если активности нет в снимке."""
+        return list(self._owned.get(owner_id, []))
+
+    def paths(self, leaf_ids: list[int]) -> list[Path]:
+        """Пути от корня к листу в виде (id, name) по каждому leaf_id, как ActivityRepo.get_paths_from_ownership."""
+        return [list(self._paths.get(leaf_id, [])) for leaf_id in leaf_ids]
+
+
+activity_tree_cache = ActivityTreeCache()
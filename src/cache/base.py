@@ -0,0 +1,132 @@
+"""Базовый класс кешей в памяти, которые целиком перечитываются из БД."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+Change = tuple[type, int, Any]
+
+
+class ReloadableCache(ABC):
+    """
+    Снимок данных БД в памяти: полная загрузка через load(), фоновая и отложенная перезагрузка.
+    Подкласс реализует _load; с непустым tracked_models он получает инкрементальные изменения этих моделей:
+    снимок объекта (_snapshot) берётся при flush, применяется (_apply_change) после commit.
+    """
+
+    tracked_models: tuple[type, ...] = ()
+
+    def __init__(self) -> None:
+        self._session_maker: Callable[[], AsyncSession] | None = None
+        self._reload_task: asyncio.Task[None] | None = None
+        self._reload_requested = False
+        self._replay: list[Change] | None = None
+        self._pending_key = f"{type(self).__name__}_{id(self)}_pending"
+
+    async def load(self, session: AsyncSession) -> None:
+        """Полная (пере)загрузка; изменения, закоммиченные во время чтения снимка, накатываются поверх."""
+        self._replay = []
+        try:
+            await self._load(session)
+            for model, obj_id, snapshot in self._replay:
+                self._apply_change(model, obj_id, snapshot)
+        finally:
+            self._replay = None
+
+    @abstractmethod
+    async def _load(self, session: AsyncSession) -> None:
+        """Чтение снимка и замена структур."""
+
+    def _snapshot(self, obj: Any) -> Any:
+        """Данные объекта, нужные кешу (None — убрать объект из кеша); без tracked_models не вызывается."""
+        return None
+
+    def _apply_change(self, model: type, obj_id: int, snapshot: Any) -> None:
+        """Применяет изменение одного объекта (snapshot None — удаление); без tracked_models не вызывается."""
+        return None
+
+    def record_change(self, model: type, obj_id: int, snapshot: Any) -> None:
+        """Применяет изменение сейчас и запоминает его, если идёт перезагрузка снимка."""
+        if self._replay is not None:
+            self._replay.append((model, obj_id, snapshot))
+        self._apply_change(model, obj_id, snapshot)
+
+    def listen(self, target: Any = Session) -> None:
+        """Подписывает кеш на события ORM-сессий: изменения tracked_models применяются после commit."""
+        if not self.tracked_models:
+            return
+        for name, fn in (
+            ("after_flush", self._collect_changes),
+            ("after_commit", self._apply_pending),
+            ("after_rollback", self._drop_pending),
+        ):
+            if not event.contains(target, name, fn):
+                event.listen(target, name, fn)
+
+    def bind(self, session_maker: Callable[[], AsyncSession]) -> None:
+        """Фабрика сессий для перезагрузок вне запроса (reload_soon, reload_periodically)."""
+        self._session_maker = session_maker
+
+    async def reload(self) -> None:
+        """Перезагрузка в отдельной сессии; ошибки логируются, кеш остаётся прежним."""
+        if self._session_maker is None:
+            return
+        try:
+            async with self._session_maker() as session:
+                await self.load(session)
+        except Exception:
+            logger.exception("%s reload failed", type(self).__name__)
+
+    def reload_soon(self) -> None:
+        """Запускает перезагрузку фоновой задачей (если есть фабрика сессий и цикл событий).
+        Запрос во время идущей перезагрузки даёт ещё один проход после неё."""
+        if self._session_maker is None:
+            return
+        self._reload_requested = True
+        if self._reload_task is not None and not self._reload_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._reload_task = loop.create_task(self._reload_requested_passes())
+
+    async def _reload_requested_passes(self) -> None:
+        while self._reload_requested:
+            self._reload_requested = False
+            await self.reload()
+
+    async def reload_periodically(self, interval_seconds: float) -> None:
+        """Фоновая полная перезагрузка: подхватывает изменения из других процессов."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await self.reload()
+
+    def _collect_changes(self, session: Session, _flush_context: Any) -> None:
+        pending: dict[tuple[type, int], Any] = session.info.setdefault(
+            self._pending_key, {}
+        )
+        for obj in (*session.new, *session.dirty):
+            if isinstance(obj, self.tracked_models):
+                pending[(type(obj), obj.id)] = self._snapshot(obj)
+        for obj in session.deleted:
+            if isinstance(obj, self.tracked_models):
+                pending[(type(obj), obj.id)] = None
+
+    def _apply_pending(self, session: Session) -> None:
+        pending: dict[tuple[type, int], Any] = session.info.pop(self._pending_key, {})
+        for (model, obj_id), snapshot in pending.items():
+            self.record_change(model, obj_id, snapshot)
+
+    def _drop_pending(self, session: Session) -> None:
+        session.info.pop(self._pending_key, None)
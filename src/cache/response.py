@@ -0,0 +1,288 @@
+"""Кеш готовых ответов: сериализованный JSON с тегами для инвалидации, сменный бэкенд."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, NamedTuple, Protocol
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from db.models import (
+    Activity,
+    ActivityOwnership,
+    Building,
+    Organization,
+    OrganizationActivity,
+    OrganizationBuilding,
+)
+
+_PENDING_KEY = "response_cache_pending_tags"
+
+_data_version: ContextVar[int | None] = ContextVar("data_version", default=None)
+
+
+def set_data_version(version: int | None) -> None:
+    """Версия данных (data_version), прочитанная в текущем запросе до данных; ответы кешируются под ней."""
+    _data_version.set(version)
+
+
+def current_data_version() -> int | None:
+    """Версия данных текущего запроса или None (не прочитана)."""
+    return _data_version.get()
+
+
+class CachedResponse(NamedTuple):
+    """Готовый ответ: тело (JSON) и курсор следующей страницы для заголовка X-Next-Cursor."""
+
+    body: bytes
+    next_cursor: str | None = None
+
+
+@dataclass
+class CacheStats:
+    """Счётчики кеша с момента запуска и текущий объём."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class ResponseCacheBackend(Protocol):
+    """Хранилище ответов: в памяти процесса или общее (например, Redis) с тем же интерфейсом."""
+
+    async def get(self, key: str) -> CachedResponse | None: ...
+
+    async def set(
+        self, key: str, value: CachedResponse, tags: Iterable[str], ttl: float
+    ) -> None: ...
+
+    async def invalidate(self, tags: Iterable[str]) -> None: ...
+
+    async def clear(self) -> None: ...
+
+    def stats(self) -> CacheStats: ...
+
+
+@dataclass
+class _Entry:
+    value: CachedResponse
+    tags: frozenset[str]
+    expires_at: float
+    size: int
+
+
+class MemoryResponseBackend:
+    """
+    LRU с TTL в памяти процесса: ограничение по числу записей и по суммарному размеру тел.
+    Тег → ключи хранится отдельно, поэтому инвалидация тега не обходит весь кеш.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._keys_by_tag: dict[str, set[str]] = {}
+        self._stats = CacheStats()
+
+    async def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._drop(key)
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return entry.value
+
+    async def set(
+        self, key: str, value: CachedResponse, tags: Iterable[str], ttl: float
+    ) -> None:
+        size = len(value.body)
+        if size > self._max_bytes:
+            return
+        self._drop(key)
+        entry = _Entry(value, frozenset(tags), time.monotonic() + ttl, size)
+        self._entries[key] = entry
+        self._stats.bytes += size
+        for tag in entry.tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while (
+            len(self._entries) > self._max_entries
+            or self._stats.bytes > self._max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self._stats.evictions += 1
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            for key in self._keys_by_tag.get(tag, set()).copy():
+                self._drop(key)
+                self._stats.invalidations += 1
+
+    async def clear(self) -> None:
+        self._stats.invalidations += len(self._entries)
+        self._entries.clear()
+        self._keys_by_tag.clear()
+        self._stats.bytes = 0
+
+    def stats(self) -> CacheStats:
+        self._stats.entries = len(self._entries)
+        return CacheStats(**vars(self._stats))
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._stats.bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+class ResponseCache:
+    """
+    Кеш ответов сервиса: get_or_set по ключу (эндпоинт и параметры), инвалидация по тегам сущностей.
+    Теги — «organization:<id>», «building:<id>», «activity:<id>»: запись помечается всеми сущностями,
+    из которых собран ответ. Изменения этих моделей через ORM инвалидируют записи после commit (см. listen).
+    Если в запросе прочитана версия данных (set_data_version), она входит в ключ: после любой записи в БД
+    (другой процесс, SQL в обход ORM) ответ строится заново, и тело не старше ETag из той же версии.
+    Без версии такие изменения видны не позже чем через TTL.
+    Без бэкенда (use не вызывался) кеш выключен и get_or_set всегда строит ответ.
+    """
+
+    def __init__(self) -> None:
+        self._backend: ResponseCacheBackend | None = None
+        self._ttl = 0.0
+        # Растёт при каждой инвалидации: ответ, построенный до неё, в кеш не кладётся.
+        self._generation = 0
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def enabled(self) -> bool:
+        """True, если бэкенд задан."""
+        return self._backend is not None
+
+    def use(self, backend: ResponseCacheBackend | None, ttl_seconds: float) -> None:
+        """Задаёт бэкенд и TTL записей; None выключает кеш."""
+        self._backend = backend
+        self._ttl = ttl_seconds
+
+    async def get_or_set(
+        self,
+        key: str,
+        build: Callable[[], Awaitable[tuple[CachedResponse, Iterable[str]]]],
+    ) -> CachedResponse:
+        """Ответ из кеша или build() → (ответ, теги), который кладётся в кеш. К ключу добавляется версия данных запроса."""
+        if self._backend is None:
+            value, _tags = await build()
+            return value
+        version = _data_version.get()
+        if version is not None:
+            key = f"{key}@{version}"
+        cached = await self._backend.get(key)
+        if cached is not None:
+            return cached
+        generation = self._generation
+        value, tags = await build()
+        if generation == self._generation:
+            await self._backend.set(key, value, tags, self._ttl)
+        return value
+
+    async def invalidate(self, *tags: str) -> None:
+        """Удаляет все записи, помеченные любым из тегов (вызывать после commit изменений)."""
+        self._generation += 1
+        if self._backend is not None and tags:
+            await self._backend.invalidate(tags)
+
+    async def clear(self) -> None:
+        """Удаляет все записи."""
+        self._generation += 1
+        if self._backend is not None:
+            await self._backend.clear()
+
+    def stats(self) -> CacheStats:
+        """Счётчики попаданий, промахов, вытеснений и текущий объём."""
+        return CacheStats() if self._backend is None else self._backend.stats()
+
+    def listen(self, target: Any = Session) -> None:
+        """Подписывает кеш на события ORM-сессий: теги изменённых сущностей инвалидируются после commit."""
+        for name, fn in (
+            ("after_flush", self._collect_tags),
+            ("after_commit", self._invalidate_pending),
+            ("after_rollback", self._drop_pending),
+        ):
+            if not event.contains(target, name, fn):
+                event.listen(target, name, fn)
+
+    def _collect_tags(self, session: Session, _flush_context: Any) -> None:
+        pending: set[str] = session.info.setdefault(_PENDING_KEY, set())
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            pending.update(_tags_of(obj))
+
+    def _invalidate_pending(self, session: Session) -> None:
+        tags = session.info.pop(_PENDING_KEY, None)
+        if not tags or self._backend is None:
+            return
+        self._generation += 1
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.invalidate(*tags))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _drop_pending(self, session: Session) -> None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+def _tags_of(obj: Any) -> set[str]:
+    """Теги ответов, которые могут измениться вместе с объектом.
+    Связь, добавленная через коллекцию, помечает и другую сторону: её ответы ещё не несут тег объекта."""
+    if isinstance(obj, Organization):
+        return {
+            f"organization:{obj.id}",
+            *(f"building:{b.id}" for b in _added(obj, "buildings")),
+        }
+    if isinstance(obj, Building):
+        return {
+            f"building:{obj.id}",
+            *(f"organization:{o.id}" for o in _added(obj, "organizations")),
+        }
+    if isinstance(obj, Activity):
+        return {
+            f"activity:{obj.id}",
+            *(f"organization:{o.id}" for o in _added(obj, "organizations")),
+        }
+    if isinstance(obj, OrganizationBuilding):
+        return {f"organization:{obj.organization_id}", f"building:{obj.building_id}"}
+    if isinstance(obj, OrganizationActivity):
+        return {f"organization:{obj.organization_id}"}
+    if isinstance(obj, ActivityOwnership):
+        return {f"activity:{obj.owner_id}", f"activity:{obj.owned_id}"}
+    return set()
+
+
+def _added(obj: Any, collection: str) -> Sequence[Any]:
+    return inspect(obj).attrs[collection].history.added or ()
+
+
+response_cache = ResponseCache()
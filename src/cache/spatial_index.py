@@ -0,0 +1,179 @@
+"""Пространственный индекс зданий в памяти: равномерная сетка по широте/долготе."""
+
+from __future__ import annotations
+
+import logging
+import math
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cache.base import ReloadableCache
+from db.models import Building
+from geo import MAX_RADIUS_KM, bounding_box, haversine_km
+
+logger = logging.getLogger(__name__)
+
+Cell = tuple[int, int]
+Point = tuple[float, float]
+
+
+class BuildingSpatialIndex(ReloadableCache):
+    """
+    Сетка cell_deg × cell_deg градусов: ячейка → {building_id: (lat, lon)}.
+    Отвечает id зданий для bbox и радиуса; сами здания догружаются одним запросом по PK.
+    Изменения зданий через ORM применяются инкрементально после commit (см. listen).
+    """
+
+    tracked_models = (Building,)
+
+    def __init__(self, cell_deg: float = 0.1) -> None:
+        super().__init__()
+        self._cell_deg = cell_deg
+        self._cells: dict[Cell, dict[int, Point]] = {}
+        self._points: dict[int, Point] = {}
+        self._ready = False
+
+    @property
+    def ready(self) -> bool:
+        """True, если индекс загружен и им можно отвечать вместо БД."""
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def configure(self, cell_deg: float) -> None:
+        """Задаёт размер ячейки; действует с ближайшей загрузки."""
+        self._cell_deg = cell_deg
+
+    async def _load(self, session: AsyncSession) -> None:
+        """Полная (пере)загрузка координат всех зданий одним запросом."""
+        stmt = select(Building.id, Building.latitude, Building.longitude).where(
+            Building.latitude.isnot(None),
+            Building.longitude.isnot(None),
+        )
+        result = await session.execute(stmt)
+        cells: dict[Cell, dict[int, Point]] = {}
+        points: dict[int, Point] = {}
+        for building_id, lat, lon in result.all():
+            points[building_id] = (lat, lon)
+            cells.setdefault(self._cell_of(lat, lon), {})[building_id] = (lat, lon)
+        self._cells, self._points = cells, points
+        self._ready = True
+        logger.info("Spatial index loaded: %d buildings", len(self._points))
+
+    def upsert(self, building_id: int, lat: float | None, lon: float | None) -> None:
+        """Добавляет или перемещает здание; без координат — удаляет из индекса."""
+        point = (lat, lon) if lat is not None and lon is not None else None
+        self.record_change(Building, building_id, point)
+
+    def remove(self, building_id: int) -> None:
+        """Удаляет здание из индекса."""
+        self.record_change(Building, building_id, None)
+
+    def in_bbox(
+        self, min_lat: float, max_lat: float, min_lon: float, max_lon: float
+    ) -> list[int]:
+        """Id зданий внутри прямоугольника, по возрастанию id."""
+        return sorted(
+            building_id
+            for building_id, _point in self._candidates(
+                min_lat, max_lat, min_lon, max_lon
+            )
+        )
+
+    def in_radius(
+        self, lat: float, lon: float, radius_km: float
+    ) -> list[tuple[float, int]]:
+        """Пары (расстояние в км, id) для зданий в радиусе от точки, по возрастанию расстояния."""
+        if not (math.isfinite(lat) and math.isfinite(lon)):
+            return []
+        found: list[tuple[float, int]] = []
+        for building_id, (b_lat, b_lon) in self._candidates(
+            *bounding_box(lat, lon, radius_km)
+        ):
+            dist = haversine_km(lat, lon, b_lat, b_lon)
+            if dist <= radius_km:
+                found.append((dist, building_id))
+        found.sort()
+        return found
+
+    def nearest(
+        self, lat: float, lon: float, k: int, *, start_radius_km: float = 1.0
+    ) -> list[tuple[float, int]]:
+        """k ближайших зданий как пары (расстояние в км, id): радиус удваивается, пока не наберётся k."""
+        radius_km = start_radius_km
+        while True:
+            radius_km = min(radius_km, MAX_RADIUS_KM)
+            found = self.in_radius(lat, lon, radius_km)
+            if len(found) >= k or radius_km >= MAX_RADIUS_KM:
+                return found[:k]
+            radius_km *= 2
+
+    def _cell_of(self, lat: float, lon: float) -> Cell:
+        return (
+            math.floor(lat / self._cell_deg),
+            math.floor(lon / self._cell_deg),
+        )
+
+    def _snapshot(self, obj: Building) -> Point | None:
+        if obj.latitude is None or obj.longitude is None:
+            return None
+        return (obj.latitude, obj.longitude)
+
+    def _apply_change(self, model: type, obj_id: int, snapshot: Point | None) -> None:
+        building_id, point = obj_id, snapshot
+        old = self._points.pop(building_id, None)
+        if old is not None:
+            cell = self._cell_of(*old)
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.pop(building_id, None)
+                if not bucket:
+                    del self._cells[cell]
+        if point is not None:
+            self._points[building_id] = point
+            self._cells.setdefault(self._cell_of(*point), {})[building_id] = point
+
+    def _candidates(
+        self, min_lat: float, max_lat: float, min_lon: float, max_lon: float
+    ) -> list[tuple[int, Point]]:
+        bounds = (min_lat, max_lat, min_lon, max_lon)
+        if not all(map(math.isfinite, bounds)):
+            if any(map(math.isnan, bounds)):
+                return []
+            # Бесконечная граница — вся ось: сетку обходим только в пределах координат.
+            min_lat, max_lat = _clamp(min_lat, 90.0), _clamp(max_lat, 90.0)
+            min_lon, max_lon = _clamp(min_lon, 180.0), _clamp(max_lon, 180.0)
+        row_min, col_min = self._cell_of(min_lat, min_lon)
+        row_max, col_max = self._cell_of(max_lat, max_lon)
+        if row_max < row_min or col_max < col_min:
+            return []
+        span = (row_max - row_min + 1) * (col_max - col_min + 1)
+        if span <= len(self._cells):
+            buckets = (
+                self._cells.get((row, col))
+                for row in range(row_min, row_max + 1)
+                for col in range(col_min, col_max + 1)
+            )
+        else:
+            # Прямоугольник шире занятой части сетки — дешевле обойти непустые ячейки.
+            buckets = (
+                bucket
+                for (row, col), bucket in self._cells.items()
+                if row_min <= row <= row_max and col_min <= col <= col_max
+            )
+        return [
+            (building_id, (lat, lon))
+            for bucket in buckets
+            if bucket
+            for building_id, (lat, lon) in bucket.items()
+            if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon
+        ]
+
+
+def _clamp(value: float, limit: float) -> float:
+    return min(max(value, -limit), limit)
+
+
+spatial_index = BuildingSpatialIndex()
@@ -0,0 +1,122 @@
+"""Префиксный индекс названий организаций и активностей в памяти (автодополнение)."""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import re
+from typing import Literal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cache.base import ReloadableCache
+from db.models import Activity, Organization
+
+logger = logging.getLogger(__name__)
+
+SuggestionKind = Literal["organization", "activity"]
+
+KINDS: dict[type[Organization] | type[Activity], SuggestionKind] = {
+    Organization: "organization",
+    Activity: "activity",
+}
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+Entry = tuple[str, SuggestionKind, int]  # (ключ, вид, id)
+
+
+def normalize(text: str) -> str:
+    """Регистр и пунктуация не важны: casefold, разделители → один пробел."""
+    return _SEPARATORS.sub(" ", text.casefold()).strip()
+
+
+def _keys(name: str) -> list[str]:
+    """Хвосты нормализованного названия, начиная с каждого слова: «ооо рога» → «ооо рога», «рога»."""
+    words = normalize(name).split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+def match_key(name: str, prefix: str) -> str | None:
+    """Ключ, по которому suggest упорядочивает название: наименьший его хвост, начинающийся с нормализованного prefix."""
+    return min((key for key in _keys(name) if key.startswith(prefix)), default=None)
+
+
+class NameSuggestIndex(ReloadableCache):
+    """
+    Отсортированный список (ключ, вид, id), где ключ — хвост названия с начала слова.
+    Префикс ищется бинарным поиском, дальше — последовательный проход по совпадениям.
+    Изменения Organization и Activity через ORM применяются после commit (см. listen).
+    """
+
+    tracked_models = (Organization, Activity)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._entries: list[Entry] = []
+        self._names: dict[tuple[SuggestionKind, int], str] = {}
+        self._ready = False
+
+    @property
+    def ready(self) -> bool:
+        """True, если индекс загружен и им можно отвечать вместо БД."""
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    async def _load(self, session: AsyncSession) -> None:
+        """Полная (пере)загрузка названий двумя запросами."""
+        names: dict[tuple[SuggestionKind, int], str] = {}
+        for model, kind in KINDS.items():
+            result = await session.execute(select(model.id, model.name))
+            for obj_id, name in result.all():
+                names[(kind, obj_id)] = name
+        entries: list[Entry] = [
+            (key, kind, obj_id)
+            for (kind, obj_id), name in names.items()
+            for key in _keys(name)
+        ]
+        entries.sort()
+        self._entries, self._names = entries, names
+        self._ready = True
+        logger.info("Suggest index loaded: %d names", len(names))
+
+    def suggest(self, query: str, limit: int) -> list[tuple[SuggestionKind, int, str]]:
+        """До limit троек (вид, id, название), где слово названия начинается с query; по алфавиту совпавшего хвоста."""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        found: list[tuple[SuggestionKind, int, str]] = []
+        seen: set[tuple[SuggestionKind, int]] = set()
+        index = bisect.bisect_left(self._entries, (prefix,))
+        while index < len(self._entries) and len(found) < limit:
+            key, kind, obj_id = self._entries[index]
+            if not key.startswith(prefix):
+                break
+            index += 1
+            if (kind, obj_id) not in seen:
+                seen.add((kind, obj_id))
+                found.append((kind, obj_id, self._names[(kind, obj_id)]))
+        return found
+
+    def _snapshot(self, obj: Organization | Activity) -> str:
+        return obj.name
+
+    def _apply_change(self, model: type, obj_id: int, snapshot: str | None) -> None:
+        kind, name = KINDS[model], snapshot
+        old = self._names.pop((kind, obj_id), None)
+        if old is not None:
+            for key in _keys(old):
+                entry = (key, kind, obj_id)
+                index = bisect.bisect_left(self._entries, entry)
+                if index < len(self._entries) and self._entries[index] == entry:
+                    del self._entries[index]
+        if name is not None:
+            self._names[(kind, obj_id)] = name
+            for key in _keys(name):
+                bisect.insort(self._entries, (key, kind, obj_id))
+
+
+suggest_index = NameSuggestIndex()
@@ -0,0 +1,118 @@
+"""Движок БД: пул соединений из настроек и его метрики."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import exc, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from config import settings
+
+
+@dataclass
+class PoolStats:
+    """
+    Состояние пула и счётчики с момента его создания.
+    checked_out — выданные соединения, idle — свободные в пуле, overflow — открытые сверх pool_size.
+    Ожидание соединения считается от запроса до выдачи, включая открытие нового соединения и pre-ping.
+    """
+
+    pool_size: int = 0
+    max_overflow: int = 0
+    checked_out: int = 0
+    idle: int = 0
+    overflow: int = 0
+    acquisitions: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Очередь соединений asyncio с замером времени получения соединения и подсчётом таймаутов."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._acquisitions = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self._timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        self._acquisitions += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        return connection
+
+    def stats(self) -> PoolStats:
+        """Снимок состояния пула и счётчиков ожидания."""
+        return PoolStats(
+            pool_size=self.size(),
+            max_overflow=self._max_overflow,
+            checked_out=self.checkedout(),
+            idle=self.checkedin(),
+            # overflow() отрицателен, пока пул не заполнен до pool_size.
+            overflow=max(self.overflow(), 0),
+            acquisitions=self._acquisitions,
+            timeouts=self._timeouts,
+            wait_seconds_total=self._wait_total,
+            wait_seconds_max=self._wait_max,
+        )
+
+
+def create_engine(url: str | None = None) -> AsyncEngine:
+    """
+    Асинхронный движок (основная БД или url реплики) с пулом из настроек POSTGRES_POOL_* и кешами подготовленных выражений
+    (SQLAlchemy и asyncpg) размера POSTGRES_STATEMENT_CACHE_SIZE; 0 — для PgBouncer в режиме transaction.
+    Параметры сессии (extra_float_digits, порог pg_trgm) передаются при подключении.
+    """
+    engine_url = (
+        make_url(url or settings.get_url_pg)
+        .set(drivername="postgresql+asyncpg")
+        .update_query_dict(
+            {
+                "prepared_statement_cache_size": str(
+                    settings.POSTGRES_STATEMENT_CACHE_SIZE
+                )
+            }
+        )
+    )
+    return create_async_engine(
+        engine_url,
+        poolclass=InstrumentedPool,
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+        pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+        pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+        connect_args={
+            "statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                # float8 в JSON PostgreSQL (json_build_object) пишет кратчайшей точной записью только при значении > 0.
+                "extra_float_digits": "1",
+                # Порог оператора <% для поиска по названию: задаётся один раз, а не запросом на каждый поиск.
+                "pg_trgm.word_similarity_threshold": str(
+                    settings.SEARCH_MIN_SIMILARITY
+                ),
+            },
+        },
+    )
+
+
+def pool_stats(engine: AsyncEngine) -> PoolStats:
+    """Метрики пула движка; для пула другого класса (например, NullPool в тестах) — пустые."""
+    pool = engine.pool
+    if isinstance(pool, InstrumentedPool):
+        return pool.stats()
+    return PoolStats()
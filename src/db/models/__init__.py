@@ -4,6 +4,7 @@ from .activity import Activity
 from .associations import ActivityOwnership, OrganizationActivity, OrganizationBuilding
 from .base import Base
 from .building import Building
+from .data_version import DataVersion
 from .organization import Organization
 
 __all__ = [
@@ -14,4 +15,5 @@ __all__ = [
     "ActivityOwnership",
     "OrganizationBuilding",
     "OrganizationActivity",
+    "DataVersion",
 ]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import CheckConstraint, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import CheckConstraint, ForeignKey, Index, Integer, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -34,6 +34,13 @@ class OrganizationBuilding(Base):
     """Связь организаций и зданий (многие ко многим)."""
 
     __tablename__ = "organization_buildings"
+    __table_args__ = (
+        Index(
+            "ix_organization_buildings_building_id_organization_id",
+            "building_id",
+            "organization_id",
+        ),
+    )
 
     organization_id: Mapped[int] = mapped_column(
         ForeignKey("organizations.id", ondelete="CASCADE"),
@@ -49,6 +56,13 @@ class OrganizationActivity(Base):
     """Связь организаций и видов деятельности (многие ко многим)."""
 
     __tablename__ = "organization_activities"
+    __table_args__ = (
+        Index(
+            "ix_organization_activities_activity_id_organization_id",
+            "activity_id",
+            "organization_id",
+        ),
+    )
 
     organization_id: Mapped[int] = mapped_column(
         ForeignKey("organizations.id", ondelete="CASCADE"),
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Float, String
+from sqlalchemy import Float, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -10,6 +10,9 @@ class Building(Base):
     """Физическое здание, в котором могут располагаться организации."""
 
     __tablename__ = "buildings"
+    __table_args__ = (
+        Index("ix_buildings_latitude_longitude", "latitude", "longitude"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     country: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -10,6 +10,14 @@ class Organization(Base):
     """Организация в справочнике."""
 
     __tablename__ = "organizations"
+    __table_args__ = (
+        Index(
+            "ix_organizations_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -18,8 +26,10 @@ class Organization(Base):
     buildings: Mapped[list[Building]] = relationship(
         secondary="organization_buildings",
         back_populates="organizations",
+        order_by="Building.id",
     )
     activities: Mapped[list[Activity]] = relationship(
         secondary="organization_activities",
         back_populates="organizations",
+        order_by="Activity.id",
     )
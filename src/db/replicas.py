@@ -0,0 +1,123 @@
+"""Маршрутизация чтений на реплики: round-robin по здоровым, иначе — основная БД."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from db.engine import PoolStats, pool_stats
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReplicaStatus:
+    """Состояние реплики для /admin/replicas: URL без пароля, здорова ли, сколько сессий на неё выдано."""
+
+    url: str
+    healthy: bool
+    sessions: int
+
+
+class _Replica:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        self.url = engine.url.render_as_string(hide_password=True)
+        self.healthy: bool | None = None  # до первой проверки неизвестно
+        self.sessions = 0
+
+
+class ReadRouter:
+    """
+    Фабрика сессий для чтения. Реплики чередуются по кругу среди здоровых; пока ни одной здоровой нет
+    (или реплики не заданы) — сессии основной БД. Здоровье проверяется SELECT 1 (check, check_periodically);
+    разрыв соединения с репликой во время запроса сразу выводит её из ротации до следующей успешной проверки.
+    Реплики отстают от основной БД на время репликации — это видно и в ответах, и в ETag.
+    """
+
+    def __init__(
+        self, primary: async_sessionmaker[AsyncSession], replicas: list[AsyncEngine]
+    ) -> None:
+        self._primary = primary
+        self._replicas = [_Replica(engine) for engine in replicas]
+        self._next = 0
+        for replica in self._replicas:
+            event.listen(
+                replica.engine.sync_engine,
+                "handle_error",
+                self._on_error(replica),
+            )
+
+    def session_maker(self) -> async_sessionmaker[AsyncSession]:
+        """Фабрика сессий следующей здоровой реплики или основной БД."""
+        healthy = [r for r in self._replicas if r.healthy]
+        if not healthy:
+            return self._primary
+        replica = healthy[self._next % len(healthy)]
+        self._next += 1
+        replica.sessions += 1
+        return replica.session_maker
+
+    async def check(self, timeout: float) -> None:
+        """Проверяет все реплики параллельно; не ответившая за timeout секунд считается нездоровой."""
+        await asyncio.gather(*(self._check(r, timeout) for r in self._replicas))
+
+    async def check_periodically(self, interval: float, timeout: float) -> None:
+        """check каждые interval секунд (для фоновой задачи в lifespan)."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.check(timeout)
+
+    def status(self) -> list[ReplicaStatus]:
+        """Состояние всех реплик."""
+        return [
+            ReplicaStatus(r.url, bool(r.healthy), r.sessions) for r in self._replicas
+        ]
+
+    def pool_stats(self) -> dict[str, PoolStats]:
+        """Метрики пулов соединений реплик: «replica-N» в порядке POSTGRES_REPLICA_URLS (и /admin/replicas)."""
+        return {
+            f"replica-{i}": pool_stats(r.engine)
+            for i, r in enumerate(self._replicas, start=1)
+        }
+
+    async def dispose(self) -> None:
+        """Закрывает пулы соединений реплик."""
+        for replica in self._replicas:
+            await replica.engine.dispose()
+
+    async def _check(self, replica: _Replica, timeout: float) -> None:
+        try:
+            async with asyncio.timeout(timeout):
+                async with replica.engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+        except Exception as e:
+            self._set_health(replica, False, e)
+        else:
+            self._set_health(replica, True)
+
+    def _on_error(self, replica: _Replica) -> Any:
+        def handle_error(context: ExceptionContext) -> None:
+            if context.is_disconnect:
+                self._set_health(replica, False, context.original_exception)
+
+        return handle_error
+
+    @staticmethod
+    def _set_health(
+        replica: _Replica, healthy: bool, error: BaseException | None = None
+    ) -> None:
+        if replica.healthy == healthy:
+            return
+        replica.healthy = healthy
+        if healthy:
+            logger.info("Read replica is healthy: %s", replica.url)
+        else:
+            logger.warning("Read replica is unhealthy: %s (%r)", replica.url, error)
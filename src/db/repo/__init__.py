@@ -2,7 +2,16 @@
 
 from .activity import ActivityRepo
 from .base import BaseRepo
-from .building import BuildingRepo
-from .organization import OrganizationRepo
+from .building import BuildingRepo, BuildingRow
+from .data_version import DataVersionRepo
+from .organization import OrganizationRepo, OrganizationRow
 
-__all__ = ["ActivityRepo", "BaseRepo", "BuildingRepo", "OrganizationRepo"]
+__all__ = [
+    "ActivityRepo",
+    "BaseRepo",
+    "BuildingRepo",
+    "BuildingRow",
+    "DataVersionRepo",
+    "OrganizationRepo",
+    "OrganizationRow",
+]
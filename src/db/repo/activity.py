@@ -5,8 +5,10 @@ from __future__ import annotations
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from cache.activity_tree import activity_tree_cache
 from db.models import Activity, ActivityOwnership
 from db.repo.base import BaseRepo
+from db.repo.word_prefix import names_by_word_prefix
 
 
 class ActivityRepo(BaseRepo[Activity]):
@@ -54,10 +56,11 @@ class ActivityRepo(BaseRepo[Activity]):
     async def create_activity(
         self, name: str, parent_id: int | None = None
     ) -> Activity:
-        """Создаёт активность и заполняет activity_ownership (глубина 1–3)."""
+        """Создаёт активность и заполняет activity_ownership (глубина 1–3); кеш дерева сбрасывается после commit."""
         activity = Activity(name=name)
         await self.add(activity)
         await self.fill_ownership_after_create(activity.id, parent_id)
+        activity_tree_cache.invalidate_on_commit(self._session)
         return activity
 
     async def get_paths_from_ownership(
@@ -83,3 +86,11 @@ class ActivityRepo(BaseRepo[Activity]):
         for owned_id, owner_id, _depth, name in rows:
             by_owned[owned_id].append((owner_id, name))
         return [by_owned[aid] for aid in leaf_ids]
+
+    async def get_names_by_word_prefix(
+        self, prefix: str, limit: int
+    ) -> list[tuple[int, str]]:
+        """Пары (id, name) активностей, у которых слово названия начинается с нормализованного prefix; порядок как у индекса подсказок."""
+        return await names_by_word_prefix(
+            self._session, self._model.__tablename__, prefix, limit
+        )
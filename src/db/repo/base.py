@@ -8,12 +8,21 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.models import Base
+from observability import trace_methods
 
 ModelT = TypeVar("ModelT", bound=Base)
 
 
+@trace_methods
 class BaseRepo(Generic[ModelT]):
-    """Базовый репозиторий с get_by_id, get_all, add, delete, exists_by_id."""
+    """
+    Базовый репозиторий с get_by_id, get_all, add, delete, exists_by_id.
+    Асинхронные методы наследников оборачиваются в спаны трассировки автоматически.
+    """
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        trace_methods(cls)
 
     def __init__(self, session: AsyncSession, model: type[ModelT]) -> None:
         self._session = session
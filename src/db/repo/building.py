@@ -2,17 +2,56 @@
 
 from __future__ import annotations
 
-from sqlalchemy import func, select
+from sqlalchemy import ColumnElement, Row, func, literal, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Bundle
 
 from db.models import Building
 from db.repo.base import BaseRepo
+from geo import EARTH_RADIUS_KM, MAX_RADIUS_KM, bounding_box
+
+# Геопоиск отдаёт только поля BuildingDetail: строки из этих колонок вместо сущностей ORM.
+type BuildingRow = Row[
+    tuple[int, str, str | None, str, str, str, float | None, float | None]
+]
+
+_ROW_COLUMNS = (
+    Building.id,
+    Building.country,
+    Building.region,
+    Building.city,
+    Building.street,
+    Building.house_number,
+    Building.latitude,
+    Building.longitude,
+)
+# Здание рядом с вычисляемой колонкой (расстояние): отдельный элемент строки с полями BuildingRow.
+_ROW = Bundle[BuildingRow]("building", *_ROW_COLUMNS)
+
+
+def _distance_km(lat: float, lon: float) -> ColumnElement[float]:
+    """SQL-выражение: расстояние (км) от точки (lat, lon) до здания по формуле Хаверсина."""
+    dlat_rad = func.radians((Building.latitude - lat) / 2)
+    dlon_rad = func.radians((Building.longitude - lon) / 2)
+    a = func.power(func.sin(dlat_rad), 2) + func.cos(func.radians(lat)) * func.cos(
+        func.radians(Building.latitude)
+    ) * func.power(func.sin(dlon_rad), 2)
+    return EARTH_RADIUS_KM * 2 * func.asin(func.sqrt(func.least(a, 1.0)))
 
 
 class BuildingRepo(BaseRepo[Building]):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session, Building)
 
+    async def get_by_ids(self, building_ids: list[int]) -> list[BuildingRow]:
+        """Здания (поля BuildingDetail) по списку id одним запросом по PK; порядок как в building_ids, отсутствующие пропускаются."""
+        if not building_ids:
+            return []
+        stmt = select(*_ROW_COLUMNS).where(Building.id.in_(building_ids))
+        result = await self._session.execute(stmt)
+        by_id = {b.id: b for b in result.all()}
+        return [by_id[bid] for bid in building_ids if bid in by_id]
+
     async def get_in_radius(
         self,
         lat: float,
@@ -20,28 +59,67 @@ class BuildingRepo(BaseRepo[Building]):
         radius_km: float,
         *,
         limit: int | None = None,
-        offset: int = 0,
-    ) -> list[Building]:
-        """Здания с координатами в радиусе radius_km от точки (lat, lon). Формула Хаверсина."""
-        dlat_rad = func.radians((Building.latitude - lat) / 2)
-        dlon_rad = func.radians((Building.longitude - lon) / 2)
-        a = func.power(func.sin(dlat_rad), 2) + func.cos(func.radians(lat)) * func.cos(
-            func.radians(Building.latitude)
-        ) * func.power(func.sin(dlon_rad), 2)
-        dist_km = 6371.0 * 2 * func.asin(func.sqrt(a))
+        after: tuple[float, int] | None = None,
+    ) -> list[tuple[BuildingRow, float]]:
+        """
+        Здания (поля BuildingDetail) в радиусе radius_km от точки (lat, lon) с расстоянием в км, по (расстояние, id).
+        Сначала отбор по bbox вокруг круга (обслуживается индексом по latitude, longitude),
+        затем точная проверка формулой Хаверсина только для кандидатов.
+        after — ключ (расстояние, id) последней строки предыдущей страницы.
+        """
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+        dist_km = _distance_km(lat, lon).label("distance_km")
         stmt = (
-            select(Building)
+            select(_ROW, dist_km)
             .where(
-                Building.latitude.isnot(None),
-                Building.longitude.isnot(None),
+                Building.latitude.between(min_lat, max_lat),
+                Building.longitude.between(min_lon, max_lon),
                 dist_km <= radius_km,
             )
-            .offset(offset)
+            .order_by(dist_km, Building.id)
         )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(dist_km, Building.id) > tuple_(*map(literal, after))
+            )
         if limit is not None:
             stmt = stmt.limit(limit)
-        result = await self._session.scalars(stmt)
-        return list(result.all())
+        result = await self._session.execute(stmt)
+        return list(result.tuples().all())
+
+    async def get_nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int,
+        *,
+        start_radius_km: float = 1.0,
+    ) -> list[tuple[BuildingRow, float]]:
+        """
+        k ближайших к точке зданий (поля BuildingDetail) с расстоянием в км, по возрастанию расстояния.
+        Радиус поиска удваивается, пока в круге не наберётся k зданий; каждый шаг — запрос по bbox-индексу.
+        """
+        dist_km = _distance_km(lat, lon).label("distance_km")
+        radius_km = start_radius_km
+        while True:
+            radius_km = min(radius_km, MAX_RADIUS_KM)
+            min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+            stmt = (
+                select(_ROW, dist_km)
+                .where(
+                    Building.latitude.between(min_lat, max_lat),
+                    Building.longitude.between(min_lon, max_lon),
+                    dist_km <= radius_km,
+                )
+                .order_by(dist_km, Building.id)
+                .limit(k)
+            )
+            result = await self._session.execute(stmt)
+            rows = list(result.tuples().all())
+            # Всё, что вне круга, дальше radius_km — найденные k уже ближайшие.
+            if len(rows) >= k or radius_km >= MAX_RADIUS_KM:
+                return rows
+            radius_km *= 2
 
     async def get_in_bbox(
         self,
@@ -51,11 +129,11 @@ class BuildingRepo(BaseRepo[Building]):
         max_lon: float,
         *,
         limit: int | None = None,
-        offset: int = 0,
-    ) -> list[Building]:
-        """Здания с координатами внутри заданного прямоугольника (bbox)."""
+        after_id: int | None = None,
+    ) -> list[BuildingRow]:
+        """Здания (поля BuildingDetail) с координатами внутри заданного прямоугольника (bbox), по возрастанию id."""
         stmt = (
-            select(Building)
+            select(*_ROW_COLUMNS)
             .where(
                 Building.latitude.isnot(None),
                 Building.longitude.isnot(None),
@@ -64,9 +142,11 @@ class BuildingRepo(BaseRepo[Building]):
                 Building.longitude >= min_lon,
                 Building.longitude <= max_lon,
             )
-            .offset(offset)
+            .order_by(Building.id)
         )
+        if after_id is not None:
+            stmt = stmt.where(Building.id > after_id)
         if limit is not None:
             stmt = stmt.limit(limit)
-        result = await self._session.scalars(stmt)
+        result = await self._session.execute(stmt)
         return list(result.all())
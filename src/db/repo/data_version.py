@@ -0,0 +1,25 @@
+"""Репозиторий глобальной версии данных (таблица data_version)."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import DataVersion
+
+
+class DataVersionRepo:
+    """Чтение счётчика версии данных; увеличивают его триггеры БД."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get(self) -> tuple[int, datetime] | None:
+        """Текущая версия и время последнего изменения или None, если строки нет."""
+        stmt = select(DataVersion.version, DataVersion.updated_at).where(
+            DataVersion.id == 1
+        )
+        row = (await self._session.execute(stmt)).one_or_none()
+        return None if row is None else (row.version, row.updated_at)
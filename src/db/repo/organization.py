@@ -2,12 +2,95 @@
 
 from __future__ import annotations
 
-from sqlalchemy import select
+from collections.abc import AsyncIterator
+from typing import Any
+
+from sqlalchemy import Row, Select, exists, func, literal, or_, select, text, true
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import Bundle, selectinload
 
-from db.models import Organization, OrganizationActivity, OrganizationBuilding
+from db.models import (
+    Activity,
+    ActivityOwnership,
+    Organization,
+    OrganizationActivity,
+    OrganizationBuilding,
+)
 from db.repo.base import BaseRepo
+from db.repo.word_prefix import names_by_word_prefix
+
+# Списки отдают только поля OrganizationResponse: строки из этих колонок вместо сущностей ORM
+# (без identity map и отслеживания изменений — на больших выборках заметно меньше аллокаций).
+type OrganizationRow = Row[tuple[int, str, str]]
+
+_ROW_COLUMNS = (Organization.id, Organization.name, Organization.phone)
+# Организация рядом с колонкой связи (building_id): отдельный элемент строки с полями OrganizationRow.
+_ROW = Bundle[OrganizationRow]("organization", *_ROW_COLUMNS)
+
+
+def _escape_like(value: str) -> str:
+    """Строка для LIKE с escape="\\": %, _ и сама \\ совпадают буквально."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _with_activities(activity_ids: list[int]) -> Select[tuple[int]]:
+    """Подзапрос id организаций, у которых есть одна из активностей."""
+    return select(OrganizationActivity.organization_id).where(
+        OrganizationActivity.activity_id.in_(activity_ids)
+    )
+
+
+# Пробельные символы, которые срезает str.strip (как str_strip_whitespace у схем ответа).
+_WHITESPACE = "".join(c for c in map(chr, range(0x3001)) if c.isspace())
+
+# Деталь организации одним запросом: поля организации и здания (по id) — json_build_object/json_agg,
+# пути активностей организации от корня — массивы [id, name] по возрастанию id активности.
+_DETAIL_SQL = text(
+    """
+    SELECT
+        json_build_object(
+            'id', org.id,
+            'name', btrim(org.name, :whitespace),
+            'phone', btrim(org.phone, :whitespace),
+            'buildings', coalesce(b.items, '[]')
+        ) AS document,
+        coalesce(p.paths, '[]') AS activity_paths
+    FROM organizations org
+    LEFT JOIN LATERAL (
+        SELECT json_agg(
+            json_build_object(
+                'id', bl.id,
+                'country', btrim(bl.country, :whitespace),
+                'region', btrim(bl.region, :whitespace),
+                'city', btrim(bl.city, :whitespace),
+                'street', btrim(bl.street, :whitespace),
+                'house_number', btrim(bl.house_number, :whitespace),
+                'latitude', bl.latitude,
+                'longitude', bl.longitude
+            )
+            ORDER BY bl.id
+        ) AS items
+        FROM organization_buildings ob
+        JOIN buildings bl ON bl.id = ob.building_id
+        WHERE ob.organization_id = org.id
+    ) b ON true
+    LEFT JOIN LATERAL (
+        SELECT json_agg(path.items ORDER BY oa.activity_id) AS paths
+        FROM organization_activities oa
+        CROSS JOIN LATERAL (
+            SELECT json_agg(
+                json_build_array(o.owner_id, btrim(a.name, :whitespace))
+                ORDER BY o.depth DESC
+            ) AS items
+            FROM activity_ownership o
+            JOIN activities a ON a.id = o.owner_id
+            WHERE o.owned_id = oa.activity_id
+        ) path
+        WHERE oa.organization_id = org.id AND path.items IS NOT NULL
+    ) p ON true
+    WHERE org.id = :org_id
+    """
+)
 
 
 class OrganizationRepo(BaseRepo[Organization]):
@@ -26,135 +109,266 @@ class OrganizationRepo(BaseRepo[Organization]):
         result = await self._session.scalars(stmt)
         return result.unique().one_or_none()
 
-    async def get_by_name_with_relations(
-        self, name: str, *, limit: int | None = None
-    ) -> list[Organization]:
-        """Организации, в названии которых есть подстрока (без учёта регистра), с загрузкой зданий и активностей."""
+    async def get_detail_document(
+        self, org_id: int
+    ) -> tuple[dict[str, Any], list[list[tuple[int, str]]]] | None:
+        """
+        Деталь организации одним запросом без ORM: документ (id, name, phone, buildings), собранный PostgreSQL,
+        и пути активностей организации от корня к листу (id, name), как ActivityRepo.get_paths_from_ownership.
+        None, если организации нет.
+        """
+        row = (
+            await self._session.execute(
+                _DETAIL_SQL, {"org_id": org_id, "whitespace": _WHITESPACE}
+            )
+        ).one_or_none()
+        if row is None:
+            return None
+        paths = [[tuple(step) for step in path] for path in row.activity_paths]
+        return row.document, paths
+
+    async def get_by_ids_with_relations(self, org_ids: list[int]) -> list[Organization]:
+        """Организации по списку id с зданиями и активностями, по возрастанию id; отсутствующие id пропускаются."""
+        if not org_ids:
+            return []
         stmt = (
             select(Organization)
-            .where(Organization.name.ilike(f"%{name}%"))
+            .where(Organization.id.in_(org_ids))
             .options(
                 selectinload(Organization.buildings),
                 selectinload(Organization.activities),
             )
+            .order_by(Organization.id)
         )
-        if limit is not None:
-            stmt = stmt.limit(limit)
         result = await self._session.scalars(stmt)
         return list(result.unique().all())
 
+    async def get_by_name_with_relations(
+        self,
+        name: str,
+        *,
+        min_similarity: float | None = None,
+        limit: int | None = None,
+    ) -> list[tuple[Organization, float]]:
+        """
+        Поиск по названию с загрузкой зданий и активностей: подстрока (ILIKE, % и _ буквально) или похожее слово
+        (pg_trgm word_similarity не ниже порога). Оба условия обслуживаются GIN-индексом по триграммам.
+        Порог по умолчанию — SEARCH_MIN_SIMILARITY, заданный соединению при подключении; другой min_similarity
+        выставляется до конца транзакции отдельным запросом.
+        Возвращает пары (организация, релевантность 0..1) по убыванию релевантности, затем по id.
+        """
+        if min_similarity is not None:
+            await self._session.execute(
+                select(
+                    func.set_config(
+                        "pg_trgm.word_similarity_threshold", str(min_similarity), True
+                    )
+                )
+            )
+        score = func.word_similarity(name, Organization.name).label("score")
+        stmt = (
+            select(Organization, score)
+            .where(
+                or_(
+                    Organization.name.ilike(f"%{_escape_like(name)}%", escape="\\"),
+                    literal(name).op("<%")(Organization.name),
+                )
+            )
+            .options(
+                selectinload(Organization.buildings),
+                selectinload(Organization.activities),
+            )
+            .order_by(score.desc(), Organization.id)
+        )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self._session.execute(stmt)
+        return list(result.unique().tuples().all())
+
     async def get_by_activity_id(
         self,
         activity_id: int,
         *,
         limit: int | None = None,
-        offset: int = 0,
-    ) -> list[Organization]:
+        after_id: int | None = None,
+    ) -> list[OrganizationRow]:
+        """Организации (id, name, phone) с указанной активностью, по возрастанию id (after_id — ключ предыдущей страницы)."""
         stmt = (
-            select(Organization)
+            select(*_ROW_COLUMNS)
             .join(
                 OrganizationActivity,
                 Organization.id == OrganizationActivity.organization_id,
             )
             .where(OrganizationActivity.activity_id == activity_id)
-            .offset(offset)
+            .order_by(Organization.id)
         )
+        if after_id is not None:
+            stmt = stmt.where(Organization.id > after_id)
         if limit is not None:
             stmt = stmt.limit(limit)
-        result = await self._session.scalars(stmt)
-        return list(result.unique().all())
+        result = await self._session.execute(stmt)
+        return list(result.all())
 
     async def get_by_activity_ids(
         self,
         activity_ids: list[int],
         *,
         limit: int | None = None,
-        offset: int = 0,
-    ) -> list[Organization]:
-        """Организации, у которых есть хотя бы одна из указанных активностей (без дублей)."""
+        after_id: int | None = None,
+    ) -> list[OrganizationRow]:
+        """
+        Организации (id, name, phone), у которых есть хотя бы одна из указанных активностей, по возрастанию id.
+        Полусоединение (IN по подзапросу) вместо JOIN + DISTINCT: дублей нет без сортировки целых строк.
+        """
         if not activity_ids:
             return []
         stmt = (
-            select(Organization)
-            .join(
-                OrganizationActivity,
-                Organization.id == OrganizationActivity.organization_id,
-            )
-            .where(OrganizationActivity.activity_id.in_(activity_ids))
-            .distinct()
-            .offset(offset)
+            select(*_ROW_COLUMNS)
+            .where(Organization.id.in_(_with_activities(activity_ids)))
+            .order_by(Organization.id)
         )
+        if after_id is not None:
+            stmt = stmt.where(Organization.id > after_id)
         if limit is not None:
             stmt = stmt.limit(limit)
-        result = await self._session.scalars(stmt)
-        return list(result.unique().all())
+        result = await self._session.execute(stmt)
+        return list(result.all())
+
+    async def get_by_owner_activity(
+        self,
+        activity_id: int,
+        *,
+        limit: int | None = None,
+        after_id: int | None = None,
+    ) -> list[OrganizationRow] | None:
+        """
+        Организации (id, name, phone) с активностью activity_id или её потомком, по возрастанию id — одним запросом.
+        Потомки берутся из activity_ownership (owner_id = activity_id) в EXISTS-полусоединении, без списка id.
+        Страница присоединяется LEFT JOIN к строке активности: нет строки — None (активности нет),
+        одна строка с NULL — активность есть, организаций нет.
+        """
+        linked = exists().where(
+            OrganizationActivity.organization_id == Organization.id,
+            ActivityOwnership.owned_id == OrganizationActivity.activity_id,
+            ActivityOwnership.owner_id == activity_id,
+        )
+        orgs = select(*_ROW_COLUMNS).order_by(Organization.id)
+        if after_id is not None:
+            # Граница дублируется внутри EXISTS: иначе слияние начинает organization_activities с начала.
+            linked = linked.where(OrganizationActivity.organization_id > after_id)
+            orgs = orgs.where(Organization.id > after_id)
+        orgs = orgs.where(linked)
+        if limit is not None:
+            orgs = orgs.limit(limit)
+        page = orgs.subquery("page")
+        stmt = (
+            select(page.c.id, page.c.name, page.c.phone)
+            .select_from(Activity)
+            .outerjoin(page, true())
+            .where(Activity.id == activity_id)
+            .order_by(page.c.id)
+        )
+        rows = (await self._session.execute(stmt)).all()
+        if not rows:
+            return None
+        return [row for row in rows if row.id is not None]
+
+    async def stream_by_activity_ids(
+        self, activity_ids: list[int], *, batch_size: int
+    ) -> AsyncIterator[list[OrganizationRow]]:
+        """Организации (id, name, phone) с любой из активностей (без дублей, по id) пачками через серверный курсор."""
+        if not activity_ids:
+            return
+        stmt = (
+            select(*_ROW_COLUMNS)
+            .where(Organization.id.in_(_with_activities(activity_ids)))
+            .order_by(Organization.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self._session.stream(stmt)
+        async for partition in result.partitions():
+            yield list(partition)
 
     async def get_by_building_id(
         self,
         building_id: int,
         *,
         limit: int | None = None,
-        offset: int = 0,
-    ) -> list[Organization]:
-        """Организации, расположенные в указанном здании."""
+        after_id: int | None = None,
+    ) -> list[OrganizationRow]:
+        """Организации (id, name, phone), расположенные в указанном здании, по возрастанию id."""
         stmt = (
-            select(Organization)
+            select(*_ROW_COLUMNS)
             .join(
                 OrganizationBuilding,
                 Organization.id == OrganizationBuilding.organization_id,
             )
             .where(OrganizationBuilding.building_id == building_id)
-            .distinct()
-            .offset(offset)
+            .order_by(Organization.id)
         )
+        if after_id is not None:
+            stmt = stmt.where(Organization.id > after_id)
         if limit is not None:
             stmt = stmt.limit(limit)
-        result = await self._session.scalars(stmt)
-        return list(result.unique().all())
+        result = await self._session.execute(stmt)
+        return list(result.all())
 
     async def get_by_building_ids(
         self,
         building_ids: list[int],
         *,
         limit: int | None = None,
-        offset: int = 0,
-    ) -> list[Organization]:
-        """Организации, у которых есть хотя бы одно здание из списка (без дублей)."""
+        after_id: int | None = None,
+    ) -> list[OrganizationRow]:
+        """Организации (id, name, phone), у которых есть хотя бы одно здание из списка (без дублей), по возрастанию id."""
         if not building_ids:
             return []
         stmt = (
-            select(Organization)
-            .join(
-                OrganizationBuilding,
-                Organization.id == OrganizationBuilding.organization_id,
+            select(*_ROW_COLUMNS)
+            .where(
+                Organization.id.in_(
+                    select(OrganizationBuilding.organization_id).where(
+                        OrganizationBuilding.building_id.in_(building_ids)
+                    )
+                )
             )
-            .where(OrganizationBuilding.building_id.in_(building_ids))
-            .distinct()
-            .offset(offset)
+            .order_by(Organization.id)
         )
+        if after_id is not None:
+            stmt = stmt.where(Organization.id > after_id)
         if limit is not None:
             stmt = stmt.limit(limit)
-        result = await self._session.scalars(stmt)
-        return list(result.unique().all())
+        result = await self._session.execute(stmt)
+        return list(result.all())
 
     async def get_organizations_grouped_by_building(
         self, building_ids: list[int]
-    ) -> dict[int, list[Organization]]:
-        """Один запрос: для каждого building_id из списка — список организаций в этом здании."""
+    ) -> dict[int, list[OrganizationRow]]:
+        """
+        Один запрос: для каждого building_id из списка — организации в этом здании, по id.
+        """
         if not building_ids:
             return {}
         stmt = (
-            select(Organization, OrganizationBuilding.building_id)
+            select(_ROW, OrganizationBuilding.building_id)
             .select_from(Organization)
             .join(
                 OrganizationBuilding,
                 Organization.id == OrganizationBuilding.organization_id,
             )
             .where(OrganizationBuilding.building_id.in_(building_ids))
+            .order_by(Organization.id)
         )
         result = await self._session.execute(stmt)
-        rows = result.all()
-        grouped: dict[int, list[Organization]] = {bid: [] for bid in building_ids}
-        for org, building_id in rows:
+        grouped: dict[int, list[OrganizationRow]] = {bid: [] for bid in building_ids}
+        for org, building_id in result.tuples():
             grouped[building_id].append(org)
         return grouped
+
+    async def get_names_by_word_prefix(
+        self, prefix: str, limit: int
+    ) -> list[tuple[int, str]]:
+        """Пары (id, name) организаций, у которых слово названия начинается с нормализованного prefix; порядок как у индекса подсказок."""
+        return await names_by_word_prefix(
+            self._session, self._model.__tablename__, prefix, limit
+        )
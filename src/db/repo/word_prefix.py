@@ -0,0 +1,62 @@
+"""Поиск id и названий по началу слова — общий для репозиториев с колонкой name (организации, активности)."""
+
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Совпадение по началу слова как у NameSuggestIndex: название нормализуется (нижний регистр, разделители [\W_]+ →
+# пробел), ключ сортировки — наименьший хвост названия с начала слова, который начинается с префикса (порядок байтов,
+# как у строк в Python). Обычно такой хвост один — первое вхождение « префикс»; хвосты перебираются, только если
+# префикс встречается в нём ещё раз. ILIKE по каждому слову префикса — предварительный отбор, который обслуживает
+# триграммный индекс по name, если он есть.
+_WORD_PREFIX_SQL = """
+SELECT t.id, t.name
+FROM (
+    SELECT t.id, t.name, ' ' || btrim(regexp_replace(lower(t.name), '[\\W_]+', ' ', 'g')) AS words
+    FROM {table} AS t
+    WHERE {words}
+    OFFSET 0
+) AS t
+CROSS JOIN LATERAL (SELECT substr(t.words, nullif(strpos(t.words, :needle), 0) + 1) AS tail) AS m
+CROSS JOIN LATERAL (
+    SELECT CASE
+        WHEN strpos(substr(m.tail, 2), :needle) = 0 THEN m.tail COLLATE "C"
+        ELSE (
+            SELECT min(array_to_string(w.words[i:], ' ') COLLATE "C")
+            FROM (SELECT string_to_array(m.tail, ' ') AS words) AS w
+            CROSS JOIN LATERAL generate_subscripts(w.words, 1) AS i
+            WHERE array_to_string(w.words[i:], ' ') LIKE :pattern
+        )
+    END AS key
+) AS k
+WHERE m.tail IS NOT NULL
+ORDER BY k.key, t.id
+LIMIT :limit
+"""
+
+
+async def names_by_word_prefix(
+    session: AsyncSession, table: str, prefix: str, limit: int
+) -> list[tuple[int, str]]:
+    """
+    Пары (id, name) строк table, у которых слово названия начинается с prefix — нормализованного
+    (cache.suggest_index.normalize) и потому без метасимволов LIKE; порядок как у NameSuggestIndex.suggest.
+    """
+    words = prefix.split()
+    if not words:
+        return []
+    params: dict[str, object] = {
+        "needle": f" {prefix}",
+        "pattern": f"{prefix}%",
+        "limit": limit,
+    }
+    params.update({f"word_{i}": f"%{word}%" for i, word in enumerate(words)})
+    stmt = text(
+        _WORD_PREFIX_SQL.format(
+            table=table,
+            words=" AND ".join(f"t.name ILIKE :word_{i}" for i in range(len(words))),
+        )
+    )
+    result = await session.execute(stmt, params)
+    return list(result.tuples().all())
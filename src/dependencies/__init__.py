@@ -1,6 +1,12 @@
 """Зависимости FastAPI: сессия БД и сервисы."""
 
-from .db import get_session
+from .conditional import conditional_get
+from .db import get_read_session, get_session
 from .services import get_organization_service
 
-__all__ = ["get_session", "get_organization_service"]
+__all__ = [
+    "conditional_get",
+    "get_organization_service",
+    "get_read_session",
+    "get_session",
+]
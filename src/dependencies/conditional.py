@@ -0,0 +1,71 @@
+"""Условные GET-запросы: ETag и Last-Modified по глобальной версии данных."""
+
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cache import set_data_version
+from config import settings
+from db.repo import DataVersionRepo
+from dependencies.db import get_read_session
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Слабое сравнение по RFC 9110: W/ не учитывается, * совпадает с любым тегом."""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _not_modified_since(if_modified_since: str | None, updated_at: datetime) -> bool:
+    """Даты в HTTP с точностью до секунды; некорректный заголовок игнорируется."""
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return updated_at.replace(microsecond=0) <= since
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_read_session),
+) -> None:
+    """
+    Зависимость для GET-эндпоинтов справочника: ETag/Last-Modified из версии данных (одна строка data_version).
+    Совпал If-None-Match (или не изменилось с If-Modified-Since) — 304 до запросов сервиса.
+    Версия читается до данных и из той же сессии (той же реплики), поэтому тег может быть только старше ответа, но не новее;
+    она же входит в ключи кеша ответов и single flight, чтобы общий ответ не был собран до этой версии.
+    """
+    if not settings.CONDITIONAL_GET_ENABLED or request.method != "GET":
+        return
+    current = await DataVersionRepo(session).get()
+    if current is None:
+        return
+    version, updated_at = current
+    set_data_version(version)
+    headers = {
+        "ETag": f'"{version}"',
+        "Last-Modified": format_datetime(
+            updated_at.replace(microsecond=0), usegmt=True
+        ),
+        "Cache-Control": "private, no-cache",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, headers["ETag"])
+    else:
+        not_modified = _not_modified_since(
+            request.headers.get("if-modified-since"), updated_at
+        )
+    if not_modified:
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
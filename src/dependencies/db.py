@@ -1,4 +1,4 @@
-"""Зависимости для доступа к БД: сессия SQLAlchemy."""
+"""Зависимости для доступа к БД: сессии SQLAlchemy основной БД и для чтения (реплики)."""
 
 from collections.abc import AsyncGenerator
 
@@ -10,3 +10,12 @@ async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """Возвращает асинхронную сессию БД из контекста приложения."""
     async with request.app.state.async_session_maker() as session:
         yield session
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия только для чтения: на здоровую реплику (по кругу) или на основную БД, если реплик нет.
+    В пределах запроса одна сессия, поэтому все зависимости читают с одного сервера.
+    """
+    async with request.app.state.read_router.session_maker()() as session:
+        yield session
@@ -1,14 +1,14 @@
-"""Зависимости для сервисов: OrganizationService с сессией БД."""
+"""Зависимости для сервисов: OrganizationService с сессией для чтения."""
 
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from dependencies.db import get_session
+from dependencies.db import get_read_session
 from services import OrganizationService
 
 
 async def get_organization_service(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> OrganizationService:
-    """Возвращает экземпляр OrganizationService с текущей сессией."""
+    """Возвращает экземпляр OrganizationService с сессией для чтения (сервис только читает)."""
     return OrganizationService(session)
@@ -0,0 +1,46 @@
+"""Геометрия на сфере: расстояние по Хаверсину и ограничивающий прямоугольник вокруг точки."""
+
+from __future__ import annotations
+
+import math
+
+EARTH_RADIUS_KM = 6371.0
+# Половина окружности Земли: круг такого радиуса покрывает всю сферу.
+MAX_RADIUS_KM = math.pi * EARTH_RADIUS_KM
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Расстояние в километрах между двумя точками (градусы) по формуле Хаверсина."""
+    dlat = math.radians(lat2 - lat1) / 2
+    dlon = math.radians(lon2 - lon1) / 2
+    a = (
+        math.sin(dlat) ** 2
+        + math.cos(math.radians(lat1))
+        * math.cos(math.radians(lat2))
+        * math.sin(dlon) ** 2
+    )
+    return EARTH_RADIUS_KM * 2 * math.asin(math.sqrt(min(1.0, a)))
+
+
+def bounding_box(
+    lat: float, lon: float, radius_km: float
+) -> tuple[float, float, float, float]:
+    """
+    Прямоугольник (min_lat, max_lat, min_lon, max_lon), гарантированно содержащий круг radius_km вокруг точки.
+    Если круг задевает полюс или пересекает антимеридиан, долгота берётся целиком (-180..180).
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    dlat = math.degrees(angular)
+    min_lat = lat - dlat
+    max_lat = lat + dlat
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+    ratio = math.sin(angular) / math.cos(math.radians(lat))
+    if ratio >= 1.0:
+        return min_lat, max_lat, -180.0, 180.0
+    dlon = math.degrees(math.asin(ratio))
+    min_lon = lon - dlon
+    max_lon = lon + dlon
+    if min_lon < -180.0 or max_lon > 180.0:
+        return min_lat, max_lat, -180.0, 180.0
+    return min_lat, max_lat, min_lon, max_lon
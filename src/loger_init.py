@@ -1,10 +1,117 @@
 """Единая настройка логера: один вызов настраивает корневой логер, все модули используют logging.getLogger(__name__)."""
 
+import atexit
+import copy
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import time
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
+import orjson
+
 from config import settings
+from observability.request_id import current_request_id
+
+# Атрибуты любой LogRecord; всё остальное — поля из extra.
+_RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None))
+) | {"message", "asctime", "request_id", "rate_limit_key", "rate_limit_passed"}
+
+_RATE_LIMIT_WINDOW_SECONDS = 60.0
+
+
+class RequestIdFilter(logging.Filter):
+    """Добавляет в запись request_id текущего HTTP-запроса (или None)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = current_request_id()
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Не больше per_minute записей в минуту на ключ из extra={"rate_limit_key": ...}; записи без ключа не ограничиваются.
+    Первая запись следующей минуты сообщает, сколько похожих было отброшено.
+    """
+
+    def __init__(self, per_minute: int) -> None:
+        super().__init__()
+        self.per_minute = per_minute
+        self._lock = threading.Lock()
+        # ключ → [начало окна, пропущено, отброшено]
+        self._windows: dict[str, list[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Фильтр стоит на каждом обработчике: решение принимается один раз на запись.
+        passed = getattr(record, "rate_limit_passed", None)
+        if passed is None:
+            passed = self._decide(record)
+            record.rate_limit_passed = passed
+        return passed
+
+    def _decide(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "rate_limit_key", None)
+        if key is None or self.per_minute <= 0:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= _RATE_LIMIT_WINDOW_SECONDS:
+                suppressed = int(window[2]) if window else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.msg = f"{record.msg} (suppressed {suppressed} similar messages in the previous minute)"
+                return True
+            if window[1] < self.per_minute:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+class JsonFormatter(logging.Formatter):
+    """Запись как строка JSON: time, level, logger, message, request_id, поля из extra и exc_info."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = record.stack_info
+        return orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class _QueueHandler(QueueHandler):
+    """
+    QueueHandler без форматирования в потоке приложения: в очередь уходит копия записи с подставленными
+    аргументами и текстом исключения, форматтеры обработчиков применяются в потоке QueueListener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
 
 def setup_logger() -> logging.Logger:
@@ -12,6 +119,8 @@ def setup_logger() -> logging.Logger:
     Настраивает корневой логер (консоль + ротируемый файл).
     Вызвать один раз при старте приложения (например, в lifespan).
     В любом модуле использовать: logger = logging.getLogger(__name__).
+    LOG_QUEUE_ENABLED — запись в консоль и файл в фоновом потоке (QueueListener), а не в потоке event loop;
+    LOG_FORMAT=json — строка JSON на запись; LOG_RATE_LIMIT_PER_MINUTE — ограничение частых предупреждений (4xx).
     """
     root = logging.getLogger()
     if root.handlers:
@@ -20,9 +129,12 @@ def setup_logger() -> logging.Logger:
     logs_dir.mkdir(exist_ok=True)
     level = getattr(logging, settings.LOGGER_LVL.upper(), logging.INFO)
     root.setLevel(level)
-    formatter = logging.Formatter(
-        "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
-    )
+    if settings.LOG_FORMAT == "json":
+        formatter: logging.Formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+        )
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
     file_handler = RotatingFileHandler(
@@ -32,6 +144,22 @@ def setup_logger() -> logging.Logger:
         encoding="utf-8",
     )
     file_handler.setFormatter(formatter)
-    root.addHandler(console_handler)
-    root.addHandler(file_handler)
+    filters = [RequestIdFilter(), RateLimitFilter(settings.LOG_RATE_LIMIT_PER_MINUTE)]
+    if settings.LOG_QUEUE_ENABLED:
+        log_queue: queue.Queue[logging.LogRecord] = queue.Queue()
+        queue_handler = _QueueHandler(log_queue)
+        for log_filter in filters:
+            queue_handler.addFilter(log_filter)
+        listener = QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        listener.start()
+        # Дописать оставшиеся в очереди записи при завершении процесса.
+        atexit.register(listener.stop)
+        root.addHandler(queue_handler)
+        return root
+    for handler in (console_handler, file_handler):
+        for log_filter in filters:
+            handler.addFilter(log_filter)
+        root.addHandler(handler)
     return root
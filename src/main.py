@@ -2,43 +2,133 @@
 Точка входа FastAPI: создание приложения и запуск uvicorn.
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from api import v1_router
+from cache import (
+    MemoryResponseBackend,
+    ReloadableCache,
+    activity_tree_cache,
+    response_cache,
+    spatial_index,
+    suggest_index,
+)
 from config import settings
+from db.engine import create_engine
+from db.replicas import ReadRouter
 from exceptions import APIException, InternalError
 from loger_init import setup_logger
+from observability import (
+    FileExporter,
+    MemoryExporter,
+    MetricsMiddleware,
+    QueryStatsMiddleware,
+    RequestIdMiddleware,
+    TracingMiddleware,
+    slow_query_log,
+    tracer,
+)
+from observability import listen as listen_queries
 
 logger = setup_logger()
 
 
+async def _start_cache(
+    app: FastAPI,
+    cache: ReloadableCache,
+    reload_seconds: int,
+    background: list[asyncio.Task[None]],
+) -> None:
+    """Первичная загрузка кеша, подписка на изменения ORM и периодическая перезагрузка (reload_seconds > 0)."""
+    cache.bind(app.state.async_session_maker)
+    async with app.state.async_session_maker() as session:
+        await cache.load(session)
+    cache.listen()
+    if reload_seconds > 0:
+        background.append(
+            asyncio.create_task(cache.reload_periodically(reload_seconds))
+        )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Жизненный цикл приложения: движок БД и фабрика сессий."""
-    engine = create_async_engine(settings.get_url_pg)
+    """Жизненный цикл приложения: движок БД (пул из настроек), реплики для чтения, фабрика сессий, индексы в памяти и экспорт трасс."""
+    engine = create_engine()
     app.state.engine = engine
-    app.state.async_session_maker = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
+    app.state.async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    listen_queries()
+    slow_query_log.listen()
+    if settings.TRACING_ENABLED:
+        tracer.configure(
+            FileExporter(settings.TRACING_FILE)
+            if settings.TRACING_EXPORTER == "file"
+            else MemoryExporter(settings.TRACING_MEMORY_MAX_SPANS)
+        )
+    read_router = ReadRouter(
+        app.state.async_session_maker,
+        [create_engine(url) for url in settings.POSTGRES_REPLICA_URLS],
     )
+    app.state.read_router = read_router
+    background: list[asyncio.Task[None]] = []
+    if settings.POSTGRES_REPLICA_URLS:
+        await read_router.check(settings.REPLICA_HEALTH_CHECK_TIMEOUT)
+        background.append(
+            asyncio.create_task(
+                read_router.check_periodically(
+                    settings.REPLICA_HEALTH_CHECK_SECONDS,
+                    settings.REPLICA_HEALTH_CHECK_TIMEOUT,
+                )
+            )
+        )
+    if settings.ACTIVITY_CACHE_ENABLED:
+        await _start_cache(
+            app, activity_tree_cache, settings.ACTIVITY_CACHE_RELOAD_SECONDS, background
+        )
+    if settings.SPATIAL_INDEX_ENABLED:
+        spatial_index.configure(settings.SPATIAL_INDEX_CELL_DEG)
+        await _start_cache(
+            app, spatial_index, settings.SPATIAL_INDEX_RELOAD_SECONDS, background
+        )
+    if settings.RESPONSE_CACHE_ENABLED:
+        response_cache.use(
+            MemoryResponseBackend(
+                max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+                max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+            ),
+            ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+        )
+        response_cache.listen()
+    if settings.SUGGEST_INDEX_ENABLED:
+        await _start_cache(
+            app, suggest_index, settings.SUGGEST_INDEX_RELOAD_SECONDS, background
+        )
     yield
+    for task in background:
+        task.cancel()
+    await read_router.dispose()
     await engine.dispose()
+    tracer.configure(None)
 
 
 app = FastAPI(
     title="Organizations API",
     lifespan=lifespan,
 )
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
+app.add_middleware(RequestIdMiddleware)
 app.include_router(v1_router)
 
 
 @app.exception_handler(APIException)
 async def api_exception_handler(request: Request, exc: APIException) -> JSONResponse:
-    """Преобразование доменных исключений в HTTP-ответ и логирование."""
+    """Преобразование доменных исключений в HTTP-ответ и логирование (4xx — с ограничением частоты по типу)."""
     http_exc = exc.to_http_exception()
     if http_exc.status_code >= 500:
         logger.error(
@@ -52,7 +142,11 @@ async def api_exception_handler(request: Request, exc: APIException) -> JSONResp
             "APIException 4xx: %s - %s",
             type(exc).__name__,
             exc,
-            extra={"status_code": http_exc.status_code, "detail": http_exc.detail},
+            extra={
+                "status_code": http_exc.status_code,
+                "detail": http_exc.detail,
+                "rate_limit_key": f"4xx:{type(exc).__name__}",
+            },
         )
     return JSONResponse(
         status_code=http_exc.status_code,
@@ -0,0 +1,70 @@
+"""Наблюдаемость: идентификатор запроса, счётчики и замеры запросов к БД, журнал медленных запросов, метрики Prometheus,
+трассировка и профилировщик."""
+
+from .metrics import (
+    CONTENT_TYPE,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsMiddleware,
+    MetricsRegistry,
+    pool_metrics,
+    registry,
+    timed,
+)
+from .profiler import SamplingProfiler, profiler
+from .queries import (
+    QueryStats,
+    QueryStatsMiddleware,
+    count_queries,
+    listen,
+)
+from .request_id import RequestIdMiddleware, current_request_id
+from .slow_queries import SlowQuery, SlowQueryLog, slow_query_log
+from .tracing import (
+    FileExporter,
+    MemoryExporter,
+    Span,
+    SpanExporter,
+    Tracer,
+    TracingMiddleware,
+    current_span,
+    span,
+    trace_methods,
+    traced,
+    tracer,
+)
+
+__all__ = [
+    "CONTENT_TYPE",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsMiddleware",
+    "MetricsRegistry",
+    "pool_metrics",
+    "registry",
+    "timed",
+    "SamplingProfiler",
+    "profiler",
+    "QueryStats",
+    "QueryStatsMiddleware",
+    "count_queries",
+    "listen",
+    "RequestIdMiddleware",
+    "current_request_id",
+    "SlowQuery",
+    "SlowQueryLog",
+    "slow_query_log",
+    "FileExporter",
+    "MemoryExporter",
+    "Span",
+    "SpanExporter",
+    "Tracer",
+    "TracingMiddleware",
+    "current_span",
+    "span",
+    "trace_methods",
+    "traced",
+    "tracer",
+]
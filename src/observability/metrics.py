@@ -0,0 +1,268 @@
+"""Метрики в текстовом формате Prometheus: HTTP-запросы по маршрутам, время методов сервиса, пул соединений."""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import time
+from collections.abc import Awaitable, Callable, Iterable, Iterator, Mapping
+from dataclasses import asdict
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+from db.engine import PoolStats
+
+type Labels = tuple[str, ...]
+
+# Границы корзин гистограмм по умолчанию (как в клиентах Prometheus), секунды.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Общее у метрик: имя, описание, имена меток и заголовок # HELP / # TYPE."""
+
+    type_name = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def collect(self) -> Iterator[str]:
+        """Строки метрики в формате exposition."""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type_name}"
+        yield from self._samples()
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def _labels(self, labels: Labels, extra: str = "") -> str:
+        pairs = [
+            f'{name}="{_escape(value)}"'
+            for name, value in zip(self.labelnames, labels, strict=True)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter(_Metric):
+    """Монотонный счётчик по набору значений меток."""
+
+    type_name = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _samples(self) -> Iterator[str]:
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{self._labels(labels)} {_number(value)}"
+
+
+class Gauge(Counter):
+    """Текущее значение (может уменьшаться)."""
+
+    type_name = "gauge"
+
+    def set(self, *labels: str, value: float) -> None:
+        self._values[labels] = value
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Гистограмма: корзины le (накопительно при выводе), _sum и _count по набору значений меток."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Последняя корзина — +Inf.
+        self._counts: dict[Labels, list[int]] = {}
+        self._sums: dict[Labels, float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    def _samples(self) -> Iterator[str]:
+        for labels, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{self._labels(labels, le)} {cumulative}"
+            yield f"{self.name}_sum{self._labels(labels)} {_number(self._sums[labels])}"
+            yield f"{self.name}_count{self._labels(labels)} {cumulative}"
+
+
+class MetricsRegistry:
+    """Метрики процесса; render — их текст вместе с собранными в момент запроса (пул соединений)."""
+
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def register[M: _Metric](self, metric: M) -> M:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self, extra: Iterable[_Metric] = ()) -> str:
+        lines = [line for m in (*self._metrics, *extra) for line in m.collect()]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.register(
+    Counter(
+        "http_requests_total",
+        "HTTP requests by method, route template and status code.",
+        ("method", "route", "status"),
+    )
+)
+http_request_duration = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency (until the response body is sent) by method and route template.",
+        ("method", "route"),
+    )
+)
+http_requests_in_flight = registry.register(
+    Gauge("http_requests_in_flight", "HTTP requests currently being handled.")
+)
+service_duration = registry.register(
+    Histogram(
+        "service_method_duration_seconds",
+        "Service method latency by method name.",
+        ("method",),
+    )
+)
+
+# Поля PoolStats → (имя метрики, тип, описание).
+_POOL_METRICS: dict[str, tuple[str, type[Counter], str]] = {
+    "pool_size": ("db_pool_size", Gauge, "Configured pool size."),
+    "max_overflow": ("db_pool_max_overflow", Gauge, "Configured max overflow."),
+    "checked_out": ("db_pool_checked_out", Gauge, "Connections checked out."),
+    "idle": ("db_pool_idle", Gauge, "Idle connections in the pool."),
+    "overflow": ("db_pool_overflow", Gauge, "Connections open above pool_size."),
+    "acquisitions": (
+        "db_pool_acquisitions_total",
+        Counter,
+        "Connections handed out by the pool.",
+    ),
+    "timeouts": (
+        "db_pool_timeouts_total",
+        Counter,
+        "Connection requests that timed out waiting for the pool.",
+    ),
+    "wait_seconds_total": (
+        "db_pool_wait_seconds_total",
+        Counter,
+        "Total time spent waiting for a connection.",
+    ),
+    "wait_seconds_max": (
+        "db_pool_wait_seconds_max",
+        Gauge,
+        "Longest wait for a connection.",
+    ),
+}
+
+
+def pool_metrics(pools: Mapping[str, PoolStats]) -> list[_Metric]:
+    """Метрики пулов соединений с меткой pool (primary или replica-N)."""
+    metrics: dict[str, Counter] = {}
+    for pool, stats in pools.items():
+        for field, value in asdict(stats).items():
+            name, cls, documentation = _POOL_METRICS[field]
+            metric = metrics.setdefault(name, cls(name, documentation, ("pool",)))
+            metric.inc(pool, amount=value)
+    return list(metrics.values())
+
+
+def timed[**P, T](
+    method: Callable[P, Awaitable[T]],
+) -> Callable[P, Awaitable[T]]:
+    """Декоратор метода сервиса: время вызова (и с исключением) в service_method_duration_seconds."""
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        started = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            service_duration.observe(time.perf_counter() - started, name)
+
+    return wrapper
+
+
+class MetricsMiddleware:
+    """
+    ASGI-middleware: число запросов по методу, шаблону маршрута и коду ответа, гистограмма времени
+    (до отправки всего тела, включая потоковые ответы) и число запросов в обработке.
+    Маршрут — шаблон пути (/api/v1/organizations/{organization_id}); без совпадения — unmatched.
+    Выключается настройкой METRICS_ENABLED.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            http_requests.inc(scope["method"], route_path, str(status))
+            http_request_duration.observe(
+                time.perf_counter() - started, scope["method"], route_path
+            )
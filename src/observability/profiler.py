@@ -0,0 +1,114 @@
+"""
+Выборочный профилировщик по требованию: стеки всех потоков снимаются из фонового потока с заданным интервалом.
+Результат — collapsed stacks («кадр;кадр;... число») для flamegraph.pl, speedscope и подобных.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+from collections import Counter
+from types import CodeType, FrameType
+
+from exceptions import ConflictError
+
+
+class SamplingProfiler:
+    """
+    Один профиль за раз. Стек потока event loop начинается с кадра «task:<корутина задачи>»
+    (или «no task», если loop ждёт событий), поэтому выборки группируются по задачам asyncio.
+    Поток профилировщика в выборки не попадает.
+    """
+
+    def __init__(self) -> None:
+        self._running = False
+        self._names: dict[CodeType, str] = {}
+        self._prefixes = sorted(
+            (os.path.join(os.path.abspath(p), "") for p in sys.path if p),
+            key=len,
+            reverse=True,
+        )
+
+    async def profile(self, seconds: float, interval: float) -> str:
+        """
+        Профиль потоков процесса за seconds секунд с выборкой каждые interval секунд.
+        ConflictError, если профиль уже снимается.
+        """
+        if self._running:
+            raise ConflictError("Profiler", "a profile is already running")
+        self._running = True
+        try:
+            loop = asyncio.get_running_loop()
+            stacks: Counter[str] = Counter()
+            stop = threading.Event()
+            sampler = threading.Thread(
+                target=self._sample,
+                args=(loop, threading.get_ident(), interval, stacks, stop),
+                name="sampling-profiler",
+                daemon=True,
+            )
+            sampler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                stop.set()
+                await asyncio.to_thread(sampler.join)
+            return "".join(
+                f"{stack} {count}\n" for stack, count in stacks.most_common()
+            )
+        finally:
+            self._running = False
+
+    def _sample(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        loop_thread_id: int,
+        interval: float,
+        stacks: Counter[str],
+        stop: threading.Event,
+    ) -> None:
+        own_id = threading.get_ident()
+        while not stop.wait(interval):
+            threads = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                root = [threads.get(thread_id, str(thread_id))]
+                if thread_id == loop_thread_id:
+                    task = asyncio.current_task(loop)
+                    root.append(f"task:{self._task_name(task)}" if task else "no task")
+                stacks[";".join(root + self._frames(frame))] += 1
+
+    def _frames(self, frame: FrameType | None) -> list[str]:
+        """Кадры от внешнего к текущему."""
+        names: list[str] = []
+        while frame is not None:
+            names.append(self._name(frame.f_code))
+            frame = frame.f_back
+        names.reverse()
+        return names
+
+    def _name(self, code: CodeType) -> str:
+        name = self._names.get(code)
+        if name is None:
+            filename = code.co_filename
+            for prefix in self._prefixes:
+                if filename.startswith(prefix):
+                    filename = filename[len(prefix) :]
+                    break
+            # «;» разделяет кадры в collapsed stacks.
+            name = f"{code.co_qualname} ({filename}:{code.co_firstlineno})".replace(
+                ";", ":"
+            )
+            self._names[code] = name
+        return name
+
+    @staticmethod
+    def _task_name(task: asyncio.Task[object]) -> str:
+        coro = task.get_coro()
+        return getattr(coro, "__qualname__", type(coro).__name__)
+
+
+profiler = SamplingProfiler()
@@ -0,0 +1,119 @@
+"""Счётчик SQL-запросов на HTTP-запрос: число выражений и суммарное время в БД (поиск N+1)."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, ExceptionContext
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_START_KEY = "query_stats_started"
+
+
+@dataclass
+class QueryStats:
+    """Выполнено SQL-выражений и сколько секунд они заняли (от отправки до получения результата)."""
+
+    count: int = 0
+    seconds: float = 0.0
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def count_queries() -> Generator[QueryStats]:
+    """Считает SQL-выражения, выполненные внутри блока (в этой задаче и запущенных из неё)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def listen() -> None:
+    """Подписывает счётчик на выполнение выражений всеми движками (основная БД и реплики)."""
+    for name, fn in (
+        ("before_cursor_execute", _before_execute),
+        ("after_cursor_execute", _after_execute),
+        ("handle_error", _on_error),
+    ):
+        if not event.contains(Engine, name, fn):
+            event.listen(Engine, name, fn)
+
+
+def _before_execute(conn: Any, *_args: Any) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_execute(conn: Any, *_args: Any) -> None:
+    stats = _current.get()
+    started = conn.info.get(_START_KEY)
+    if stats is None or not started:
+        return
+    stats.count += 1
+    stats.seconds += time.perf_counter() - started.pop()
+
+
+def _on_error(context: ExceptionContext) -> None:
+    # Выражение с ошибкой не доходит до after_cursor_execute — снимаем его отметку времени.
+    started = context.connection.info.get(_START_KEY) if context.connection else None
+    if started:
+        started.pop()
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI-middleware: считает SQL-выражения каждого HTTP-запроса.
+    DEBUG_DB_HEADERS — заголовки X-DB-Queries и Server-Timing (db;dur=мс) в ответе;
+    DB_QUERIES_WARN_THRESHOLD > 0 — предупреждение в лог, если запросов к БД больше порога.
+    Учитываются выражения до начала ответа: у потоковых ответов тело читается уже после заголовков.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        headers_enabled = settings.DEBUG_DB_HEADERS
+        threshold = settings.DB_QUERIES_WARN_THRESHOLD
+        if scope["type"] != "http" or not (headers_enabled or threshold > 0):
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as stats:
+
+            async def send_with_headers(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("X-DB-Queries", str(stats.count))
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"',
+                    )
+                await send(message)
+
+            await self.app(
+                scope, receive, send_with_headers if headers_enabled else send
+            )
+        if 0 < threshold < stats.count:
+            logger.warning(
+                "Too many SQL queries: %s %s - %d queries, %.1f ms",
+                scope["method"],
+                scope["path"],
+                stats.count,
+                stats.seconds * 1000,
+            )
@@ -0,0 +1,48 @@
+"""Идентификатор запроса: из заголовка X-Request-ID или новый; доступен логированию через ContextVar."""
+
+from __future__ import annotations
+
+import re
+import uuid
+from contextvars import ContextVar
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_REQUEST_ID = re.compile(r"^[0-9A-Za-z._:-]{1,128}$")
+
+_current: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+def current_request_id() -> str | None:
+    """Идентификатор текущего HTTP-запроса или None (вне запроса)."""
+    return _current.get()
+
+
+class RequestIdMiddleware:
+    """
+    ASGI-middleware: X-Request-ID клиента (если он допустимого вида) или новый UUID — в ContextVar
+    на время запроса и в заголовок ответа.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("x-request-id", "")
+        if not _REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+        # Без reset: обработчик необработанных исключений (ServerErrorMiddleware) пишет в лог уже
+        # после выхода из middleware, а каждый запрос выполняется в своей задаче со своим контекстом.
+        _current.set(request_id)
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
@@ -0,0 +1,182 @@
+"""Журнал медленных SQL-запросов: текст, параметры, длительность и (выборочно) план EXPLAIN."""
+
+from __future__ import annotations
+
+import logging
+import random
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, ExceptionContext, ExecutionContext
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_START_KEY = "slow_query_started"
+_MAX_PARAMETERS_LENGTH = 1000
+_EXPLAIN_SAVEPOINT = "slow_query_explain"
+# Признаки выражения, которое меняет данные или состояние: повторное выполнение (EXPLAIN ANALYZE) недопустимо.
+_SIDE_EFFECTS = re.compile(
+    r"\b(INSERT|UPDATE|DELETE|MERGE|INTO|FOR\s+(NO\s+KEY\s+|KEY\s+)?SHARE|nextval|setval|set_config)\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class SlowQuery:
+    """Медленное выражение: когда завершилось, сколько шло, текст, параметры (repr) и план, если снят."""
+
+    finished_at: datetime
+    duration_ms: float
+    statement: str
+    parameters: str
+    plan: str | None = None
+
+
+class SlowQueryLog:
+    """
+    Выражения дольше SLOW_QUERY_THRESHOLD_MS (0 — выключено): предупреждение в лог и последние
+    SLOW_QUERY_LOG_SIZE записей в памяти. С вероятностью SLOW_QUERY_EXPLAIN_SAMPLE_RATE для SELECT
+    снимается план тем же соединением (EXPLAIN или EXPLAIN ANALYZE — запрос выполняется ещё раз, поэтому
+    только для чтений без побочных эффектов); ответ на запрос при этом задерживается на время EXPLAIN.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._entries: deque[SlowQuery] = deque(maxlen=max_entries)
+
+    def listen(self) -> None:
+        """Подписка на выполнение выражений всеми движками (основная БД и реплики)."""
+        for name, fn in (
+            ("before_cursor_execute", self._before_execute),
+            ("after_cursor_execute", self._after_execute),
+            ("handle_error", self._on_error),
+        ):
+            if not event.contains(Engine, name, fn):
+                event.listen(Engine, name, fn)
+
+    def recent(self) -> list[SlowQuery]:
+        """Записи от новых к старым."""
+        return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _before_execute(self, conn: Connection, *_args: Any) -> None:
+        if settings.SLOW_QUERY_THRESHOLD_MS > 0:
+            conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+    def _after_execute(
+        self,
+        conn: Connection,
+        _cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        started = conn.info.get(_START_KEY)
+        if not started:
+            return
+        duration_ms = (time.perf_counter() - started.pop()) * 1000
+        threshold = settings.SLOW_QUERY_THRESHOLD_MS
+        if threshold <= 0 or duration_ms < threshold:
+            return
+        plan = None
+        if (
+            not executemany
+            and _explainable(statement, context)
+            and random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+        ):
+            plan = _explain(
+                conn,
+                statement,
+                parameters,
+                analyze=settings.SLOW_QUERY_EXPLAIN_ANALYZE and _repeatable(statement),
+            )
+        entry = SlowQuery(
+            finished_at=datetime.now(UTC),
+            duration_ms=round(duration_ms, 3),
+            statement=statement,
+            parameters=repr(parameters)[:_MAX_PARAMETERS_LENGTH],
+            plan=plan,
+        )
+        self._entries.append(entry)
+        logger.warning(
+            "Slow query (%.1f ms): %s; parameters: %s%s",
+            entry.duration_ms,
+            " ".join(statement.split()),
+            entry.parameters,
+            f"\n{plan}" if plan else "",
+        )
+
+    @staticmethod
+    def _on_error(context: ExceptionContext) -> None:
+        # Выражение с ошибкой не доходит до after_cursor_execute — снимаем его отметку времени.
+        started = (
+            context.connection.info.get(_START_KEY) if context.connection else None
+        )
+        if started:
+            started.pop()
+
+
+def _explainable(statement: str, context: ExecutionContext) -> bool:
+    """Только запросы SELECT/WITH и не серверные курсоры (соединение занято чтением)."""
+    words = statement.split(None, 1)
+    return (
+        bool(words)
+        and words[0].upper() in ("SELECT", "WITH")
+        and not context.execution_options.get("stream_results", False)
+    )
+
+
+def _repeatable(statement: str) -> bool:
+    """
+    Простой SELECT, который можно выполнить ещё раз: без WITH (в нём может быть INSERT/UPDATE/DELETE),
+    блокировок FOR UPDATE/SHARE, SELECT INTO и вызовов nextval/setval/set_config. Проверка по тексту —
+    при сомнении снимается план без ANALYZE.
+    """
+    words = statement.split(None, 1)
+    return (
+        bool(words)
+        and words[0].upper() == "SELECT"
+        and _SIDE_EFFECTS.search(statement) is None
+    )
+
+
+def _explain(
+    conn: Connection, statement: str, parameters: Any, *, analyze: bool
+) -> str | None:
+    """
+    План выражения с теми же параметрами через DBAPI-курсор (в обход событий движка); analyze — EXPLAIN ANALYZE.
+    Внутри транзакции — в точке сохранения, чтобы ошибка EXPLAIN не прервала транзакцию запроса.
+    """
+    options = "(ANALYZE, BUFFERS) " if analyze else ""
+    savepoint = conn.in_transaction()
+    cursor = conn.connection.cursor()
+    try:
+        if savepoint:
+            cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        try:
+            cursor.execute(f"EXPLAIN {options}{statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception:
+            if savepoint:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            raise
+        if savepoint:
+            cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        return plan
+    except Exception as e:
+        logger.warning("EXPLAIN of slow query failed: %s", e)
+        return None
+    finally:
+        cursor.close()
+
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_LOG_SIZE)
@@ -0,0 +1,321 @@
+"""
+Трассировка запросов: вложенные спаны router → service → repository с временем и атрибутами.
+Включается TRACING_ENABLED; записывается доля TRACING_SAMPLE_RATE запросов (или решение из входящего traceparent).
+Вне записываемой трассы обёртки методов стоят одного чтения ContextVar.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import inspect
+import logging
+import queue
+import random
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+import orjson
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+
+# W3C Trace Context: version-trace_id-parent_id-flags.
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_TRACE_ID = re.compile(r"^[0-9A-Za-z-]{1,64}$")
+_MAX_ATTRIBUTE_LENGTH = 200
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    """Участок трассы: время начала (unix), длительность, атрибуты и статус (ok или error)."""
+
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    name: str
+    start: float
+    duration_ms: float = 0.0
+    status: str = "ok"
+    attributes: dict[str, Any] = field(default_factory=dict[str, Any])
+
+
+@dataclass
+class _Trace:
+    spans: list[Span] = field(default_factory=list[Span])
+
+
+class SpanExporter(Protocol):
+    def export(self, spans: list[Span]) -> None:
+        """Спаны завершённой трассы (корневой — последним)."""
+
+    def close(self) -> None:
+        """Выгрузить накопленное и освободить ресурсы; вызывается при смене экспортёра."""
+
+
+class MemoryExporter:
+    """Последние max_spans спанов в памяти — для тестов и отладки."""
+
+    def __init__(self, max_spans: int) -> None:
+        self._spans: deque[Span] = deque(maxlen=max_spans)
+
+    def export(self, spans: list[Span]) -> None:
+        self._spans.extend(spans)
+
+    def spans(self, trace_id: str | None = None) -> list[Span]:
+        """Сохранённые спаны (только трассы trace_id, если задан)."""
+        return [s for s in self._spans if trace_id is None or s.trace_id == trace_id]
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+    def close(self) -> None:
+        pass
+
+
+class FileExporter:
+    """
+    Дописывает спаны в файл JSON Lines (строка на спан). Запись и сериализация — в фоновом потоке,
+    как у QueueListener в loger_init: export только кладёт трассу в очередь и не блокирует event loop.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._queue: queue.Queue[list[Span] | None] = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._write, name="trace-exporter", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def export(self, spans: list[Span]) -> None:
+        self._queue.put(spans)
+
+    def close(self) -> None:
+        """Дописывает очередь и останавливает поток; повторный вызов ничего не делает."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _write(self) -> None:
+        stopped = False
+        while not stopped:
+            batch = [self._queue.get()]
+            # Всё, что накопилось за время записи, дописывается одним открытием файла.
+            while batch[-1] is not None and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            stopped = batch[-1] is None
+            lines = b"".join(
+                orjson.dumps(s) + b"\n" for spans in batch if spans for s in spans
+            )
+            if not lines:
+                continue
+            try:
+                with self.path.open("ab") as f:
+                    f.write(lines)
+            except OSError:
+                logger.exception("Failed to write traces to %s", self.path)
+
+
+class Tracer:
+    """Выбор трасс для записи и их выгрузка; без экспортёра трассировка выключена."""
+
+    def __init__(self) -> None:
+        self.exporter: SpanExporter | None = None
+
+    def configure(self, exporter: SpanExporter | None) -> None:
+        """Задаёт экспортёр (None выключает трассировку); прежний закрывается."""
+        previous, self.exporter = self.exporter, exporter
+        if previous is not None and previous is not exporter:
+            previous.close()
+
+    @contextmanager
+    def start_trace(self, name: str, headers: Headers) -> Generator[Span | None]:
+        """
+        Корневой спан запроса. trace_id и решение о записи — из traceparent (флаг sampled),
+        иначе trace_id из X-Trace-Id или новый, запись с вероятностью TRACING_SAMPLE_RATE.
+        None — запрос не записывается. Трасса уходит экспортёру, заданному на её начало.
+        """
+        exporter = self.exporter
+        if exporter is None:
+            yield None
+            return
+        trace_id, parent_id, sampled = _incoming_context(headers)
+        if not sampled:
+            yield None
+            return
+        root = Span(trace_id, _new_id(16), parent_id, name, time.time())
+        trace = _Trace()
+        token = _current.set((root, trace))
+        try:
+            with _timing(root):
+                yield root
+        finally:
+            _current.reset(token)
+            trace.spans.append(root)
+            exporter.export(trace.spans)
+
+
+tracer = Tracer()
+
+_current: ContextVar[tuple[Span, _Trace] | None] = ContextVar(
+    "trace_span", default=None
+)
+
+
+def _new_id(hex_digits: int) -> str:
+    return f"{random.getrandbits(hex_digits * 4):0{hex_digits}x}"
+
+
+def _incoming_context(headers: Headers) -> tuple[str, str | None, bool]:
+    match = _TRACEPARENT.match(headers.get("traceparent", ""))
+    if match:
+        trace_id, parent_id, flags = match.groups()
+        return trace_id, parent_id, bool(int(flags, 16) & 1)
+    trace_id = headers.get("x-trace-id", "")
+    if not _TRACE_ID.match(trace_id):
+        trace_id = _new_id(32)
+    return trace_id, None, random.random() < settings.TRACING_SAMPLE_RATE
+
+
+@contextmanager
+def _timing(current: Span) -> Generator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        current.status = "error"
+        current.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        current.duration_ms = (time.perf_counter() - started) * 1000
+
+
+def current_span() -> Span | None:
+    """Текущий спан записываемой трассы или None."""
+    context = _current.get()
+    return None if context is None else context[0]
+
+
+@contextmanager
+def span(name: str, /, **attributes: Any) -> Generator[Span | None]:
+    """Дочерний спан текущего; вне записываемой трассы ничего не делает (None)."""
+    context = _current.get()
+    if context is None:
+        yield None
+        return
+    parent, trace = context
+    child = Span(
+        parent.trace_id,
+        _new_id(16),
+        parent.span_id,
+        name,
+        time.time(),
+        attributes=attributes,
+    )
+    token = _current.set((child, trace))
+    try:
+        with _timing(child):
+            yield child
+    finally:
+        _current.reset(token)
+        trace.spans.append(child)
+
+
+def _attribute(value: Any) -> Any:
+    if isinstance(value, str):
+        return value[:_MAX_ATTRIBUTE_LENGTH]
+    if value is None or isinstance(value, int | float | bool):
+        return value
+    return None
+
+
+def _arguments(
+    signature: inspect.Signature, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> dict[str, Any]:
+    """Скалярные аргументы вызова как есть, у списков и множеств — длина (name.len)."""
+    attributes: dict[str, Any] = {}
+    bound = signature.bind_partial(*args, **kwargs)
+    for name, value in list(bound.arguments.items())[1:]:  # без self
+        if isinstance(value, list | tuple | set | frozenset):
+            attributes[f"{name}.len"] = len(value)
+        elif (scalar := _attribute(value)) is not None:
+            attributes[name] = scalar
+    return attributes
+
+
+def traced[**P, T](
+    method: Callable[P, Awaitable[T]],
+) -> Callable[P, Awaitable[T]]:
+    """Декоратор асинхронного метода: спан «Класс.метод» с аргументами как атрибутами."""
+    signature = inspect.signature(method)
+    method_name = method.__name__
+
+    @functools.wraps(method)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        if _current.get() is None:
+            return await method(*args, **kwargs)
+        name = f"{type(args[0]).__name__}.{method_name}"
+        with span(name, **_arguments(signature, args, kwargs)):
+            return await method(*args, **kwargs)
+
+    wrapper.__traced__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def trace_methods[C: type](cls: C) -> C:
+    """Декоратор класса: traced для всех его асинхронных методов (кроме async-генераторов и dunder)."""
+    for name, value in list(vars(cls).items()):
+        if (
+            not name.startswith("__")
+            and inspect.iscoroutinefunction(value)
+            and not getattr(value, "__traced__", False)
+        ):
+            setattr(cls, name, traced(value))
+    return cls
+
+
+class TracingMiddleware:
+    """
+    ASGI-middleware: корневой спан «METHOD шаблон маршрута» на HTTP-запрос (до отправки всего тела)
+    с атрибутами http.method, http.target и http.status_code; у записываемых запросов — заголовок X-Trace-Id.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or tracer.exporter is None:
+            await self.app(scope, receive, send)
+            return
+
+        with tracer.start_trace(scope["method"], Headers(scope=scope)) as root:
+            if root is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_with_trace_id(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    root.attributes["http.status_code"] = message["status"]
+                    MutableHeaders(scope=message).append("X-Trace-Id", root.trace_id)
+                await send(message)
+
+            root.attributes["http.method"] = scope["method"]
+            root.attributes["http.target"] = scope["path"]
+            try:
+                await self.app(scope, receive, send_with_trace_id)
+            finally:
+                route = scope.get("route")
+                root.name = f"{scope['method']} {getattr(route, 'path', scope['path'])}"
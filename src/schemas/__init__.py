@@ -4,16 +4,24 @@ from .base import BaseSchema
 from .organization import (
     ActivityNode,
     BuildingDetail,
+    BuildingWithDistanceResponse,
     BuildingWithOrganizationsResponse,
+    OrganizationBatchItem,
     OrganizationDetailResponse,
     OrganizationResponse,
+    OrganizationSearchResult,
+    Suggestion,
 )
 
 __all__ = [
     "ActivityNode",
     "BaseSchema",
     "BuildingDetail",
+    "BuildingWithDistanceResponse",
     "BuildingWithOrganizationsResponse",
+    "OrganizationBatchItem",
     "OrganizationDetailResponse",
     "OrganizationResponse",
+    "OrganizationSearchResult",
+    "Suggestion",
 ]
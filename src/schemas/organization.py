@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Literal
+
 from .base import BaseSchema
 
 
@@ -41,6 +43,12 @@ class BuildingWithOrganizationsResponse(BaseSchema):
     organizations: list[OrganizationResponse]
 
 
+class BuildingWithDistanceResponse(BuildingWithOrganizationsResponse):
+    """Здание с организациями и расстояние от точки поиска в км (поиск по радиусу и ближайших)."""
+
+    distance_km: float
+
+
 class OrganizationDetailResponse(BaseSchema):
     """Полная организация: id, название, телефон, адреса (здания), активности деревом (id, name, children)."""
 
@@ -49,3 +57,25 @@ class OrganizationDetailResponse(BaseSchema):
     phone: str
     buildings: list[BuildingDetail]
     activities: list[ActivityNode]
+
+
+class OrganizationBatchItem(BaseSchema):
+    """Элемент пакетной выдачи: запрошенный id, найдена ли организация и она сама (None, если не найдена)."""
+
+    id: int
+    found: bool
+    organization: OrganizationDetailResponse | None = None
+
+
+class OrganizationSearchResult(OrganizationDetailResponse):
+    """Результат поиска по названию: полная организация и релевантность score (0..1, больше — ближе)."""
+
+    score: float
+
+
+class Suggestion(BaseSchema):
+    """Подсказка автодополнения: организация или вид деятельности, чьё название начинается с запроса."""
+
+    kind: Literal["organization", "activity"]
+    id: int
+    name: str
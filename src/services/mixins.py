@@ -2,26 +2,63 @@
 
 from __future__ import annotations
 
+from typing import Any
+
+from cache import activity_tree_cache
 from db.repo.activity import ActivityRepo
+from observability import trace_methods
 
 
+@trace_methods
 class ActivityTreeMixin:
     """Миксин для построения дерева активностей (id, name, children) из путей репозитория."""
 
     async def get_activity_paths_with_ids(
         self, leaf_ids: list[int], activity_repo: ActivityRepo
     ) -> list[list[tuple[int, str]]]:
-        """Загружает пути от корня к листу из activity_ownership в виде списка (id, name) на путь."""
-        return await activity_repo.get_paths_from_ownership(leaf_ids)
+        """
+        Пути от корня к листу в виде списка (id, name) на путь: из кеша дерева, если он готов, иначе из activity_ownership.
+        Листья, которых нет в кеше (добавлены другим воркером или в обход ORM), читаются из activity_ownership,
+        а снимок помечается устаревшим.
+        """
+        if not activity_tree_cache.ready:
+            return await activity_repo.get_paths_from_ownership(leaf_ids)
+        paths = activity_tree_cache.paths(leaf_ids)
+        missing = [
+            leaf_id for leaf_id, path in zip(leaf_ids, paths, strict=True) if not path
+        ]
+        if not missing:
+            return paths
+        found = dict(
+            zip(
+                missing,
+                await activity_repo.get_paths_from_ownership(missing),
+                strict=True,
+            )
+        )
+        if any(found.values()):
+            activity_tree_cache.invalidate()
+        return [
+            path or found[leaf_id]
+            for leaf_id, path in zip(leaf_ids, paths, strict=True)
+        ]
+
+    async def get_activity_paths_by_leaf(
+        self, leaf_ids: list[int], activity_repo: ActivityRepo
+    ) -> dict[int, list[tuple[int, str]]]:
+        """Пути для набора активностей одним вызовом (без дублей): leaf_id → путь (id, name) от корня."""
+        unique_ids = list(dict.fromkeys(leaf_ids))
+        paths = await self.get_activity_paths_with_ids(unique_ids, activity_repo)
+        return dict(zip(unique_ids, paths, strict=True))
 
     @classmethod
     def build_activities_tree_with_ids(
         cls, paths: list[list[tuple[int, str]]]
-    ) -> list[dict]:
-        """Строит список корневых узлов из путей (корень → лист как (id, name)). Объединяет общих предков по id."""
+    ) -> list[dict[str, Any]]:
+        """Строит список корневых узлов из путей (корень → лист как (id, name)). Объединяет общих предков по id; пустые пути пропускает."""
         if not paths:
             return []
-        nodes: dict[int, dict] = {}
+        nodes: dict[int, dict[str, Any]] = {}
         for path in paths:
             for i in range(len(path)):
                 id_, name = path[i]
@@ -38,8 +75,10 @@ class ActivityTreeMixin:
                     if not any(c["id"] == child_id for c in nodes[id_]["children"]):
                         nodes[id_]["children"].append(nodes[child_id])
         seen_roots: set[int] = set()
-        result: list[dict] = []
+        result: list[dict[str, Any]] = []
         for path in paths:
+            if not path:
+                continue
             root_id = path[0][0]
             if root_id not in seen_roots:
                 seen_roots.add(root_id)
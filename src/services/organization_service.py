@@ -2,24 +2,60 @@
 
 from __future__ import annotations
 
+import bisect
 import logging
+from collections.abc import AsyncIterator, Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.repo import ActivityRepo, BuildingRepo, OrganizationRepo
+from cache import (
+    CachedResponse,
+    activity_tree_cache,
+    match_key,
+    normalize,
+    response_cache,
+    SuggestionKind,
+    spatial_index,
+    suggest_index,
+)
+from config import settings
+from db.models import Organization
+from db.repo import (
+    ActivityRepo,
+    BuildingRepo,
+    BuildingRow,
+    OrganizationRepo,
+    OrganizationRow,
+)
 from exceptions import APIException, InternalError, NotFoundError
+from observability import span, timed, trace_methods
 from schemas import (
     ActivityNode,
     BuildingDetail,
+    BuildingWithDistanceResponse,
     BuildingWithOrganizationsResponse,
+    OrganizationBatchItem,
     OrganizationDetailResponse,
     OrganizationResponse,
+    OrganizationSearchResult,
+    Suggestion,
 )
 from services.mixins import ActivityTreeMixin
+from services.pagination import decode_cursor, fetch_size, split_page
+from services.serialization import (
+    building_with_organizations_dict,
+    dump_buildings_with_organizations,
+    dump_organizations,
+    dumps,
+    fast_serialization,
+    organization_dict,
+)
+from services.single_flight import coalesce
 
 logger = logging.getLogger(__name__)
 
 
+@trace_methods
 class OrganizationService(ActivityTreeMixin):
     """Сервис организаций: список по активности, детали, поиск, геопоиск."""
 
@@ -28,47 +64,174 @@ class OrganizationService(ActivityTreeMixin):
         self._building_repo = BuildingRepo(session)
         self._org_repo = OrganizationRepo(session)
 
-    async def list_organizations_by_activity(
+    @timed
+    @coalesce
+    async def list_organizations_by_activity_json(
         self,
         activity_id: int | None = None,
         activity_name: str | None = None,
-    ) -> list[OrganizationResponse]:
-        """Организации с данной активностью или потомками. Передать ровно один: activity_id или activity_name."""
+        *,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> CachedResponse:
+        """
+        Организации с данной активностью или потомками, по возрастанию id, как готовый JSON-массив (способ сборки — SERIALIZATION_MODE).
+        Передать ровно один: activity_id или activity_name. Размер страницы не больше MAX_PAGE_SIZE (он же по умолчанию).
+        """
         try:
-            if activity_id is not None:
-                if not await self._activity_repo.exists_by_id(activity_id):
-                    raise NotFoundError("Activity", activity_id)
-                resolved_id = activity_id
+            page, next_cursor = await self._organizations_page_by_activity(
+                activity_id, activity_name, limit=limit, cursor=cursor
+            )
+            if fast_serialization():
+                body = dumps([organization_dict(o) for o in page])
             else:
-                activity = await self._activity_repo.get_by_name(activity_name)
-                if activity is None:
-                    raise NotFoundError("Activity", activity_name)
-                resolved_id = activity.id
-            owned_ids = await self._activity_repo.get_owned_ids(resolved_id)
-            orgs = await self._org_repo.get_by_activity_ids(owned_ids)
-            return [OrganizationResponse.model_validate(o) for o in orgs]
+                body = dump_organizations(
+                    [OrganizationResponse.model_validate(o) for o in page]
+                )
+            return CachedResponse(body, next_cursor)
+        except APIException:
+            raise
+        except Exception as e:
+            logger.exception("list_organizations_by_activity_json failed: %s", e)
+            raise InternalError(
+                "list_organizations_by_activity_json failed",
+                details={"error": str(e)},
+            ) from e
+
+    async def _organizations_page_by_activity(
+        self,
+        activity_id: int | None,
+        activity_name: str | None,
+        *,
+        limit: int | None,
+        cursor: str | None,
+    ) -> tuple[list[OrganizationRow], str | None]:
+        """
+        Страница организаций по активности (не больше MAX_PAGE_SIZE) и курсор следующей.
+        По id — один запрос: существование активности и потомки проверяются в нём же (без списка id потомков).
+        """
+        after = decode_cursor(cursor, int)
+        limit = (
+            settings.MAX_PAGE_SIZE
+            if limit is None
+            else min(limit, settings.MAX_PAGE_SIZE)
+        )
+        resolved_id = (
+            activity_id
+            if activity_id is not None
+            else await self._resolve_activity_id(None, activity_name)
+        )
+        orgs = await self._org_repo.get_by_owner_activity(
+            resolved_id,
+            limit=fetch_size(limit),
+            after_id=after[0] if after else None,
+        )
+        if orgs is None:
+            raise NotFoundError("Activity", resolved_id)
+        return split_page(orgs, limit, key=lambda o: (o.id,))
+
+    @timed
+    async def stream_organizations_by_activity(
+        self,
+        activity_id: int | None = None,
+        activity_name: str | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Все организации с данной активностью или потомками как NDJSON (строка на организацию, по id).
+        Активность проверяется сразу (NotFoundError до начала ответа), строки читаются серверным курсором.
+        """
+        try:
+            resolved_id = await self._resolve_activity_id(activity_id, activity_name)
+            owned_ids = await self._owned_activity_ids(resolved_id)
         except APIException:
             raise
         except Exception as e:
-            logger.exception("list_organizations_by_activity failed: %s", e)
+            logger.exception("stream_organizations_by_activity failed: %s", e)
             raise InternalError(
-                "list_organizations_by_activity failed", details={"error": str(e)}
+                "stream_organizations_by_activity failed", details={"error": str(e)}
             ) from e
+        return self._organizations_ndjson(owned_ids)
+
+    async def _organizations_ndjson(self, owned_ids: list[int]) -> AsyncIterator[bytes]:
+        """Пачки NDJSON-строк OrganizationResponse; ошибка посреди потока логируется и обрывает ответ."""
+        try:
+            fast = fast_serialization()
+            async for batch in self._org_repo.stream_by_activity_ids(
+                owned_ids, batch_size=settings.STREAM_BATCH_SIZE
+            ):
+                if fast:
+                    yield b"".join(dumps(organization_dict(o)) + b"\n" for o in batch)
+                    continue
+                yield b"".join(
+                    OrganizationResponse.model_validate(o).model_dump_json().encode()
+                    + b"\n"
+                    for o in batch
+                )
+        except Exception as e:
+            logger.exception("stream_organizations_by_activity failed: %s", e)
+            raise
+
+    async def _resolve_activity_id(
+        self, activity_id: int | None, activity_name: str | None
+    ) -> int:
+        """
+        Id активности по id или имени; NotFoundError, если такой нет.
+        Готовый кеш дерева отвечает без запросов; промах проверяется в БД (активность могли добавить
+        в другом воркере), и если она там есть, снимок помечается устаревшим.
+        """
+        cached = activity_tree_cache.ready
+        if activity_id is not None:
+            if cached and activity_tree_cache.exists(activity_id):
+                return activity_id
+            if not await self._activity_repo.exists_by_id(activity_id):
+                raise NotFoundError("Activity", activity_id)
+            if cached:
+                activity_tree_cache.invalidate()
+            return activity_id
+        if cached:
+            resolved_id = activity_tree_cache.find_id_by_name(activity_name or "")
+            if resolved_id is not None:
+                return resolved_id
+        activity = await self._activity_repo.get_by_name(activity_name or "")
+        if activity is None:
+            raise NotFoundError("Activity", activity_name)
+        if cached:
+            activity_tree_cache.invalidate()
+        return activity.id
+
+    async def _owned_activity_ids(self, activity_id: int) -> list[int]:
+        """Активность и все её потомки: из кеша дерева, если он готов и знает активность, иначе из БД (промах кеша помечает снимок устаревшим)."""
+        cached = activity_tree_cache.ready
+        if cached:
+            owned_ids = activity_tree_cache.owned_ids(activity_id)
+            if owned_ids:
+                return owned_ids
+        owned_ids = await self._activity_repo.get_owned_ids(activity_id)
+        if cached and owned_ids:
+            activity_tree_cache.invalidate()
+        return owned_ids
 
+    @timed
     async def get_building_with_organizations(
-        self, building_id: int, *, limit: int | None = None, offset: int = 0
-    ) -> BuildingWithOrganizationsResponse:
-        """Полная информация по зданию и организации в нём. NotFoundError, если здание не найдено."""
+        self,
+        building_id: int,
+        *,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> tuple[BuildingWithOrganizationsResponse, str | None]:
+        """Здание и страница организаций в нём (по id) + курсор следующей страницы. NotFoundError, если здание не найдено."""
         try:
-            building = await self._building_repo.get_by_id(building_id)
-            if building is None:
-                raise NotFoundError("Building", building_id)
-            orgs = await self._org_repo.get_by_building_id(
-                building_id, limit=limit, offset=offset
+            building, page, next_cursor = await self._building_page(
+                building_id, limit=limit, cursor=cursor
             )
-            return BuildingWithOrganizationsResponse(
-                building=BuildingDetail.model_validate(building),
-                organizations=[OrganizationResponse.model_validate(o) for o in orgs],
+            return (
+                BuildingWithOrganizationsResponse(
+                    building=BuildingDetail.model_validate(building),
+                    organizations=[
+                        OrganizationResponse.model_validate(o) for o in page
+                    ],
+                ),
+                next_cursor,
             )
         except APIException:
             raise
@@ -78,6 +241,68 @@ class OrganizationService(ActivityTreeMixin):
                 "get_building_with_organizations failed", details={"error": str(e)}
             ) from e
 
+    @timed
+    @coalesce
+    async def get_building_with_organizations_json(
+        self,
+        building_id: int,
+        *,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> CachedResponse:
+        """
+        get_building_with_organizations как готовый JSON через кеш ответов (теги: здание и его организации на странице).
+        Способ сборки тела — SERIALIZATION_MODE.
+        """
+
+        async def build() -> tuple[CachedResponse, set[str]]:
+            if fast_serialization():
+                building, page, next_cursor = await self._building_page(
+                    building_id, limit=limit, cursor=cursor
+                )
+                body = dumps(building_with_organizations_dict(building, page))
+                org_ids = [o.id for o in page]
+            else:
+                result, next_cursor = await self.get_building_with_organizations(
+                    building_id, limit=limit, cursor=cursor
+                )
+                body = result.model_dump_json().encode()
+                org_ids = [o.id for o in result.organizations]
+            tags = {f"building:{building_id}"}
+            tags.update(f"organization:{oid}" for oid in org_ids)
+            return CachedResponse(body, next_cursor), tags
+
+        try:
+            return await response_cache.get_or_set(
+                f"building_organizations:{building_id}:{limit}:{cursor}", build
+            )
+        except APIException:
+            raise
+        except Exception as e:
+            logger.exception("get_building_with_organizations_json failed: %s", e)
+            raise InternalError(
+                "get_building_with_organizations_json failed",
+                details={"error": str(e)},
+            ) from e
+
+    async def _building_page(
+        self, building_id: int, *, limit: int | None, cursor: str | None
+    ) -> tuple[BuildingRow, list[OrganizationRow], str | None]:
+        """Здание, страница его организаций и курсор следующей. NotFoundError, если здание не найдено."""
+        after = decode_cursor(cursor, int)
+        found = await self._building_repo.get_by_ids([building_id])
+        if not found:
+            raise NotFoundError("Building", building_id)
+        (building,) = found
+        orgs = await self._org_repo.get_by_building_id(
+            building_id,
+            limit=fetch_size(limit),
+            after_id=after[0] if after else None,
+        )
+        page, next_cursor = split_page(orgs, limit, key=lambda o: (o.id,))
+        return building, page, next_cursor
+
+    @timed
     async def get_organization_detail(
         self, organization_id: int
     ) -> OrganizationDetailResponse:
@@ -86,18 +311,8 @@ class OrganizationService(ActivityTreeMixin):
             org = await self._org_repo.get_by_id_with_relations(organization_id)
             if org is None:
                 raise NotFoundError("Organization", organization_id)
-            activity_paths = await self.get_activity_paths_with_ids(
-                [a.id for a in org.activities], self._activity_repo
-            )
-            activity_trees = self.build_activities_tree_with_ids(activity_paths)
-            activities = [ActivityNode.model_validate(n) for n in activity_trees]
-            return OrganizationDetailResponse(
-                id=org.id,
-                name=org.name,
-                phone=org.phone,
-                buildings=[BuildingDetail.model_validate(b) for b in org.buildings],
-                activities=activities,
-            )
+            (detail,) = await self._organization_details([org])
+            return detail
         except APIException:
             raise
         except Exception as e:
@@ -106,31 +321,105 @@ class OrganizationService(ActivityTreeMixin):
                 "get_organization_detail failed", details={"error": str(e)}
             ) from e
 
-    async def search_organizations_by_name(
-        self, name: str, *, limit: int | None = None
-    ) -> list[OrganizationDetailResponse]:
-        """Поиск организаций по названию (подстрока, без учёта регистра). Возвращает полный объект как get_organization."""
+    @timed
+    @coalesce
+    async def get_organization_detail_json(
+        self, organization_id: int
+    ) -> CachedResponse:
+        """
+        get_organization_detail как готовый JSON через кеш ответов (теги: организация, её здания и все узлы дерева активностей).
+        С ORGANIZATION_DETAIL_SQL_JSON организацию и здания собирает в JSON PostgreSQL одним запросом, без ORM и Pydantic;
+        дерево активностей строится из путей того же запроса.
+        """
+
+        async def build() -> tuple[CachedResponse, set[str]]:
+            if settings.ORGANIZATION_DETAIL_SQL_JSON:
+                found = await self._org_repo.get_detail_document(organization_id)
+                if found is None:
+                    raise NotFoundError("Organization", organization_id)
+                document, paths = found
+                document["activities"] = self.build_activities_tree_with_ids(paths)
+                body = dumps(document)
+                building_ids = [b["id"] for b in document["buildings"]]
+                activity_ids = list({aid for path in paths for aid, _name in path})
+            else:
+                detail = await self.get_organization_detail(organization_id)
+                body = detail.model_dump_json().encode()
+                building_ids = [b.id for b in detail.buildings]
+                activity_ids: list[int] = []
+                nodes = list(detail.activities)
+                while nodes:
+                    node = nodes.pop()
+                    activity_ids.append(node.id)
+                    nodes.extend(node.children)
+            tags = {f"organization:{organization_id}"}
+            tags.update(f"building:{bid}" for bid in building_ids)
+            tags.update(f"activity:{aid}" for aid in activity_ids)
+            return CachedResponse(body), tags
+
         try:
-            orgs = await self._org_repo.get_by_name_with_relations(name, limit=limit)
-            result: list[OrganizationDetailResponse] = []
-            for org in orgs:
-                activity_paths = await self.get_activity_paths_with_ids(
-                    [a.id for a in org.activities], self._activity_repo
-                )
-                activity_trees = self.build_activities_tree_with_ids(activity_paths)
-                activities = [ActivityNode.model_validate(n) for n in activity_trees]
-                result.append(
-                    OrganizationDetailResponse(
-                        id=org.id,
-                        name=org.name,
-                        phone=org.phone,
-                        buildings=[
-                            BuildingDetail.model_validate(b) for b in org.buildings
-                        ],
-                        activities=activities,
-                    )
+            return await response_cache.get_or_set(
+                f"organization_detail:{organization_id}", build
+            )
+        except APIException:
+            raise
+        except Exception as e:
+            logger.exception("get_organization_detail_json failed: %s", e)
+            raise InternalError(
+                "get_organization_detail_json failed", details={"error": str(e)}
+            ) from e
+
+    @timed
+    async def get_organizations_batch(
+        self, organization_ids: list[int]
+    ) -> list[OrganizationBatchItem]:
+        """
+        Детали нескольких организаций за фиксированное число запросов (организации, здания, активности, пути).
+        Порядок и повторы — как в organization_ids; для отсутствующих id found=False и organization=None.
+        """
+        try:
+            orgs = await self._org_repo.get_by_ids_with_relations(
+                list(dict.fromkeys(organization_ids))
+            )
+            details = {d.id: d for d in await self._organization_details(orgs)}
+            return [
+                OrganizationBatchItem(
+                    id=org_id,
+                    found=org_id in details,
+                    organization=details.get(org_id),
                 )
-            return result
+                for org_id in organization_ids
+            ]
+        except APIException:
+            raise
+        except Exception as e:
+            logger.exception("get_organizations_batch failed: %s", e)
+            raise InternalError(
+                "get_organizations_batch failed", details={"error": str(e)}
+            ) from e
+
+    @timed
+    @coalesce
+    async def search_organizations_by_name(
+        self,
+        name: str,
+        *,
+        limit: int | None = None,
+        min_similarity: float | None = None,
+    ) -> list[OrganizationSearchResult]:
+        """
+        Поиск организаций по названию: подстрока без учёта регистра или похожее слово (опечатки).
+        По убыванию score; min_similarity по умолчанию из SEARCH_MIN_SIMILARITY. Полный объект как get_organization.
+        """
+        try:
+            found = await self._org_repo.get_by_name_with_relations(
+                name, min_similarity=min_similarity, limit=limit
+            )
+            details = await self._organization_details([org for org, _score in found])
+            return [
+                OrganizationSearchResult(**dict(detail), score=score)
+                for detail, (_org, score) in zip(details, found, strict=True)
+            ]
         except APIException:
             raise
         except Exception as e:
@@ -139,46 +428,143 @@ class OrganizationService(ActivityTreeMixin):
                 "search_organizations_by_name failed", details={"error": str(e)}
             ) from e
 
-    async def list_buildings_and_organizations_in_radius(
+    @timed
+    async def suggest_names(self, query: str, limit: int) -> list[Suggestion]:
+        """
+        Автодополнение: организации и виды деятельности, у которых слово названия начинается с query.
+        Из префиксного индекса в памяти, если он готов; иначе — два запроса к БД с тем же совпадением и порядком.
+        """
+        found: list[tuple[SuggestionKind, int, str]]
+        try:
+            if suggest_index.ready:
+                found = suggest_index.suggest(query, limit)
+            else:
+                prefix = normalize(query)
+                if not prefix:
+                    return []
+                found = [
+                    ("organization", obj_id, name)
+                    for obj_id, name in await self._org_repo.get_names_by_word_prefix(
+                        prefix, limit
+                    )
+                ]
+                found.extend(
+                    ("activity", obj_id, name)
+                    for obj_id, name in await self._activity_repo.get_names_by_word_prefix(
+                        prefix, limit
+                    )
+                )
+                found.sort(key=lambda s: (match_key(s[2], prefix) or "", s[0], s[1]))
+            return [
+                Suggestion(kind=kind, id=obj_id, name=name)
+                for kind, obj_id, name in found[:limit]
+            ]
+        except APIException:
+            raise
+        except Exception as e:
+            logger.exception("suggest_names failed: %s", e)
+            raise InternalError(
+                "suggest_names failed", details={"error": str(e)}
+            ) from e
+
+    @timed
+    @coalesce
+    async def list_buildings_and_organizations_in_radius_json(
         self,
         lat: float,
         lon: float,
         radius_km: float,
         *,
         limit: int | None = None,
-        offset: int = 0,
-    ) -> list[BuildingWithOrganizationsResponse]:
-        """По каждому зданию в радиусе от точки — данные здания и список организаций в нём."""
+        cursor: str | None = None,
+    ) -> CachedResponse:
+        """
+        По каждому зданию в радиусе от точки — данные здания, организации и расстояние; по (расстояние, id).
+        Готовый JSON-массив (способ сборки — SERIALIZATION_MODE).
+        """
         try:
-            buildings = await self._building_repo.get_in_radius(
-                lat, lon, radius_km, limit=limit, offset=offset
+            rows, next_cursor = await self._rows_in_radius(
+                lat, lon, radius_km, limit=limit, cursor=cursor
             )
-            if not buildings:
-                return []
-            building_ids = [b.id for b in buildings]
-            orgs_by_building = (
-                await self._org_repo.get_organizations_grouped_by_building(building_ids)
+            return await self._with_organizations_json(rows, next_cursor)
+        except APIException:
+            raise
+        except Exception as e:
+            logger.exception(
+                "list_buildings_and_organizations_in_radius_json failed: %s", e
+            )
+            raise InternalError(
+                "list_buildings_and_organizations_in_radius_json failed",
+                details={"error": str(e)},
+            ) from e
+
+    async def _rows_in_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        *,
+        limit: int | None,
+        cursor: str | None,
+    ) -> tuple[list[tuple[BuildingRow, float]], str | None]:
+        """Страница (здание, расстояние) в радиусе — из пространственного индекса, если он готов, иначе из БД."""
+        after = decode_cursor(cursor, float, int)
+        if not spatial_index.ready:
+            found_rows = await self._building_repo.get_in_radius(
+                lat,
+                lon,
+                radius_km,
+                limit=fetch_size(limit),
+                after=after,
+            )
+            return split_page(found_rows, limit, key=lambda r: (r[1], r[0].id))
+        found = spatial_index.in_radius(lat, lon, radius_km)
+        if after is not None:
+            found = found[bisect.bisect_right(found, after) :]
+        found, next_cursor = split_page(
+            found[: fetch_size(limit)], limit, key=lambda r: r
+        )
+        buildings = await self._building_repo.get_by_ids([bid for _dist, bid in found])
+        distances = {bid: dist for dist, bid in found}
+        return [(b, distances[b.id]) for b in buildings], next_cursor
+
+    @timed
+    @coalesce
+    async def list_nearest_buildings_with_organizations_json(
+        self, lat: float, lon: float, k: int
+    ) -> CachedResponse:
+        """k ближайших к точке зданий с организациями, по возрастанию расстояния (distance_km), как готовый JSON-массив."""
+        try:
+            return await self._with_organizations_json(
+                await self._nearest_rows(lat, lon, k), None
             )
-            return [
-                BuildingWithOrganizationsResponse(
-                    building=BuildingDetail.model_validate(b),
-                    organizations=[
-                        OrganizationResponse.model_validate(o)
-                        for o in orgs_by_building.get(b.id, [])
-                    ],
-                )
-                for b in buildings
-            ]
         except APIException:
             raise
         except Exception as e:
-            logger.exception("list_buildings_and_organizations_in_radius failed: %s", e)
+            logger.exception(
+                "list_nearest_buildings_with_organizations_json failed: %s", e
+            )
             raise InternalError(
-                "list_buildings_and_organizations_in_radius failed",
+                "list_nearest_buildings_with_organizations_json failed",
                 details={"error": str(e)},
             ) from e
 
-    async def list_buildings_and_organizations_in_bbox(
+    async def _nearest_rows(
+        self, lat: float, lon: float, k: int
+    ) -> list[tuple[BuildingRow, float]]:
+        """k ближайших (здание, расстояние) — из пространственного индекса, если он готов, иначе из БД."""
+        if not spatial_index.ready:
+            return await self._building_repo.get_nearest(lat, lon, k)
+        nearest = spatial_index.nearest(lat, lon, k)
+        buildings = await self._building_repo.get_by_ids(
+            [bid for _dist, bid in nearest]
+        )
+        distances = {bid: dist for dist, bid in nearest}
+        return [(b, distances[b.id]) for b in buildings]
+
+    @timed
+    @coalesce
+    async def list_buildings_and_organizations_in_bbox_json(
         self,
         min_lat: float,
         max_lat: float,
@@ -186,34 +572,142 @@ class OrganizationService(ActivityTreeMixin):
         max_lon: float,
         *,
         limit: int | None = None,
-        offset: int = 0,
-    ) -> list[BuildingWithOrganizationsResponse]:
-        """По каждому зданию в прямоугольнике — данные здания и список организаций в нём."""
+        cursor: str | None = None,
+    ) -> CachedResponse:
+        """
+        По каждому зданию в прямоугольнике — данные здания и список организаций в нём; по возрастанию id.
+        Готовый JSON-массив (способ сборки — SERIALIZATION_MODE).
+        """
         try:
-            buildings = await self._building_repo.get_in_bbox(
-                min_lat, max_lat, min_lon, max_lon, limit=limit, offset=offset
+            buildings, next_cursor = await self._buildings_in_bbox(
+                min_lat, max_lat, min_lon, max_lon, limit=limit, cursor=cursor
             )
-            if not buildings:
-                return []
-            building_ids = [b.id for b in buildings]
-            orgs_by_building = (
-                await self._org_repo.get_organizations_grouped_by_building(building_ids)
+            return await self._with_organizations_json(
+                [(b, None) for b in buildings], next_cursor
             )
-            return [
-                BuildingWithOrganizationsResponse(
-                    building=BuildingDetail.model_validate(b),
-                    organizations=[
-                        OrganizationResponse.model_validate(o)
-                        for o in orgs_by_building.get(b.id, [])
-                    ],
-                )
-                for b in buildings
-            ]
         except APIException:
             raise
         except Exception as e:
-            logger.exception("list_buildings_and_organizations_in_bbox failed: %s", e)
+            logger.exception(
+                "list_buildings_and_organizations_in_bbox_json failed: %s", e
+            )
             raise InternalError(
-                "list_buildings_and_organizations_in_bbox failed",
+                "list_buildings_and_organizations_in_bbox_json failed",
                 details={"error": str(e)},
             ) from e
+
+    async def _buildings_in_bbox(
+        self,
+        min_lat: float,
+        max_lat: float,
+        min_lon: float,
+        max_lon: float,
+        *,
+        limit: int | None,
+        cursor: str | None,
+    ) -> tuple[list[BuildingRow], str | None]:
+        """Страница зданий в прямоугольнике по id — из пространственного индекса, если он готов, иначе из БД."""
+        after = decode_cursor(cursor, int)
+        after_id = after[0] if after else None
+        if not spatial_index.ready:
+            found = await self._building_repo.get_in_bbox(
+                min_lat,
+                max_lat,
+                min_lon,
+                max_lon,
+                limit=fetch_size(limit),
+                after_id=after_id,
+            )
+            return split_page(found, limit, key=lambda b: (b.id,))
+        ids = spatial_index.in_bbox(min_lat, max_lat, min_lon, max_lon)
+        if after_id is not None:
+            ids = ids[bisect.bisect_right(ids, after_id) :]
+        ids, next_cursor = split_page(
+            ids[: fetch_size(limit)], limit, key=lambda bid: (bid,)
+        )
+        return await self._building_repo.get_by_ids(ids), next_cursor
+
+    async def _organization_details(
+        self, orgs: Sequence[Organization]
+    ) -> list[OrganizationDetailResponse]:
+        """Организации (с загруженными зданиями и активностями) → детальные ответы.
+        Пути активностей всех организаций грузятся одним вызовом, деревья строятся из общего результата."""
+        paths_by_leaf = await self.get_activity_paths_by_leaf(
+            [a.id for org in orgs for a in org.activities], self._activity_repo
+        )
+        with span("build_activity_trees", organizations=len(orgs)):
+            activity_trees = [
+                self.build_activities_tree_with_ids(
+                    [paths_by_leaf[a.id] for a in org.activities]
+                )
+                for org in orgs
+            ]
+        with span("validate_responses", organizations=len(orgs)):
+            return [
+                OrganizationDetailResponse(
+                    id=org.id,
+                    name=org.name,
+                    phone=org.phone,
+                    buildings=[BuildingDetail.model_validate(b) for b in org.buildings],
+                    activities=[ActivityNode.model_validate(n) for n in trees],
+                )
+                for org, trees in zip(orgs, activity_trees, strict=True)
+            ]
+
+    async def _with_organizations(
+        self, rows: Sequence[tuple[BuildingRow, float | None]]
+    ) -> list[BuildingWithOrganizationsResponse]:
+        """
+        Здания (с расстоянием или None) → ответы с организациями (с расстоянием — BuildingWithDistanceResponse);
+        организации грузятся одним запросом.
+        """
+        if not rows:
+            return []
+        orgs_by_building = await self._org_repo.get_organizations_grouped_by_building(
+            [b.id for b, _dist in rows]
+        )
+        items: list[BuildingWithOrganizationsResponse] = []
+        for b, dist in rows:
+            building = BuildingDetail.model_validate(b)
+            organizations = [
+                OrganizationResponse.model_validate(o)
+                for o in orgs_by_building.get(b.id, [])
+            ]
+            items.append(
+                BuildingWithOrganizationsResponse(
+                    building=building, organizations=organizations
+                )
+                if dist is None
+                else BuildingWithDistanceResponse(
+                    building=building, organizations=organizations, distance_km=dist
+                )
+            )
+        return items
+
+    async def _with_organizations_json(
+        self,
+        rows: Sequence[tuple[BuildingRow, float | None]],
+        next_cursor: str | None,
+    ) -> CachedResponse:
+        """
+        Здания (с расстоянием или None) → JSON-массив BuildingWithOrganizationsResponse
+        (BuildingWithDistanceResponse, если расстояние есть) и курсор.
+        В режиме fast — словари из загруженных строк и orjson, без model_validate.
+        """
+        if not fast_serialization():
+            items = await self._with_organizations(rows)
+            return CachedResponse(dump_buildings_with_organizations(items), next_cursor)
+        if not rows:
+            return CachedResponse(b"[]", next_cursor)
+        orgs_by_building = await self._org_repo.get_organizations_grouped_by_building(
+            [b.id for b, _dist in rows]
+        )
+        body = dumps(
+            [
+                building_with_organizations_dict(
+                    b, orgs_by_building.get(b.id, []), dist
+                )
+                for b, dist in rows
+            ]
+        )
+        return CachedResponse(body, next_cursor)
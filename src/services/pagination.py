@@ -0,0 +1,86 @@
+"""Курсорная (keyset) пагинация: непрозрачные курсоры и нарезка страниц."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import math
+from collections.abc import Callable, Sequence
+from typing import overload
+
+from exceptions import ValidationError
+
+Key = tuple[float | int, ...]
+
+# Id в ключах — integer (int4) PostgreSQL.
+_ID_MIN, _ID_MAX = -(2**31), 2**31 - 1
+
+
+def encode_cursor(key: Key) -> str:
+    """Кодирует ключ последней строки страницы в непрозрачную строку (base64url от JSON)."""
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+@overload
+def decode_cursor(cursor: str | None, id_type: type[int], /) -> tuple[int] | None:
+    ...
+
+
+@overload
+def decode_cursor(
+    cursor: str | None, distance_type: type[float], id_type: type[int], /
+) -> tuple[float, int] | None:
+    ...
+
+
+def decode_cursor(cursor: str | None, *types: type) -> Key | None:
+    """
+    Декодирует курсор и проверяет форму ключа: число и типы полей, id в диапазоне int4, конечные числа.
+    ValidationError при ошибке.
+    """
+    if cursor is None:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, binascii.Error):
+        raise ValidationError("cursor", "Некорректный курсор")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValidationError("cursor", "Некорректный курсор")
+    key: list[float | int] = []
+    for value, type_ in zip(values, types, strict=True):
+        # bool — подкласс int, но в ключе недопустим; int допустим там, где ждём float.
+        if isinstance(value, bool) or not isinstance(value, int | float):
+            raise ValidationError("cursor", "Некорректный курсор")
+        if type_ is int:
+            # Id вне диапазона int4 не сравнить с колонкой без ошибки БД.
+            if not isinstance(value, int) or not _ID_MIN <= value <= _ID_MAX:
+                raise ValidationError("cursor", "Некорректный курсор")
+            key.append(value)
+            continue
+        # json.loads принимает NaN и Infinity, а огромное целое не приводится к float.
+        try:
+            number = float(value)
+        except OverflowError:
+            raise ValidationError("cursor", "Некорректный курсор")
+        if not math.isfinite(number):
+            raise ValidationError("cursor", "Некорректный курсор")
+        key.append(number)
+    return tuple(key)
+
+
+def fetch_size(limit: int | None) -> int | None:
+    """Сколько строк запрашивать: на одну больше limit, чтобы узнать, есть ли следующая страница."""
+    return None if limit is None else limit + 1
+
+
+def split_page[RowT](
+    rows: Sequence[RowT], limit: int | None, key: Callable[[RowT], Key]
+) -> tuple[list[RowT], str | None]:
+    """Отрезает страницу из rows (запрошенных через fetch_size) и возвращает курсор следующей или None."""
+    if limit is None or len(rows) <= limit:
+        return list(rows), None
+    page = list(rows[:limit])
+    return page, encode_cursor(key(page[-1]))
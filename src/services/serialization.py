@@ -0,0 +1,83 @@
+"""
+Быстрая сериализация ответов: словари из строк БД и orjson вместо model_validate + проверки response_model.
+Словари повторяют схемы (BuildingDetail, OrganizationResponse, BuildingWithOrganizationsResponse,
+BuildingWithDistanceResponse) поле в поле.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import orjson
+from pydantic import TypeAdapter
+
+from config import settings
+from db.repo import BuildingRow, OrganizationRow
+from schemas import BuildingWithOrganizationsResponse, OrganizationResponse
+
+type JsonDict = dict[str, Any]
+
+_buildings_with_organizations = TypeAdapter(list[BuildingWithOrganizationsResponse])
+_organizations = TypeAdapter(list[OrganizationResponse])
+
+
+def fast_serialization() -> bool:
+    """True, если SERIALIZATION_MODE=fast: ответы собираются из словарей и кодируются orjson."""
+    return settings.SERIALIZATION_MODE == "fast"
+
+
+def dumps(value: Any) -> bytes:
+    """JSON-тело ответа (компактный UTF-8, как у Pydantic)."""
+    return orjson.dumps(value)
+
+
+def _strip(value: str | None) -> str | None:
+    """Как str_strip_whitespace у BaseSchema."""
+    return None if value is None else value.strip()
+
+
+def organization_dict(org: OrganizationRow) -> JsonDict:
+    """Строка организации как OrganizationResponse."""
+    return {"id": org.id, "name": org.name.strip(), "phone": org.phone.strip()}
+
+
+def building_dict(building: BuildingRow) -> JsonDict:
+    """Строка здания как BuildingDetail."""
+    return {
+        "id": building.id,
+        "country": building.country.strip(),
+        "region": _strip(building.region),
+        "city": building.city.strip(),
+        "street": building.street.strip(),
+        "house_number": building.house_number.strip(),
+        "latitude": building.latitude,
+        "longitude": building.longitude,
+    }
+
+
+def building_with_organizations_dict(
+    building: BuildingRow,
+    organizations: Iterable[OrganizationRow],
+    distance_km: float | None = None,
+) -> JsonDict:
+    """Здание с организациями как BuildingWithOrganizationsResponse, с distance_km — как BuildingWithDistanceResponse."""
+    item: JsonDict = {
+        "building": building_dict(building),
+        "organizations": [organization_dict(o) for o in organizations],
+    }
+    if distance_km is not None:
+        item["distance_km"] = distance_km
+    return item
+
+
+def dump_buildings_with_organizations(
+    items: Sequence[BuildingWithOrganizationsResponse],
+) -> bytes:
+    """Готовые схемы BuildingWithOrganizationsResponse (и BuildingWithDistanceResponse) → JSON-массив (режим pydantic)."""
+    return _buildings_with_organizations.dump_json(list(items), serialize_as_any=True)
+
+
+def dump_organizations(items: Sequence[OrganizationResponse]) -> bytes:
+    """Готовые схемы OrganizationResponse → JSON-массив (режим pydantic)."""
+    return _organizations.dump_json(list(items))
@@ -0,0 +1,107 @@
+"""Объединение одинаковых одновременных чтений: один запрос к БД на всех ожидающих."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+from cache import current_data_version
+from config import settings
+
+
+class _LeaderCancelled(Exception):
+    """Ведущий вызов отменён (например, клиент отключился) — ожидающие повторяют вызов сами."""
+
+
+@dataclass
+class SingleFlightStats:
+    """Счётчики по имени метода: всего вызовов, выполнено и объединено с уже идущим."""
+
+    calls: dict[str, int] = field(default_factory=dict[str, int])
+    executions: dict[str, int] = field(default_factory=dict[str, int])
+    coalesced: dict[str, int] = field(default_factory=dict[str, int])
+
+
+class SingleFlight:
+    """
+    Пока вызов с ключом key выполняется, повторные вызовы с тем же ключом не запускают свой,
+    а ждут его результат (или исключение). После завершения ключ освобождается — это не кеш.
+    Результат общий для всех ожидающих, поэтому вызывающий код не должен его изменять.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future[Any]] = {}
+        self._stats = SingleFlightStats()
+
+    async def do[T](
+        self, name: str, key: Hashable, fn: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Результат fn() для key; name — имя для счётчиков."""
+        self._count(self._stats.calls, name)
+        while True:
+            in_flight = self._calls.get(key)
+            if in_flight is None:
+                break
+            self._count(self._stats.coalesced, name)
+            try:
+                return await asyncio.shield(in_flight)
+            except _LeaderCancelled:
+                continue
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self._count(self._stats.executions, name)
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+            if future.done() and not future.cancelled():
+                # Без ожидающих исключение никто не заберёт — не даём asyncio ругаться в лог.
+                future.exception()
+
+    def stats(self) -> SingleFlightStats:
+        """Копия счётчиков."""
+        return SingleFlightStats(
+            calls=dict(self._stats.calls),
+            executions=dict(self._stats.executions),
+            coalesced=dict(self._stats.coalesced),
+        )
+
+    @staticmethod
+    def _count(counter: dict[str, int], name: str) -> None:
+        counter[name] = counter.get(name, 0) + 1
+
+
+single_flight = SingleFlight()
+
+
+def coalesce[**P, T](
+    method: Callable[P, Awaitable[T]],
+) -> Callable[P, Awaitable[T]]:
+    """
+    Декоратор метода сервиса: одинаковые одновременные вызовы (те же аргументы, кроме self) выполняются один раз.
+    Аргументы должны быть хешируемыми; вызовы с разной версией данных запроса (cache.set_data_version) не объединяются.
+    Выключается настройкой SINGLE_FLIGHT_ENABLED.
+    """
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        if not settings.SINGLE_FLIGHT_ENABLED:
+            return await method(*args, **kwargs)
+        # Вызов с другой версией данных запроса не ждёт ответ, собранный по более старым данным.
+        key = (name, current_data_version(), args[1:], tuple(sorted(kwargs.items())))
+        return await single_flight.do(name, key, lambda: method(*args, **kwargs))
+
+    return wrapper
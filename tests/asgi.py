@@ -0,0 +1,59 @@
+"""Запрос к ASGI-приложению без HTTP-клиента: статус, заголовки и тело ответа."""
+
+from dataclasses import dataclass
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message
+
+
+@dataclass
+class Response:
+    status: int
+    headers: Headers
+    body: bytes
+
+
+async def request(
+    app: ASGIApp,
+    method: str,
+    path: str,
+    *,
+    query: str = "",
+    headers: list[tuple[bytes, bytes]] | None = None,
+) -> Response:
+    """Один HTTP-запрос без тела; lifespan приложения не запускается."""
+    messages: list[Message] = []
+    received = False
+
+    async def receive() -> Message:
+        nonlocal received
+        if received:
+            # Клиент не отключается, пока ответ не отправлен целиком.
+            await anyio.sleep_forever()
+        received = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "server": ("test", 80),
+        "client": ("test", 1),
+        "root_path": "",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": headers or [],
+    }
+    await app(scope, receive, send)
+    start = next(m for m in messages if m["type"] == "http.response.start")
+    body = b"".join(
+        m.get("body", b"") for m in messages if m["type"] == "http.response.body"
+    )
+    return Response(start["status"], Headers(raw=start["headers"]), body)
@@ -0,0 +1,73 @@
+"""
+Общие фикстуры тестов. Тестам с БД нужна база с применёнными миграциями и переменные POSTGRES_* как у приложения;
+если база недоступна, такие тесты пропускаются. Каждый тест работает в транзакции, которая в конце откатывается.
+"""
+
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+import observability
+from db.engine import create_engine
+from observability import QueryStats, count_queries
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def connection() -> AsyncIterator[AsyncConnection]:
+    """Соединение с открытой транзакцией; откатывается после теста."""
+    engine = create_engine()
+    try:
+        try:
+            conn = await engine.connect()
+        except (OSError, exc.DBAPIError) as e:
+            pytest.skip(f"database is not available: {e}")
+        try:
+            transaction = await conn.begin()
+            try:
+                yield conn
+            finally:
+                await transaction.rollback()
+        finally:
+            await conn.close()
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture
+async def session(connection: AsyncConnection) -> AsyncIterator[AsyncSession]:
+    """Сессия в транзакции теста: commit() сессии фиксирует только точку сохранения."""
+    async with AsyncSession(
+        bind=connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    ) as session:
+        # Точка сохранения открывается до теста, чтобы не попасть в бюджет запросов.
+        await session.connection()
+        yield session
+
+
+@pytest.fixture
+def query_budget() -> Callable[[int], AbstractContextManager[QueryStats]]:
+    """
+    Бюджет SQL-запросов: with query_budget(n): ... — тест падает, если внутри блока выполнено больше n выражений.
+    Считает count_queries, как и QueryStatsMiddleware в приложении.
+    """
+    observability.listen()
+
+    @contextmanager
+    def budget(max_queries: int) -> Iterator[QueryStats]:
+        with count_queries() as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            f"Query budget exceeded: {stats.count} SQL queries, expected at most {max_queries}"
+        )
+
+    return budget
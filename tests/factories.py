@@ -0,0 +1,85 @@
+"""Тестовые данные через SQL (в обход ORM и его событий): id созданных строк."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def add_activity(session: AsyncSession, name: str, *owners: int) -> int:
+    """Активность; owners — предки от родителя к корню."""
+    activity_id = (
+        await session.execute(
+            text("INSERT INTO activities (name) VALUES (:name) RETURNING id"),
+            {"name": name},
+        )
+    ).scalar_one()
+    for depth, owner_id in enumerate((activity_id, *owners), start=1):
+        await session.execute(
+            text(
+                "INSERT INTO activity_ownership (owner_id, owned_id, depth) VALUES (:owner, :owned, :depth)"
+            ),
+            {"owner": owner_id, "owned": activity_id, "depth": depth},
+        )
+    return activity_id
+
+
+async def add_building(
+    session: AsyncSession,
+    *,
+    country: str = "Россия",
+    region: str | None = "Московская область",
+    city: str = "Москва",
+    street: str = "Тверская",
+    house_number: str = "1",
+    latitude: float | None = 55.75,
+    longitude: float | None = 37.61,
+) -> int:
+    return (
+        await session.execute(
+            text(
+                "INSERT INTO buildings (country, region, city, street, house_number, latitude, longitude) "
+                "VALUES (:country, :region, :city, :street, :house_number, :latitude, :longitude) RETURNING id"
+            ),
+            {
+                "country": country,
+                "region": region,
+                "city": city,
+                "street": street,
+                "house_number": house_number,
+                "latitude": latitude,
+                "longitude": longitude,
+            },
+        )
+    ).scalar_one()
+
+
+async def add_organization(
+    session: AsyncSession,
+    name: str,
+    phone: str = "8-800-000-00-00",
+    *,
+    building_ids: tuple[int, ...] = (),
+    activity_ids: tuple[int, ...] = (),
+) -> int:
+    org_id = (
+        await session.execute(
+            text(
+                "INSERT INTO organizations (name, phone) VALUES (:name, :phone) RETURNING id"
+            ),
+            {"name": name, "phone": phone},
+        )
+    ).scalar_one()
+    for building_id in building_ids:
+        await session.execute(
+            text(
+                "INSERT INTO organization_buildings (organization_id, building_id) VALUES (:org, :building)"
+            ),
+            {"org": org_id, "building": building_id},
+        )
+    for activity_id in activity_ids:
+        await session.execute(
+            text(
+                "INSERT INTO organization_activities (organization_id, activity_id) VALUES (:org, :activity)"
+            ),
+            {"org": org_id, "activity": activity_id},
+        )
+    return org_id
@@ -0,0 +1,90 @@
+import orjson
+import pytest
+from factories import add_activity, add_organization
+
+from cache.activity_tree import ActivityTreeCache
+from db.repo.activity import ActivityRepo
+from exceptions import NotFoundError
+from services import mixins, organization_service
+from services.mixins import ActivityTreeMixin
+from services.organization_service import OrganizationService
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_activity_missing_from_cache_is_read_from_db(session, monkeypatch):
+    cache = ActivityTreeCache()
+    monkeypatch.setattr(mixins, "activity_tree_cache", cache)
+    root_id = await add_activity(session, "Тестовый корень")
+    await cache.load(session)
+    leaf_id = await add_activity(session, "Тестовый лист", root_id)
+
+    paths = await ActivityTreeMixin().get_activity_paths_with_ids(
+        [root_id, leaf_id], ActivityRepo(session)
+    )
+
+    root = (root_id, "Тестовый корень")
+    assert paths == [[root], [root, (leaf_id, "Тестовый лист")]]
+    assert not cache.ready
+
+
+async def test_unknown_activity_keeps_cache_ready(session, monkeypatch):
+    cache = ActivityTreeCache()
+    monkeypatch.setattr(mixins, "activity_tree_cache", cache)
+    await cache.load(session)
+
+    paths = await ActivityTreeMixin().get_activity_paths_with_ids(
+        [-1], ActivityRepo(session)
+    )
+
+    assert paths == [[]]
+    assert cache.ready
+    assert ActivityTreeMixin.build_activities_tree_with_ids(paths) == []
+
+
+@pytest.fixture
+async def loaded_cache(session, monkeypatch):
+    """Загруженный кеш дерева: активности, добавленные после загрузки, в нём отсутствуют."""
+    cache = ActivityTreeCache()
+    monkeypatch.setattr(mixins, "activity_tree_cache", cache)
+    monkeypatch.setattr(organization_service, "activity_tree_cache", cache)
+    await cache.load(session)
+    return cache
+
+
+async def test_activity_missing_from_cache_is_resolved_from_db(session, loaded_cache):
+    activity_id = await add_activity(session, "Тестовая новая активность")
+    service = OrganizationService(session)
+
+    assert await service._resolve_activity_id(activity_id, None) == activity_id
+    assert not loaded_cache.ready
+    await loaded_cache.load(session)
+    await add_activity(session, "Тестовая вторая активность")
+    assert await service._resolve_activity_id(None, "тестовая вторая активность")
+    assert not loaded_cache.ready
+
+
+async def test_unknown_activity_is_not_found_and_keeps_cache_ready(
+    session, loaded_cache
+):
+    service = OrganizationService(session)
+
+    with pytest.raises(NotFoundError):
+        await service._resolve_activity_id(-1, None)
+    with pytest.raises(NotFoundError):
+        await service._resolve_activity_id(None, "Нет такой активности")
+    assert loaded_cache.ready
+
+
+async def test_stream_includes_activity_missing_from_cache(session, loaded_cache):
+    root_id = await add_activity(session, "Тестовый корень")
+    child_id = await add_activity(session, "Тестовый лист", root_id)
+    org_id = await add_organization(session, "Тестовая", activity_ids=(child_id,))
+
+    stream = await OrganizationService(session).stream_organizations_by_activity(
+        activity_id=root_id
+    )
+
+    body = b"".join([chunk async for chunk in stream])
+    assert [orjson.loads(line)["id"] for line in body.splitlines()] == [org_id]
+    assert not loaded_cache.ready
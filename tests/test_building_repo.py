@@ -0,0 +1,51 @@
+import pytest
+from factories import add_building
+from sqlalchemy import event, text
+
+from db.repo.building import BuildingRepo
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_radius_query_uses_lat_lon_index(session):
+    statements = []
+
+    def capture(_conn, _cursor, statement, parameters, _context, _executemany):
+        statements.append((statement, parameters))
+
+    conn = await session.connection()
+    event.listen(conn.sync_connection, "before_cursor_execute", capture)
+    try:
+        await BuildingRepo(session).get_in_radius(55.75, 37.61, 2.0, limit=20)
+    finally:
+        event.remove(conn.sync_connection, "before_cursor_execute", capture)
+    [(statement, parameters)] = statements
+
+    # Без seq scan в выборе планировщик возьмёт его только при отсутствии подходящего индекса.
+    await session.execute(text("SET LOCAL enable_seqscan = off"))
+    result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+    plan = "\n".join(row[0] for row in result)
+    assert "ix_buildings_latitude_longitude" in plan
+    assert "Seq Scan on buildings" not in plan
+
+
+async def test_geo_rows_hold_building_fields_and_distance_apart(session):
+    building_id = await add_building(session, latitude=-80.0, longitude=10.0)
+    repo = BuildingRepo(session)
+
+    for row, distance_km in (
+        *await repo.get_in_radius(-80.0, 10.01, 5.0),
+        *await repo.get_nearest(-80.0, 10.01, 1),
+    ):
+        assert row._fields == (
+            "id",
+            "country",
+            "region",
+            "city",
+            "street",
+            "house_number",
+            "latitude",
+            "longitude",
+        )
+        assert row.id == building_id
+        assert 0 < distance_km < 1
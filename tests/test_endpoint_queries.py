@@ -0,0 +1,82 @@
+from urllib.parse import urlencode
+
+import orjson
+import pytest
+from asgi import request
+from test_organization_service import (
+    DETAIL_QUERIES,
+    SEARCH_QUERIES,
+    add_organization_with_relations,
+)
+
+from cache.activity_tree import ActivityTreeCache
+from config import settings
+from dependencies import get_read_session
+from main import app
+from observability import listen
+from secure import get_token_service
+from services import mixins
+
+pytestmark = pytest.mark.anyio
+
+# Версия данных для ETag (conditional_get) — перед запросами сервиса.
+VERSION_QUERIES = 1
+
+
+@pytest.fixture
+def call(session, monkeypatch):
+    """GET к приложению с токеном в сессии теста; число SQL-запросов — из заголовка X-DB-Queries."""
+    monkeypatch.setattr(settings, "DEBUG_DB_HEADERS", True)
+    listen()
+    monkeypatch.setattr(mixins, "activity_tree_cache", ActivityTreeCache())
+    app.dependency_overrides[get_read_session] = lambda: session
+    token = get_token_service().create_token()
+
+    async def get(path, query=""):
+        response = await request(
+            app,
+            "GET",
+            f"/api/v1{path}",
+            query=query,
+            headers=[(b"authorization", f"Bearer {token}".encode())],
+        )
+        assert response.status == 200, response.body
+        return int(response.headers["x-db-queries"]), orjson.loads(response.body)
+
+    yield get
+    app.dependency_overrides.pop(get_read_session)
+
+
+@pytest.mark.parametrize("sql_json", [True, False])
+async def test_organization_detail_queries(session, call, monkeypatch, sql_json):
+    monkeypatch.setattr(settings, "ORGANIZATION_DETAIL_SQL_JSON", sql_json)
+    org_id = await add_organization_with_relations(session, 10, 10)
+
+    queries, detail = await call(f"/organizations/{org_id}")
+
+    assert queries == VERSION_QUERIES + (1 if sql_json else DETAIL_QUERIES)
+    assert len(detail["buildings"]) == 10
+
+
+@pytest.mark.parametrize("matches", [1, 10])
+async def test_organization_search_queries(session, call, matches):
+    for i in range(matches):
+        await add_organization_with_relations(session, 3, 3, f"Зюквенция {i}")
+
+    queries, found = await call(
+        "/organizations/search", urlencode({"name": "Зюквенция"})
+    )
+
+    assert queries == VERSION_QUERIES + SEARCH_QUERIES
+    assert len(found) == matches
+
+
+async def test_organization_batch_queries(session, call):
+    org_ids = [await add_organization_with_relations(session, 3, 3) for _ in range(5)]
+
+    queries, items = await call(
+        "/organizations/batch", urlencode({"ids": org_ids}, doseq=True)
+    )
+
+    assert queries == VERSION_QUERIES + DETAIL_QUERIES
+    assert all(item["found"] for item in items)
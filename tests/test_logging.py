@@ -0,0 +1,107 @@
+import logging
+import sys
+
+import orjson
+import pytest
+
+import loger_init
+from loger_init import JsonFormatter, RateLimitFilter
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    now = [1000.0]
+    monkeypatch.setattr(loger_init.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _record(msg: str, **extra: object) -> logging.LogRecord:
+    record = logging.LogRecord("app", logging.WARNING, __file__, 1, msg, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.mark.usefixtures("clock")
+def test_rate_limit_caps_records_per_key():
+    rate_limit = RateLimitFilter(per_minute=2)
+
+    passed = [
+        rate_limit.filter(_record("a", rate_limit_key=key))
+        for key in ("4xx:NotFound",) * 4 + ("4xx:Invalid",)
+    ]
+
+    assert passed == [True, True, False, False, True]
+    assert rate_limit.filter(_record("no key"))
+
+
+def test_rate_limit_reports_suppressed_in_next_window(clock):
+    rate_limit = RateLimitFilter(per_minute=1)
+    for _ in range(4):
+        rate_limit.filter(_record("Not found", rate_limit_key="4xx:NotFound"))
+
+    clock[0] += 60
+    record = _record("Not found", rate_limit_key="4xx:NotFound")
+
+    assert rate_limit.filter(record)
+    assert record.getMessage() == (
+        "Not found (suppressed 3 similar messages in the previous minute)"
+    )
+    record = _record("Not found", rate_limit_key="4xx:NotFound")
+    assert not rate_limit.filter(record)
+
+
+@pytest.mark.usefixtures("clock")
+def test_rate_limit_decides_once_per_record_across_handlers():
+    rate_limit = RateLimitFilter(per_minute=2)
+    handlers = [_ListHandler(), _ListHandler()]
+    logger = logging.getLogger("test_rate_limit")
+    logger.propagate = False
+    for handler in handlers:
+        handler.addFilter(rate_limit)
+        logger.addHandler(handler)
+    try:
+        for i in range(3):
+            logger.warning("message %s", i, extra={"rate_limit_key": "k"})
+    finally:
+        for handler in handlers:
+            logger.removeHandler(handler)
+
+    for handler in handlers:
+        assert [r.getMessage() for r in handler.records] == ["message 0", "message 1"]
+
+
+def test_json_formatter_fields():
+    record = _record("Order %s", request_id="abc", status_code=404, rate_limit_key="k")
+    record.args = (42,)
+
+    entry = orjson.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "Order 42"
+    assert (entry["level"], entry["logger"]) == ("WARNING", "app")
+    assert entry["request_id"] == "abc"
+    assert entry["status_code"] == 404
+    assert "rate_limit_key" not in entry
+    assert "exc_info" not in entry
+
+
+def test_json_formatter_exc_info():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = _record("failed")
+        record.exc_info = sys.exc_info()
+
+    entry = orjson.loads(JsonFormatter().format(record))
+
+    assert entry["request_id"] is None
+    assert entry["exc_info"].startswith("Traceback")
+    assert "ValueError: boom" in entry["exc_info"]
@@ -0,0 +1,191 @@
+import orjson
+import pytest
+from factories import add_activity, add_building, add_organization
+from sqlalchemy import event, text
+
+from cache.activity_tree import ActivityTreeCache
+from config import settings
+from db.repo.organization import OrganizationRepo
+from services import mixins
+from services.organization_service import OrganizationService
+
+pytestmark = pytest.mark.anyio
+
+COORDINATES = [
+    (0.1 + 0.2, 1e-7),
+    (55.0, -37.5),
+    (-0.0, 1.5e-5),
+    (12345678.9, 1e15),
+    (1e-5, -1e16),
+    (None, None),
+]
+
+STRINGS = [
+    '  "Кавычки" и \\обратная\\ косая  ',
+    " Неразрывные пробелы ",
+    "Управляющие \x01\x1f\t символы",
+    "</script> & <b>html</b>",
+    "Эмодзи 🏢 и   разделитель строк",
+]
+
+
+@pytest.fixture(autouse=True)
+def cold_activity_tree(monkeypatch):
+    monkeypatch.setattr(mixins, "activity_tree_cache", ActivityTreeCache())
+
+
+async def add_tricky_organization(session):
+    root_id = await add_activity(session, STRINGS[0])
+    child_ids = [await add_activity(session, s, root_id) for s in STRINGS[1:3]]
+    leaf_id = await add_activity(session, STRINGS[3], child_ids[1], root_id)
+    other_root_id = await add_activity(session, STRINGS[4])
+    building_ids = [
+        await add_building(
+            session,
+            street=STRINGS[i % len(STRINGS)],
+            region=None if i % 2 else STRINGS[-1 - i % len(STRINGS)],
+            latitude=lat,
+            longitude=lon,
+        )
+        for i, (lat, lon) in enumerate(COORDINATES)
+    ]
+    return await add_organization(
+        session,
+        STRINGS[1],
+        STRINGS[2],
+        building_ids=tuple(building_ids),
+        activity_ids=(leaf_id, child_ids[0], other_root_id),
+    )
+
+
+async def test_detail_document_matches_pydantic(session, monkeypatch):
+    org_id = await add_tricky_organization(session)
+    service = OrganizationService(session)
+    monkeypatch.setattr(settings, "ORGANIZATION_DETAIL_SQL_JSON", True)
+
+    response = await service.get_organization_detail_json(org_id)
+    detail = await service.get_organization_detail(org_id)
+
+    assert orjson.loads(response.body) == orjson.loads(detail.model_dump_json())
+    # float8 в JSON точен только при extra_float_digits > 0: значение задаётся при подключении.
+    assert (await session.execute(text("SHOW extra_float_digits"))).scalar() == "1"
+
+
+async def test_detail_document_paths(session):
+    org_id = await add_tricky_organization(session)
+    repo = OrganizationRepo(session)
+
+    _document, paths = await repo.get_detail_document(org_id)
+
+    # По возрастанию id активности: ребёнок корня, лист под ним, второй корень.
+    assert [len(path) for path in paths] == [2, 3, 1]
+    assert len({aid for path in paths for aid, _name in path}) == 5
+    assert await repo.get_detail_document(-1) is None
+
+
+async def test_by_owner_activity_is_none_for_missing_activity(session, query_budget):
+    with query_budget(1):
+        assert await OrganizationRepo(session).get_by_owner_activity(-1) is None
+
+
+async def test_by_owner_activity_is_empty_without_organizations(session):
+    activity_id = await add_activity(session, "Тестовая пустая")
+
+    assert await OrganizationRepo(session).get_by_owner_activity(activity_id) == []
+
+
+async def add_activity_tree_with_organizations(session):
+    root_id = await add_activity(session, "Тестовый корень")
+    child_id = await add_activity(session, "Тестовый ребёнок", root_id)
+    leaf_id = await add_activity(session, "Тестовый лист", child_id, root_id)
+    other_id = await add_activity(session, "Тестовый другой корень")
+    org_ids = [
+        await add_organization(session, "Тестовая на корне", activity_ids=(root_id,)),
+        await add_organization(session, "Тестовая на листе", activity_ids=(leaf_id,)),
+        await add_organization(
+            session, "Тестовая на двух", activity_ids=(child_id, leaf_id)
+        ),
+        await add_organization(session, "Тестовая чужая", activity_ids=(other_id,)),
+    ]
+    return root_id, child_id, org_ids
+
+
+async def test_by_owner_activity_includes_descendants(session, query_budget):
+    (
+        root_id,
+        child_id,
+        (on_root, on_leaf, on_both, _other),
+    ) = await add_activity_tree_with_organizations(session)
+    repo = OrganizationRepo(session)
+
+    with query_budget(1):
+        orgs = await repo.get_by_owner_activity(root_id)
+
+    assert [o.id for o in orgs] == [on_root, on_leaf, on_both]
+    assert [o.id for o in await repo.get_by_owner_activity(child_id)] == [
+        on_leaf,
+        on_both,
+    ]
+
+
+async def test_by_owner_activity_pages_after_id(session):
+    (
+        root_id,
+        _child_id,
+        (on_root, on_leaf, on_both, _other),
+    ) = await add_activity_tree_with_organizations(session)
+    repo = OrganizationRepo(session)
+    statements = []
+
+    def capture(_conn, _cursor, statement, _parameters, _context, _executemany):
+        statements.append(statement)
+
+    conn = await session.connection()
+    event.listen(conn.sync_connection, "before_cursor_execute", capture)
+    try:
+        first = await repo.get_by_owner_activity(root_id, limit=2)
+        rest = await repo.get_by_owner_activity(root_id, limit=2, after_id=on_leaf)
+    finally:
+        event.remove(conn.sync_connection, "before_cursor_execute", capture)
+
+    assert [o.id for o in first] == [on_root, on_leaf]
+    assert [o.id for o in rest] == [on_both]
+    # Граница страницы и в EXISTS: слияние по organization_activities начинается с after_id.
+    assert "organization_activities.organization_id >" in statements[1]
+    assert "organization_activities.organization_id >" not in statements[0]
+
+
+@pytest.mark.parametrize("query", ["%", "_", "0% и_"])
+async def test_search_matches_like_metacharacters_literally(session, query):
+    org_id = await add_organization(session, "Тестовая скидка 100% и_всё")
+
+    # Порог 1 оставляет только совпадения подстрокой (ILIKE).
+    found = await OrganizationRepo(session).get_by_name_with_relations(
+        query, min_similarity=1
+    )
+
+    assert [org.id for org, _score in found] == [org_id]
+
+
+async def test_search_threshold_is_set_per_connection(session, query_budget):
+    org_id = await add_organization(session, "Зюквенция")
+    repo = OrganizationRepo(session)
+
+    # Организация, её здания, её активности: порог соединения без отдельного запроса.
+    with query_budget(3):
+        found = await repo.get_by_name_with_relations("Зюквенцыя")
+    assert [org.id for org, _score in found] == [org_id]
+    assert await repo.get_by_name_with_relations("Зюквенцыя", min_similarity=0.9) == []
+
+
+async def test_grouped_by_building_rows_have_organization_fields(session):
+    building_id = await add_building(session)
+    org_id = await add_organization(session, "В здании", building_ids=(building_id,))
+
+    grouped = await OrganizationRepo(session).get_organizations_grouped_by_building(
+        [building_id]
+    )
+
+    [row] = grouped[building_id]
+    assert row._fields == ("id", "name", "phone")
+    assert row.id == org_id
@@ -0,0 +1,81 @@
+import pytest
+from factories import add_activity, add_building, add_organization
+
+from cache.activity_tree import ActivityTreeCache
+from services import mixins
+from services.organization_service import OrganizationService
+
+pytestmark = pytest.mark.anyio
+
+# Организация, её здания, её активности, пути активностей.
+DETAIL_QUERIES = 4
+# Поиск с порогом похожести соединения — те же запросы, что у детальной информации.
+SEARCH_QUERIES = DETAIL_QUERIES
+
+
+@pytest.fixture(autouse=True)
+def cold_activity_tree(monkeypatch):
+    """Кеш дерева активностей не загружен: пути читаются из БД и попадают в счёт запросов."""
+    monkeypatch.setattr(mixins, "activity_tree_cache", ActivityTreeCache())
+
+
+async def add_organization_with_relations(
+    session, buildings, activities, name="Тестовая организация"
+):
+    root_id = await add_activity(session, "Тестовый корень")
+    child_id = await add_activity(session, "Тестовый ребёнок", root_id)
+    activity_ids = [
+        await add_activity(session, f"Тестовый лист {i}", child_id, root_id)
+        for i in range(activities)
+    ]
+    building_ids = [
+        await add_building(session, house_number=str(i)) for i in range(buildings)
+    ]
+    return await add_organization(
+        session,
+        name,
+        building_ids=tuple(building_ids),
+        activity_ids=(root_id, *activity_ids),
+    )
+
+
+@pytest.mark.parametrize(("buildings", "activities"), [(1, 1), (10, 10)])
+async def test_detail_query_count(session, query_budget, buildings, activities):
+    org_id = await add_organization_with_relations(session, buildings, activities)
+
+    with query_budget(DETAIL_QUERIES):
+        detail = await OrganizationService(session).get_organization_detail(org_id)
+
+    assert len(detail.buildings) == buildings
+    [root] = detail.activities
+    [child] = root.children
+    assert len(child.children) == activities
+
+
+async def test_batch_query_count_does_not_grow_with_organizations(
+    session, query_budget
+):
+    org_ids = [await add_organization_with_relations(session, 3, 3) for _ in range(5)]
+
+    with query_budget(DETAIL_QUERIES):
+        items = await OrganizationService(session).get_organizations_batch(org_ids)
+
+    assert all(item.found for item in items)
+
+
+@pytest.mark.parametrize("matches", [1, 10])
+async def test_search_query_count_does_not_grow_with_matches(
+    session, query_budget, matches
+):
+    for i in range(matches):
+        await add_organization_with_relations(session, 3, 3, f"Зюквенция {i}")
+
+    with query_budget(SEARCH_QUERIES) as stats:
+        found = await OrganizationService(session).search_organizations_by_name(
+            "Зюквенция"
+        )
+
+    assert stats.count == SEARCH_QUERIES
+    assert len(found) == matches
+    assert all(len(org.buildings) == 3 for org in found)
+    assert all(len(org.activities[0].children[0].children) == 3 for org in found)
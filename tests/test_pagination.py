@@ -0,0 +1,42 @@
+import base64
+
+import pytest
+
+from exceptions import ValidationError
+from services.pagination import decode_cursor, encode_cursor
+
+
+def raw_cursor(payload: str) -> str:
+    return base64.urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+
+def test_round_trip():
+    assert decode_cursor(encode_cursor((1.25, 42)), float, int) == (1.25, 42)
+    assert decode_cursor(raw_cursor("[3,7]"), float, int) == (3.0, 7)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        "[NaN,1]",
+        "[Infinity,1]",
+        "[-Infinity,1]",
+        "[1e400,1]",
+        f"[{10**400},1]",
+        "[1.5,2147483648]",
+        "[1.5,-2147483649]",
+        "[1.5,1.0]",
+        "[1.5,true]",
+        '[1.5,"1"]',
+        "[1.5]",
+        "{}",
+    ],
+)
+def test_invalid_cursor(payload):
+    with pytest.raises(ValidationError):
+        decode_cursor(raw_cursor(payload), float, int)
+
+
+def test_int4_bounds():
+    assert decode_cursor(raw_cursor("[2147483647]"), int) == (2147483647,)
+    assert decode_cursor(raw_cursor("[-2147483648]"), int) == (-2147483648,)
@@ -0,0 +1,18 @@
+import pytest
+from sqlalchemy import text
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_budget_counts_statements(session, query_budget):
+    with query_budget(2) as stats:
+        await session.execute(text("SELECT 1"))
+        await session.execute(text("SELECT 2"))
+    assert stats.count == 2
+
+
+async def test_budget_exceeded(session, query_budget):
+    with pytest.raises(AssertionError, match="Query budget exceeded: 2"):
+        with query_budget(1):
+            await session.execute(text("SELECT 1"))
+            await session.execute(text("SELECT 2"))
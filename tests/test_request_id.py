@@ -0,0 +1,43 @@
+import re
+
+import pytest
+from asgi import request
+from starlette.types import Receive, Scope, Send
+
+from observability import RequestIdMiddleware, current_request_id
+
+pytestmark = pytest.mark.anyio
+
+
+async def _app(_scope: Scope, _receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    body = (current_request_id() or "").encode()
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _request_ids(headers: list[tuple[bytes, bytes]]) -> tuple[str, str]:
+    """Заголовок X-Request-ID ответа и request_id, видимый приложению."""
+    response = await request(RequestIdMiddleware(_app), "GET", "/", headers=headers)
+    return response.headers["x-request-id"], response.body.decode()
+
+
+async def test_valid_request_id_is_echoed():
+    assert await _request_ids([(b"x-request-id", b"client-42.a:b")]) == (
+        "client-42.a:b",
+        "client-42.a:b",
+    )
+
+
+@pytest.mark.parametrize("value", [b"", b"bad id", b"x" * 129])
+async def test_invalid_request_id_is_replaced(value):
+    request_id, seen = await _request_ids([(b"x-request-id", value)])
+
+    assert re.fullmatch(r"[0-9a-f]{32}", request_id)
+    assert seen == request_id
+
+
+async def test_missing_request_id_is_generated():
+    first, _ = await _request_ids([])
+    second, _ = await _request_ids([])
+
+    assert first != second
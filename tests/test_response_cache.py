@@ -0,0 +1,44 @@
+import pytest
+
+from cache.response import (
+    CachedResponse,
+    MemoryResponseBackend,
+    ResponseCache,
+    set_data_version,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def cache():
+    cache = ResponseCache()
+    cache.use(MemoryResponseBackend(max_entries=100, max_bytes=1 << 20), 60)
+    yield cache
+    set_data_version(None)
+
+
+def builder(body):
+    async def build():
+        return CachedResponse(body), {"organization:1"}
+
+    return build
+
+
+async def test_entry_is_not_served_under_newer_data_version(cache):
+    set_data_version(1)
+    assert (await cache.get_or_set("detail:1", builder(b"old"))).body == b"old"
+
+    # Запись в БД в обход ORM: инвалидации не было, но версия данных выросла.
+    set_data_version(2)
+    assert (await cache.get_or_set("detail:1", builder(b"new"))).body == b"new"
+    assert (await cache.get_or_set("detail:1", builder(b"other"))).body == b"new"
+
+
+async def test_without_data_version_entry_lives_until_invalidation(cache):
+    set_data_version(None)
+    await cache.get_or_set("detail:1", builder(b"old"))
+    assert (await cache.get_or_set("detail:1", builder(b"new"))).body == b"old"
+
+    await cache.invalidate("organization:1")
+    assert (await cache.get_or_set("detail:1", builder(b"new"))).body == b"new"
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from schemas import (
+    BuildingDetail,
+    BuildingWithDistanceResponse,
+    BuildingWithOrganizationsResponse,
+    OrganizationResponse,
+)
+from services.serialization import (
+    building_with_organizations_dict,
+    dump_buildings_with_organizations,
+    dumps,
+)
+
+BUILDING = SimpleNamespace(
+    id=1,
+    country="Россия",
+    region=None,
+    city="Москва",
+    street="Тверская",
+    house_number="1",
+    latitude=55.75,
+    longitude=37.61,
+)
+ORGANIZATION = SimpleNamespace(id=2, name="ООО Рога", phone="8-800-000-00-00")
+
+
+@pytest.mark.parametrize("distance_km", [None, 1.25])
+def test_fast_and_pydantic_bodies_match(distance_km):
+    fields = {
+        "building": BuildingDetail.model_validate(BUILDING),
+        "organizations": [OrganizationResponse.model_validate(ORGANIZATION)],
+    }
+    item = (
+        BuildingWithOrganizationsResponse(**fields)
+        if distance_km is None
+        else BuildingWithDistanceResponse(**fields, distance_km=distance_km)
+    )
+    fast = dumps(
+        [building_with_organizations_dict(BUILDING, [ORGANIZATION], distance_km)]
+    )
+
+    assert dump_buildings_with_organizations([item]) == fast
+    assert ("distance_km" in orjson.loads(fast)[0]) is (distance_km is not None)
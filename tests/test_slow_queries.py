@@ -0,0 +1,82 @@
+import pytest
+from sqlalchemy import text
+
+from config import settings
+from observability import slow_query_log
+from observability.slow_queries import _explain, _repeatable
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def slow_log(monkeypatch):
+    """Журнал, в который попадает каждый запрос, с планом у каждого SELECT."""
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 1e-6)
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN_ANALYZE", True)
+    slow_query_log.listen()
+    slow_query_log.clear()
+    yield slow_query_log
+    slow_query_log.clear()
+
+
+@pytest.mark.parametrize(
+    ("statement", "repeatable"),
+    [
+        ("SELECT id FROM organizations WHERE id = $1", True),
+        ("select 1", True),
+        (
+            "WITH i AS (INSERT INTO t DEFAULT VALUES RETURNING id) SELECT id FROM i",
+            False,
+        ),
+        ("WITH a AS (SELECT 1) SELECT * FROM a", False),
+        ("SELECT id FROM organizations FOR UPDATE", False),
+        ("SELECT id FROM organizations FOR NO KEY UPDATE SKIP LOCKED", False),
+        ("SELECT id FROM organizations FOR SHARE", False),
+        ("SELECT nextval('s')", False),
+        ("SELECT set_config('pg_trgm.word_similarity_threshold', '0.3', true)", False),
+        ("SELECT 1 AS x INTO TEMP t2", False),
+    ],
+)
+def test_repeatable(statement, repeatable):
+    assert _repeatable(statement) is repeatable
+
+
+async def test_slow_select_is_recorded_with_analyzed_plan(connection, slow_log):
+    await connection.execute(text("SELECT count(*) FROM organizations"))
+
+    entry = slow_log.recent()[0]
+    assert entry.statement == "SELECT count(*) FROM organizations"
+    assert entry.plan is not None
+    assert "actual time" in entry.plan
+
+
+async def test_data_modifying_with_runs_once(connection, slow_log):
+    await connection.execute(text("CREATE TEMP TABLE slow_t (id serial)"))
+    await connection.execute(
+        text(
+            "WITH i AS (INSERT INTO slow_t DEFAULT VALUES RETURNING id) SELECT id FROM i"
+        )
+    )
+
+    assert (await connection.scalar(text("SELECT count(*) FROM slow_t"))) == 1
+    plan = next(e.plan for e in slow_log.recent() if "INSERT" in e.statement)
+    assert plan is not None
+    assert "actual time" not in plan
+
+
+@pytest.mark.usefixtures("slow_log")
+async def test_nextval_is_not_repeated(connection):
+    await connection.execute(text("CREATE TEMP SEQUENCE slow_s"))
+
+    assert (await connection.scalar(text("SELECT nextval('slow_s')"))) == 1
+    assert (await connection.scalar(text("SELECT nextval('slow_s')"))) == 2
+
+
+async def test_failed_explain_keeps_transaction_usable(connection):
+    plan = await connection.run_sync(
+        lambda conn: _explain(conn, "SELECT * FROM missing_table", (), analyze=False)
+    )
+
+    assert plan is None
+    assert (await connection.scalar(text("SELECT 1"))) == 1
@@ -0,0 +1,36 @@
+import math
+
+import pytest
+
+from cache.spatial_index import BuildingSpatialIndex
+from db.models import Building
+
+
+@pytest.fixture
+def index() -> BuildingSpatialIndex:
+    index = BuildingSpatialIndex(cell_deg=0.1)
+    index.record_change(Building, 1, (55.75, 37.61))
+    index.record_change(Building, 2, (55.76, 37.62))
+    index.record_change(Building, 3, (59.93, 30.31))
+    return index
+
+
+@pytest.mark.parametrize("bad", [math.nan, math.inf, -math.inf])
+def test_radius_and_nearest_ignore_non_finite_points(index, bad):
+    assert index.in_radius(bad, 37.61, 5.0) == []
+    assert index.in_radius(55.75, bad, 5.0) == []
+    assert index.nearest(bad, 37.61, 3) == []
+    assert index.in_radius(55.75, 37.61, math.nan) == []
+
+
+def test_bbox_with_nan_is_empty(index):
+    assert index.in_bbox(math.nan, 60.0, 30.0, 40.0) == []
+
+
+def test_bbox_with_infinite_bounds_covers_the_axis(index):
+    assert index.in_bbox(-math.inf, math.inf, -math.inf, math.inf) == [1, 2, 3]
+    assert index.in_bbox(55.0, 56.0, -math.inf, 35.0) == []
+
+
+def test_infinite_radius_finds_everything(index):
+    assert [b for _, b in index.in_radius(55.75, 37.61, math.inf)] == [1, 2, 3]
@@ -0,0 +1,63 @@
+import pytest
+from factories import add_activity, add_organization
+
+from cache.suggest_index import NameSuggestIndex
+from services import organization_service
+from services.organization_service import OrganizationService
+
+pytestmark = pytest.mark.anyio
+
+NAMES = [
+    "Zqx C++ Клуб",
+    "Zqx Рога (и) копыта",
+    "zqx.ru",
+    "[Zqx] Скобки",
+    "100% Zqx",
+    "Zqx_подчёркивание",
+    "ZQX zqx",
+    "Ёлки Zqx-Палки",
+]
+
+QUERIES = [
+    "zqx",
+    "ZQX ",
+    "zqx c++",
+    "(и",
+    "zqx.r",
+    "[zqx]",
+    "100%",
+    "zqx_под",
+    "ёлки zqx-п",
+    "\\",
+    "%",
+    "zqx  zq",
+]
+
+
+@pytest.fixture
+async def index(session):
+    for name in NAMES:
+        await add_organization(session, name)
+    await add_activity(session, "Zqx активность")
+    index = NameSuggestIndex()
+    await index.load(session)
+    return index
+
+
+@pytest.mark.parametrize("query", QUERIES)
+async def test_database_fallback_matches_index(session, index, monkeypatch, query):
+    service = OrganizationService(session)
+    monkeypatch.setattr(organization_service, "suggest_index", index)
+    from_index = await service.suggest_names(query, 50)
+    monkeypatch.setattr(organization_service, "suggest_index", NameSuggestIndex())
+    from_database = await service.suggest_names(query, 50)
+
+    assert from_database == from_index
+
+
+@pytest.mark.usefixtures("index")
+async def test_regex_metacharacters_are_literal(session, monkeypatch):
+    monkeypatch.setattr(organization_service, "suggest_index", NameSuggestIndex())
+    found = await OrganizationService(session).suggest_names("zqx c++", 50)
+
+    assert [s.name for s in found] == ["Zqx C++ Клуб"]
@@ -0,0 +1,177 @@
+import inspect
+import re
+from collections.abc import AsyncIterator
+
+import orjson
+import pytest
+from starlette.datastructures import Headers
+
+from config import settings
+from observability import (
+    FileExporter,
+    MemoryExporter,
+    Span,
+    Tracer,
+    current_span,
+    span,
+    trace_methods,
+)
+from observability.tracing import _incoming_context
+
+
+def _span(trace_id: str, name: str) -> Span:
+    return Span(trace_id, "0" * 16, None, name, 0.0)
+
+
+def test_file_exporter_writes_in_background(tmp_path):
+    exporter = FileExporter(tmp_path / "traces.jsonl")
+    exporter.export([_span("a", "child"), _span("a", "GET /")])
+    exporter.export([_span("b", "GET /")])
+    exporter.close()
+    exporter.close()
+
+    lines = (tmp_path / "traces.jsonl").read_bytes().splitlines()
+    assert [(s["trace_id"], s["name"]) for s in map(orjson.loads, lines)] == [
+        ("a", "child"),
+        ("a", "GET /"),
+        ("b", "GET /"),
+    ]
+
+
+def test_configure_closes_previous_exporter(tmp_path):
+    exporter = FileExporter(tmp_path / "traces.jsonl")
+    tracer = Tracer()
+    tracer.configure(exporter)
+    exporter.export([_span("a", "GET /")])
+    tracer.configure(None)
+
+    assert not exporter._thread.is_alive()
+    assert (tmp_path / "traces.jsonl").read_bytes().count(b"\n") == 1
+
+
+@pytest.fixture
+def memory_tracer() -> tuple[Tracer, MemoryExporter]:
+    tracer = Tracer()
+    exporter = MemoryExporter(100)
+    tracer.configure(exporter)
+    return tracer, exporter
+
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.mark.parametrize(("flags", "sampled"), [("01", True), ("00", False)])
+def test_traceparent_decides_sampling(monkeypatch, flags, sampled):
+    monkeypatch.setattr(settings, "TRACING_SAMPLE_RATE", 1 - sampled)
+    headers = Headers({"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-{flags}"})
+
+    assert _incoming_context(headers) == (TRACE_ID, PARENT_ID, sampled)
+
+
+def test_x_trace_id_is_reused(monkeypatch):
+    monkeypatch.setattr(settings, "TRACING_SAMPLE_RATE", 1.0)
+
+    assert _incoming_context(Headers({"x-trace-id": "req-42"})) == (
+        "req-42",
+        None,
+        True,
+    )
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"x-trace-id": "bad id!"},
+        {"x-trace-id": "x" * 65},
+        {"traceparent": f"00-{TRACE_ID.upper()}-{PARENT_ID}-01"},
+        {"traceparent": f"01-{TRACE_ID}-{PARENT_ID}-01"},
+    ],
+)
+def test_invalid_ids_get_new_trace_id(monkeypatch, headers):
+    monkeypatch.setattr(settings, "TRACING_SAMPLE_RATE", 0.0)
+
+    trace_id, parent_id, sampled = _incoming_context(Headers(headers))
+
+    assert re.fullmatch(r"[0-9a-f]{32}", trace_id)
+    assert (parent_id, sampled) == (None, False)
+
+
+def test_nested_spans_are_chained(memory_tracer):
+    tracer, exporter = memory_tracer
+    headers = Headers({"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+
+    with tracer.start_trace("GET /", headers) as root:
+        with span("service", kind="a") as service:
+            with span("repository") as repository:
+                assert current_span() is repository
+            assert current_span() is service
+    assert current_span() is None
+
+    assert root is not None and service is not None and repository is not None
+    assert exporter.spans(TRACE_ID) == [repository, service, root]
+    assert root.parent_id == PARENT_ID
+    assert service.parent_id == root.span_id
+    assert repository.parent_id == service.span_id
+    assert service.attributes == {"kind": "a"}
+    assert {s.status for s in (root, service, repository)} == {"ok"}
+
+
+def test_error_marks_spans_up_to_root(memory_tracer):
+    tracer, exporter = memory_tracer
+    headers = Headers({"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+
+    with pytest.raises(ValueError):
+        with tracer.start_trace("GET /", headers), span("service"):
+            raise ValueError("boom")
+
+    service, root = exporter.spans()
+    for s in (service, root):
+        assert (s.status, s.attributes["error"]) == ("error", "ValueError")
+
+
+def test_trace_is_exported_to_exporter_of_its_start(memory_tracer):
+    tracer, exporter = memory_tracer
+    headers = Headers({"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+
+    with tracer.start_trace("GET /", headers):
+        tracer.configure(None)
+
+    assert [s.name for s in exporter.spans()] == ["GET /"]
+
+
+def test_span_outside_trace_is_noop():
+    with span("service") as current:
+        assert current is None
+
+
+@trace_methods
+class _Repo:
+    async def get(self, id: int, ids: list[int], session: object) -> int:
+        return id
+
+    async def stream(self, ids: list[int]) -> AsyncIterator[int]:
+        for id in ids:
+            yield id
+
+
+@pytest.mark.anyio
+async def test_traced_methods_create_child_spans(memory_tracer):
+    tracer, exporter = memory_tracer
+    headers = Headers({"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+
+    with tracer.start_trace("GET /", headers) as root:
+        assert await _Repo().get(7, ids=[1, 2], session=object()) == 7
+        assert [i async for i in _Repo().stream([1, 2])] == [1, 2]
+
+    assert root is not None
+    method, _ = exporter.spans()
+    assert method.name == "_Repo.get"
+    assert method.parent_id == root.span_id
+    assert method.attributes == {"id": 7, "ids.len": 2}
+
+
+def test_trace_methods_skips_async_generators():
+    assert getattr(_Repo.get, "__traced__", False)
+    assert not getattr(_Repo.stream, "__traced__", False)
+    assert inspect.isasyncgenfunction(_Repo.stream)